@@ -0,0 +1,70 @@
+"""
+cli_startup.py — guard the command line's startup time.
+
+Runs `cli.py status --json` and `cli.py list` repeatedly in fresh
+interpreters, interleaved with a bare `python3 -c pass`, and checks what
+the CLI adds on top of interpreter startup on this machine.  The check
+uses the fastest run of each (background load only ever adds time); the
+median is printed alongside.  Fails when that
+exceeds the budget or when PyQt6 (or anything else heavy) got imported
+on the way.
+
+Usage:
+    python3 benchmarks/cli_startup.py [--runs 20] [--budget-ms 40]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ("PyQt6", "sqlite3", "socketserver")
+
+_PROBE = ("import sys, cli; "
+          "bad = [m for m in sys.modules if m.split('.')[0] in {forbidden!r}]; "
+          "print(','.join(bad))")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--budget-ms", type=float, default=40.0,
+                    help="allowed time over a bare interpreter start")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+        probe = _PROBE.format(forbidden=FORBIDDEN)
+        bad = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        if bad:
+            print(f"FAIL: importing cli pulled in {bad}"); return 1
+
+        cases = {"python3 -c pass": ["-c", "pass"],
+                 "status --json": [os.path.join(ROOT, "cli.py"), "status", "--json"],
+                 "list": [os.path.join(ROOT, "cli.py"), "list"]}
+        times = {name: [] for name in cases}
+        # Interleaved, so load on the machine hits every case alike.
+        for _ in range(args.runs):
+            for name, argv in cases.items():
+                t0 = time.perf_counter()
+                subprocess.run([sys.executable, *argv], env=env, stdout=subprocess.DEVNULL)
+                times[name].append((time.perf_counter() - t0) * 1e3)
+        bare = times.pop("python3 -c pass")
+        print(f"     {'python3 -c pass':14} min {min(bare):6.1f} ms  median {statistics.median(bare):6.1f} ms")
+        failed = False
+        for name, t in times.items():
+            extra = min(t) - min(bare)
+            ok = extra <= args.budget_ms
+            failed |= not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name:14} min {min(t):6.1f} ms  median "
+                  f"{statistics.median(t):6.1f} ms  (+{extra:.1f} over bare, budget +{args.budget_ms:g})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+counter_sampling.py — per-sample cost of reading an interface's byte counters.
+
+Compares the old `ip -s link show` + regex fork (what _iface_bytes did
+once a second) with IfaceCounters' sysfs pread and the /proc/net/dev
+fallback.  Any interface works; no tunnel is needed.
+
+Usage:
+    python3 benchmarks/counter_sampling.py [--iface eth0] [--runs 2000]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tunnel import SYSFS_NET, IfaceCounters, _read_proc_net_dev  # noqa: E402
+
+
+def ip_link(iface):
+    """The pre-sysfs sampler, verbatim apart from the self argument."""
+    r = subprocess.run(['ip', '-s', 'link', 'show', iface], capture_output=True, text=True, check=True)
+    rx = re.search(r'RX:\s+bytes\s+packets.*\n\s*(\d+)', r.stdout)
+    tx = re.search(r'TX:\s+bytes\s+packets.*\n\s*(\d+)', r.stdout)
+    return int(tx.group(1)), int(rx.group(1))
+
+
+def default_iface() -> str:
+    names = sorted(os.listdir(SYSFS_NET))
+    return next((n for n in names if n != "lo"), "lo")
+
+
+def per_call_us(fn, runs) -> float:
+    fn()    # warm up
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - t0) / runs * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iface", default=None)
+    ap.add_argument("--runs", type=int, default=2000)
+    args = ap.parse_args()
+    iface = args.iface or default_iface()
+
+    counters = IfaceCounters(iface)
+    if counters.read() == (None, None):
+        print(f"FAIL: no counters for {iface}"); return 1
+    print(f"{iface}, median of 5 batches")
+    cases = [("sysfs pread", counters.read, args.runs),
+             ("/proc/net/dev parse", lambda: _read_proc_net_dev(iface), args.runs)]
+    if subprocess.run(["ip", "-V"], capture_output=True).returncode == 0:
+        # A fork per call: fewer runs keep the whole benchmark short.
+        cases.insert(0, ("ip -s link + regex", lambda: ip_link(iface), max(1, args.runs // 20)))
+    for name, fn, runs in cases:
+        batches = sorted(per_call_us(fn, runs) for _ in range(5))
+        print(f"  {name:22} {batches[2]:10.1f} us/sample")
+    counters.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
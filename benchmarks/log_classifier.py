@@ -0,0 +1,194 @@
+"""
+log_classifier.py — cost of recognising connection events in openvpn output.
+
+Compares the old per-line checks from OpenVPNThread.run (one re.search
+plus the substring scans) with tunnel.classify() over whole blocks, and
+checks that classify() reports every event the old checks found, with the
+same kind.  It finds more lines because it also recognises peer info,
+pushed options and restarts.
+
+The corpus is whatever openvpn logs you point it at: plain or gzipped
+files, or directories of them such as the session logs the GUI keeps in
+~/.openvpn_gui/logs (used by default when present).  Without any real
+logs it falls back to a synthetic --verb 3 corpus and says so.  Real logs
+carry addresses, hostnames and user names; --sanitize-to writes a copy
+with those masked, suitable for sharing or checking in as a fixture.
+
+Usage:
+    python3 benchmarks/log_classifier.py [LOG_OR_DIR ...] [--sanitize-to out.log]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tunnel import classify  # noqa: E402
+
+SESSION_LOGS = os.path.expanduser("~/.openvpn_gui/logs")
+
+
+def old_classify(line):
+    """The per-line checks OpenVPNThread.run did before classify()."""
+    m = re.search(r'TUN/TAP device (\w+) opened', line)
+    if m: return "tun_opened"
+    if any(x in line for x in ["Initialization Sequence Completed", "VPN tunnel is ready"]):
+        return "connected"
+    elif "AUTH_FAILED" in line or "Authentication failed" in line:
+        return "auth_fail"
+    elif "TLS Error" in line or "TLS handshake failed" in line:
+        return "tls_fail"
+    elif "FATAL" in line:
+        return "fatal"
+    return None
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+def _read(path) -> str:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read().decode(errors="replace")
+
+
+def load_real(paths) -> tuple[list[str], list[str]]:
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(os.path.join(p, n) for n in os.listdir(p)
+                            if n.endswith((".log", ".log.gz", ".txt")))
+        elif os.path.isfile(p):
+            files.append(p)
+    lines = []
+    for f in files:
+        lines += [l for l in _read(f).splitlines() if l.strip()]
+    return lines, files
+
+
+_STEADY = [
+    "Data Channel: using negotiated cipher 'AES-256-GCM'",
+    "Outgoing Data Channel: Cipher 'AES-256-GCM' initialized with 256 bit key",
+    "Incoming Data Channel: Cipher 'AES-256-GCM' initialized with 256 bit key",
+    "VERIFY OK: depth=0, CN=server",
+    "Control Channel: TLSv1.3, cipher TLSv1.3 TLS_AES_256_GCM_SHA384, peer certificate: 2048 bit RSA",
+    "TCP/UDP: Preserving recently used remote address: [AF_INET]198.51.100.7:1194",
+    "UDPv4 link local: (not bound)",
+    "net_route_v4_add: 10.8.0.0/24 via 10.8.0.1 dev [NULL] table 0 metric -1",
+    "[server] Inactivity timeout (--ping-restart), restarting",
+]
+_EVENTS = [
+    "TUN/TAP device tun0 opened",
+    "Initialization Sequence Completed",
+    "Peer Connection Initiated with [AF_INET]198.51.100.7:1194",
+    "PUSH: Received control message: 'PUSH_REPLY,route 10.8.0.1,topology net30,ping 10,ping-restart 120'",
+    "SIGUSR1[soft,ping-restart] received, process restarting",
+    "Restart pause, 5 second(s)",
+    "AUTH: Received control message: AUTH_FAILED",
+    "TLS Error: TLS key negotiation failed to occur within 60 seconds (check your network connectivity)",
+    "Exiting due to fatal error",
+]
+
+
+def synthetic(lines: int, event_every: int) -> list[str]:
+    rnd = random.Random(6)
+    out = []
+    for i in range(lines):
+        msg = rnd.choice(_EVENTS) if i % event_every == 0 else rnd.choice(_STEADY)
+        out.append(f"2024-05-0{1 + i // 86400 % 9} {i // 3600 % 24:02}:{i // 60 % 60:02}:{i % 60:02} "
+                   f"us={rnd.randrange(10 ** 6):06} {msg}")
+    return out
+
+
+_MASKS = [
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b"), "192.0.2.1"),
+    # IPv6 needs "::" or four or more colons, so hh:mm:ss timestamps survive.
+    (re.compile(r"(?<![\w:.])[0-9a-fA-F:]*:[0-9a-fA-F:]*[0-9a-fA-F](?![\w:])"),
+     lambda m: "2001:db8::1" if "::" in m[0] or m[0].count(":") >= 4 else m[0]),
+    (re.compile(r"((?:CN|emailAddress|O|OU|L|ST|C)=)[^,/\s']+"), r"\1redacted"),
+    (re.compile(r"(?i)\b((?:user(?:name)?|common name)\s*[=:'\s]\s*'?)[^,'\s]+"), r"\1redacted"),
+    (re.compile(r"\b[a-z0-9-]+(?:\.[a-z0-9-]+)*\.(?:com|net|org|io|de|uk|fr|eu|local|lan|corp)\b",
+                re.I), "vpn.example.org"),
+]
+
+
+def sanitize(line: str) -> str:
+    for rx, repl in _MASKS:
+        line = rx.sub(repl, line)
+    return line
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def mismatches(lines) -> int:
+    """Lines the old checks classify differently from classify()."""
+    new = {ev.line: ev.kind for ev in classify("\n".join(lines))}
+    return sum(1 for l in lines
+               if (k := old_classify(l.strip())) and new.get(l.strip()) != k)
+
+
+def bench(lines, rounds=5):
+    block = "\n".join(lines) + "\n"
+    chunks = [block[i:i + 65536] for i in range(0, len(block), 65536)]
+    # Re-cut at newlines, as LineReader hands out only complete lines.
+    blocks, rest = [], ""
+    for c in chunks:
+        c = rest + c; cut = c.rfind("\n") + 1
+        blocks.append(c[:cut]); rest = c[cut:]
+
+    def old():
+        return sum(1 for l in lines if old_classify(l.strip()))
+
+    def new():
+        return sum(len(classify(b)) for b in blocks)
+
+    res = {}
+    for name, fn in (("old per-line scans", old), ("classify(block)", new)):
+        times = []
+        for _ in range(rounds):
+            t0 = time.perf_counter(); found = fn(); times.append(time.perf_counter() - t0)
+        res[name] = (min(times) / len(lines) * 1e9, found)
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="*", help="openvpn logs (.log, .log.gz) or directories of them")
+    ap.add_argument("--sanitize-to", metavar="FILE", help="write the corpus with addresses and names masked")
+    ap.add_argument("--lines", type=int, default=200_000, help="size of the synthetic corpus")
+    args = ap.parse_args()
+
+    paths = args.paths or ([SESSION_LOGS] if os.path.isdir(SESSION_LOGS) else [])
+    lines, files = load_real(paths)
+    if args.sanitize_to:
+        if not lines:
+            print("FAIL: no real logs to sanitize"); return 1
+        with open(args.sanitize_to, "w") as f:
+            f.writelines(sanitize(l) + "\n" for l in lines)
+        print(f"wrote {len(lines):,} sanitized lines to {args.sanitize_to}")
+
+    if lines:
+        corpora = [(f"real logs: {len(files)} file(s), {len(lines):,} lines", lines)]
+    else:
+        print("No real openvpn logs found (pass files or directories); using a synthetic corpus.")
+        corpora = [(f"synthetic steady state (1 event / 40 lines, {args.lines:,} lines)",
+                    synthetic(args.lines, 40)),
+                   (f"synthetic event-heavy (1 event / 4 lines, {args.lines:,} lines)",
+                    synthetic(args.lines, 4))]
+    for title, corpus in corpora:
+        print(title)
+        for name, (ns, found) in bench(corpus).items():
+            print(f"  {name:20} {ns:7.0f} ns/line  {found:>8,} event lines")
+        bad = mismatches(corpus)
+        if bad:
+            print(f"FAIL: {bad:,} lines classified differently"); return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+stdout_reader.py — consumer cost of reading openvpn-style output.
+
+A child process writes 100-byte log lines, either flat out or paced at
+--rate lines/s.  The old OpenVPNThread loop (text mode, bufsize=1,
+readline, one signal per line) is compared with LineReader driven by a
+selector (bulk reads, one decode and one signal per block).  Only the
+reading process's CPU time is counted; "emits" stands for the queued Qt
+signals the GUI thread would have to dispatch.
+
+Usage:
+    python3 benchmarks/stdout_reader.py [--lines 1000000] [--rate 100000]
+"""
+
+import argparse
+import os
+import selectors
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tunnel import LineReader  # noqa: E402
+
+_PRODUCER = r"""
+import os, sys, time
+n, rate = int(sys.argv[1]), float(sys.argv[2])
+line = b"2024-01-01 12:00:00 us=123456 " + b"Data Channel: using negotiated cipher 'AES-256-GCM' ok"
+line = line.ljust(99, b".") + b"\n"
+out = sys.stdout.buffer
+if rate <= 0:
+    out.write(line * n); out.flush(); sys.exit()
+batch = max(1, int(rate / 1000))            # 1 ms worth of lines per write
+t0 = time.monotonic()
+for i in range(0, n, batch):
+    out.write(line * min(batch, n - i)); out.flush()
+    delay = t0 + (i + batch) / rate - time.monotonic()
+    if delay > 0: time.sleep(delay)
+"""
+
+
+def producer(lines, rate, text):
+    cmd = [sys.executable, "-c", _PRODUCER, str(lines), str(rate)]
+    if text:
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True, bufsize=1)
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=0)
+
+
+def readline_loop(lines, rate):
+    emits = 0
+    p = producer(lines, rate, text=True)
+    for line in iter(p.stdout.readline, ''):
+        line = line.strip()
+        if line: emits += 1
+    p.wait()
+    return emits
+
+
+def line_reader_loop(lines, rate):
+    emits = 0
+    p = producer(lines, rate, text=False)
+    fd = p.stdout.fileno()
+    os.set_blocking(fd, False)
+    reader = LineReader(fd)
+    sel = selectors.DefaultSelector(); sel.register(fd, selectors.EVENT_READ)
+    while not reader.eof:
+        sel.select(0.5)
+        block = reader.read()
+        if block:
+            batch = [l for l in str(block, "utf-8", "replace").splitlines() if l]
+            if batch: emits += 1
+    sel.close(); p.wait()
+    return emits
+
+
+def measure(fn, lines, rate):
+    c0 = time.process_time()
+    emits = fn(lines, rate)
+    return (time.process_time() - c0) / lines * 1e9, emits
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lines", type=int, default=1_000_000, help="lines for the flat-out run")
+    ap.add_argument("--rate", type=float, default=100_000, help="lines/s for the paced run")
+    ap.add_argument("--seconds", type=float, default=5.0, help="length of the paced run")
+    args = ap.parse_args()
+
+    for title, lines, rate in ((f"{args.lines:,} lines flat out", args.lines, 0),
+                               (f"{args.rate:,.0f} lines/s for {args.seconds:g} s",
+                                int(args.rate * args.seconds), args.rate)):
+        print(title)
+        for name, fn in (("readline", readline_loop), ("LineReader", line_reader_loop)):
+            ns, emits = measure(fn, lines, rate)
+            print(f"  {name:10} {ns:7.0f} ns/line  {emits:>9,} emits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""
+cli.py — `openvpn-manager` command line; never imports PyQt6.
+
+    openvpn-manager                     start the GUI
+    openvpn-manager list [--json]       saved profiles
+    openvpn-manager import FILE [--name N] [--username U] [--password-stdin] [--force]
+    openvpn-manager connect PROFILE [--timeout S] [-v]
+    openvpn-manager disconnect
+    openvpn-manager status [--json]     exit status 0 when connected, 3 when not
+    openvpn-manager watch               follow the running GUI's event stream (JSON lines)
+
+Profiles are the GUI's (profiles.ConfigManager).  `connect` starts openvpn
+through the privileged helper when its socket exists, otherwise through
+pkexec/sudo, waits for "Initialization Sequence Completed", then leaves a
+detached child draining openvpn's output into the session log under
+~/.openvpn_gui/logs.  The running tunnel is recorded in
+~/.openvpn_gui/cli-session.json for `status` and `disconnect`.
+
+Only the modules a subcommand needs are imported, so `list` and `status`
+start in a few tens of milliseconds (see benchmarks/cli_startup.py).
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+from profiles import ConfigManager, VPNConfig
+from process import ProcessHandle, fmt_bytes, fmt_dur
+
+
+STATE_DIR = Path.home() / '.openvpn_gui'
+STATE_FILE = STATE_DIR / 'cli-session.json'
+LOG_DIR = STATE_DIR / 'logs'
+
+EXIT_NOT_CONNECTED = 3
+
+
+def _err(msg: str) -> None:
+    print(f"openvpn-manager: {msg}", file=sys.stderr)
+
+
+# ── Session state ─────────────────────────────────────────────────────────────
+
+def _load_state() -> dict | None:
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state: dict) -> None:
+    tmp = STATE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+
+def _clear_state(pid: int | None = None) -> None:
+    """Remove the state file; with <pid>, only if it still describes that process."""
+    st = _load_state()
+    if st is None or (pid is not None and st.get("pid") != pid):
+        return
+    try: STATE_FILE.unlink()
+    except OSError: pass
+
+
+def _live_state() -> dict | None:
+    """The recorded tunnel if its openvpn is still running; stale state is dropped."""
+    st = _load_state()
+    if st is None:
+        return None
+    h = ProcessHandle(st["pid"])
+    try:
+        if h.alive():
+            return st
+    finally:
+        h.close()
+    _clear_state(st["pid"])
+    return None
+
+
+# ── Process control ───────────────────────────────────────────────────────────
+
+def _signal(pid: int, sig: int, via_helper: bool) -> bool:
+    """Signal openvpn directly, then through the helper, then via pkexec/sudo kill."""
+    h = ProcessHandle(pid)
+    try:
+        h.send_signal(sig); return True
+    except PermissionError:
+        pass
+    except OSError:
+        return False
+    finally:
+        h.close()
+    if via_helper:
+        from helper import HelperClient, HelperError
+        if HelperClient.available():
+            try:
+                c = HelperClient()
+                try:
+                    c.authorize(); c.stop(pid, sig); return True
+                finally:
+                    c.close()
+            except (OSError, HelperError) as ex:
+                _err(f"helper: {ex}")
+    import shutil, subprocess
+    tool = 'pkexec' if shutil.which('pkexec') else 'sudo'
+    args = [tool, 'kill', f'-{signal.Signals(sig).name[3:]}', str(pid)]
+    return subprocess.run(args, capture_output=True).returncode == 0
+
+
+def _wait_exit(pid: int, timeout: float) -> bool:
+    import select
+    h = ProcessHandle(pid)
+    try:
+        if h.fileno() >= 0:
+            select.select([h.fileno()], [], [], timeout)
+        else:
+            deadline = time.monotonic() + timeout
+            while h.alive() and time.monotonic() < deadline:
+                time.sleep(0.1)
+        return not h.alive()
+    finally:
+        h.close()
+
+
+def _launch(config: str, auth_file: str | None):
+    """Start openvpn; returns (output fd, Popen or None, pid or None, via helper)."""
+    from helper import HelperClient, HelperError, dns_script
+    if os.getuid() != 0 and HelperClient.available():
+        try:
+            c = HelperClient()
+            try:
+                c.authorize()
+                try:
+                    pid, fd = c.start(config, auth_file)
+                    return fd, None, pid, True
+                except HelperError as ex:
+                    _err(f"privileged helper refused the profile, using pkexec: {ex}")
+            finally:
+                c.close()
+        except OSError as ex:
+            _err(f"privileged helper unavailable, using pkexec: {ex}")
+    import shutil, subprocess
+    from tunnel import openvpn_command
+    try:
+        from config import OPENVPN_DNS_SCRIPT
+    except ImportError:
+        OPENVPN_DNS_SCRIPT = None
+    if os.getuid() == 0:          cmd = []
+    elif shutil.which('pkexec'):   cmd = ['pkexec']
+    else:                          cmd = ['sudo']
+    cmd += openvpn_command(config, dns_script(OPENVPN_DNS_SCRIPT), auth_file)
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, bufsize=0, start_new_session=True)
+    return proc.stdout.fileno(), proc, None, False
+
+
+def _write_auth(cfg: VPNConfig) -> str:
+    import tempfile
+    fd, path = tempfile.mkstemp(suffix='_ovpn_auth', text=True)
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"{cfg.username}\n{cfg.password}\n")
+    os.chmod(path, 0o600)
+    return path
+
+
+def _unlink(path: str | None) -> None:
+    if path:
+        try: os.unlink(path)
+        except OSError: pass
+
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+
+def cmd_list(args) -> int:
+    cm = ConfigManager()
+    st = _live_state()
+    active = st.get("profile") if st else None
+    if args.json:
+        print(json.dumps([{"name": n, "config_path": c.config_path, "active": n == active}
+                          for n, c in sorted(cm.configs.items())]))
+        return 0
+    for n, c in sorted(cm.configs.items()):
+        print(f"{'*' if n == active else ' '} {n}\t{c.config_path}")
+    return 0
+
+
+def cmd_import(args) -> int:
+    path = os.path.abspath(os.path.expanduser(args.file))
+    if not os.path.isfile(path):
+        _err(f"file not found: {path}"); return 1
+    name = args.name or Path(path).stem
+    cm = ConfigManager()
+    if cm.get(name) and not args.force:
+        _err(f"profile '{name}' exists (use --force to replace it)"); return 1
+    password = sys.stdin.readline().rstrip('\n') if args.password_stdin else ""
+    cm.add(VPNConfig(name, path, args.username or "", password))
+    print(f"Profile '{name}' added.")
+    return 0
+
+
+def cmd_connect(args) -> int:
+    cfg = ConfigManager().get(args.profile)
+    if cfg is None:
+        _err(f"no such profile: {args.profile}"); return 2
+    if not os.path.exists(cfg.config_path):
+        _err(f"file not found: {cfg.config_path}"); return 1
+    st = _live_state()
+    if st is not None:
+        _err(f"already connected to '{st['profile']}' (pid {st['pid']})"); return 1
+
+    import selectors
+    from logstore import SessionLog
+    from tunnel import (EV_AUTH_FAIL, EV_CONNECTED, EV_FAILURES, EV_TLS_FAIL, EV_TUN_OPENED,
+                        LineReader, classify, find_process)
+    failures = {EV_AUTH_FAIL: "Authentication failed", EV_TLS_FAIL: "TLS/Certificate error"}
+
+    auth_file = _write_auth(cfg) if cfg.username and cfg.password else None
+    try:
+        fd, proc, pid, via_helper = _launch(cfg.config_path, auth_file)
+    except Exception as ex:
+        _unlink(auth_file); _err(str(ex)); return 1
+
+    log = SessionLog(LOG_DIR, cfg.name)
+    log.write(f"=== Connecting to '{cfg.name}' (command line) ===")
+    os.set_blocking(fd, False)
+    reader = LineReader(fd)
+    sel = selectors.DefaultSelector(); sel.register(fd, selectors.EVENT_READ)
+    iface = None; error = None; ok = False
+    deadline = time.monotonic() + args.timeout
+    try:
+        while not ok and error is None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                error = f"Timed out after {args.timeout:g} s"; break
+            if not sel.select(left): continue
+            block = reader.read()
+            if reader.eof and not block:
+                error = "openvpn exited"; break
+            if not block: continue
+            if pid is None and proc is not None:
+                pid = find_process(proc.pid, 'openvpn') or proc.pid
+            text = str(block, 'utf-8', 'replace')
+            for line in text.splitlines():
+                if not line.strip(): continue
+                log.write(line)
+                if args.verbose: print(line)
+            for ev in classify(text):
+                if ev.kind == EV_TUN_OPENED: iface = ev.detail
+                elif ev.kind == EV_CONNECTED: ok = True
+                elif ev.kind in EV_FAILURES:
+                    error = failures.get(ev.kind, f"Fatal: {ev.line}"); break
+    except KeyboardInterrupt:
+        error = "Interrupted"
+
+    if not ok:
+        if pid is None and proc is not None: pid = proc.pid
+        if pid is not None and error != "openvpn exited":
+            _signal(pid, signal.SIGTERM, via_helper)
+        log.write(f"=== {error} ==="); log.close(); sel.close()
+        _unlink(auth_file)
+        if proc is None: os.close(fd)   # the helper's pipe; Popen owns its own
+        _err(error)
+        return 130 if error == "Interrupted" else 1
+
+    _save_state({"profile": cfg.name, "pid": pid, "iface": iface, "started": time.time(),
+                 "helper": via_helper})
+    log.flush()
+    if os.fork() == 0:
+        # Detached drainer: keeps openvpn's output flowing into the session
+        # log (a closed pipe would kill it) and tidies up once it exits.
+        os.setsid()
+        null = os.open(os.devnull, os.O_RDWR)
+        for n in (0, 1, 2): os.dup2(null, n)
+        try:
+            while not reader.eof:
+                if not sel.select(): continue
+                block = reader.read()
+                if block:
+                    for line in str(block, 'utf-8', 'replace').splitlines():
+                        if line.strip(): log.write(line)
+            log.write("=== Disconnected ===")
+        finally:
+            log.close(); _unlink(auth_file); _clear_state(pid)
+            os._exit(0)
+    print(f"Connected to '{cfg.name}'" + (f" on {iface}" if iface else "") + f" (pid {pid})")
+    return 0
+
+
+def cmd_disconnect(args) -> int:
+    st = _live_state()
+    if st is None:
+        print("Not connected."); return 0
+    pid, via_helper = st["pid"], st.get("helper", False)
+    if not _signal(pid, signal.SIGTERM, via_helper):
+        _err(f"could not signal pid {pid}"); return 1
+    if not _wait_exit(pid, args.timeout):
+        _signal(pid, signal.SIGKILL, via_helper); _wait_exit(pid, 2)
+    _clear_state(pid)
+    print(f"Disconnected from '{st['profile']}'.")
+    return 0
+
+
+def cmd_status(args) -> int:
+    st = _live_state()
+    if st is None:
+        out = {"state": "disconnected"}
+    else:
+        out = {"state": "connected", "profile": st["profile"], "pid": st["pid"],
+               "iface": st.get("iface"), "since": st["started"],
+               "duration": int(time.time() - st["started"]), "sent": None, "recv": None}
+        if st.get("iface"):
+            from tunnel import IfaceCounters
+            c = IfaceCounters(st["iface"])
+            out["sent"], out["recv"] = c.read(); c.close()
+    if args.json:
+        print(json.dumps(out))
+    elif st is None:
+        print("Disconnected")
+    else:
+        print(f"Connected to '{out['profile']}'" + (f" on {out['iface']}" if out['iface'] else "")
+              + f" for {fmt_dur(out['duration'])}"
+              + f" — ↑ {fmt_bytes(out['sent'])}  ↓ {fmt_bytes(out['recv'])}")
+    return 0 if st is not None else EXIT_NOT_CONNECTED
+
+
+def cmd_watch(args) -> int:
+    import socket
+    from events import default_path
+    try:
+        from config import EVENTS_SOCKET
+    except ImportError:
+        EVENTS_SOCKET = None
+    path = EVENTS_SOCKET or default_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError as ex:
+        _err(f"no event stream at {path}: {ex.strerror}"); return 1
+    out = sys.stdout.buffer
+    try:
+        while data := sock.recv(65536):
+            out.write(data); out.flush()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_gui(args) -> int:
+    from instance import forward
+    if forward(args.qt_args):
+        return 0    # the running window took over; no Qt startup needed
+    from main import main as gui
+    sys.argv = [sys.argv[0]] + args.qt_args
+    gui()
+    return 0
+
+
+# ── Entry point ───────────────────────────────────────────────────────────────
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="openvpn-manager", description="OpenVPN Manager")
+    sub = ap.add_subparsers(dest="command")
+
+    p = sub.add_parser("gui", help="start the graphical interface (default)")
+    p.add_argument("qt_args", nargs=argparse.REMAINDER)
+    p.set_defaults(func=cmd_gui)
+
+    p = sub.add_parser("list", help="list saved profiles")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("import", help="save an .ovpn file as a profile")
+    p.add_argument("file")
+    p.add_argument("--name")
+    p.add_argument("--username")
+    p.add_argument("--password-stdin", action="store_true", help="read the password from stdin")
+    p.add_argument("--force", action="store_true", help="replace an existing profile")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("connect", help="connect a profile and return once the tunnel is up")
+    p.add_argument("profile")
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("-v", "--verbose", action="store_true", help="echo openvpn output")
+    p.set_defaults(func=cmd_connect)
+
+    p = sub.add_parser("disconnect", help="stop the tunnel started from the command line")
+    p.add_argument("--timeout", type=float, default=15.0)
+    p.set_defaults(func=cmd_disconnect)
+
+    p = sub.add_parser("status", help="show the tunnel started from the command line")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("watch", help="print the running GUI's events as JSON lines")
+    p.set_defaults(func=cmd_watch)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        args = build_parser().parse_args(["gui"])
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -125,6 +125,29 @@ def get_developer_string():
     return f"Developed by {ORGANIZATION_NAME}"
 
 
+# Log page: maximum number of lines kept in memory and shown in the view.
+# Older lines are dropped from the top once the cap is reached.
+LOG_MAX_LINES = 5000
+
+# Per-session log files under ~/.openvpn_gui/logs/. A segment is rotated once
+# it reaches LOG_SEGMENT_MB or LOG_SEGMENT_HOURS; closed segments can be
+# gzipped, and sessions older than LOG_RETENTION_DAYS are deleted.
+LOG_SEGMENT_MB = 32
+LOG_SEGMENT_HOURS = 24
+LOG_GZIP_CLOSED = False
+LOG_RETENTION_DAYS = 30
+
+# Optional OpenMetrics endpoint for monitoring (tunnel state, bytes, rates,
+# connect attempts and failures). None disables it. Either "host:port"
+# (keep it on 127.0.0.1) or "unix:/path/to/socket".
+METRICS_LISTEN = None
+
+# Push-based JSON-lines event stream (state changes, per-second counters,
+# log events) for status bars and scripts. None uses
+# $XDG_RUNTIME_DIR/openvpn-manager/events.sock; "" turns it off.
+EVENTS_SOCKET = None
+
+
 # Optional override for the DNS update script path used with OpenVPN
 # Set to None to let the application auto-detect; otherwise provide the
 # full path to the helper script (for example '/etc/openvpn/update-resolv-conf')
@@ -0,0 +1,193 @@
+"""
+events.py — push-based event stream for status bars, prompts and scripts.
+
+The GUI publishes JSON lines on a Unix socket (mode 0600) so external
+tools can follow the tunnel instead of polling `pgrep`:
+
+    {"type": "state", "ts": ..., "state": "connecting", "profile": "Work"}
+    {"type": "state", "ts": ..., "state": "connected", "profile": "Work", "iface": "tun0"}
+    {"type": "counters", "ts": ..., "sent": 1234, "recv": 5678,
+     "up_rate": 10.5, "down_rate": 99.0, "duration": 42}        (bytes, bytes/s, s)
+    {"type": "log", "ts": ..., "kind": "restart", "detail": "...", "line": "..."}
+    {"type": "state", "ts": ..., "state": "failed", "error": "Authentication failed"}
+    {"type": "state", "ts": ..., "state": "disconnected"}
+
+A new subscriber first receives a "hello" line and the latest "state", so
+it never has to guess the current status.
+
+publish() serialises an event once and only appends it to each
+subscriber's bounded queue; a writer thread per subscriber does the
+socket I/O.  A subscriber whose queue fills up (it stopped reading) is
+disconnected, so a slow consumer can never stall the publisher.
+
+on_change, if given, is called with the new subscriber count whenever a
+subscriber joins or leaves.  It runs on the accept or writer thread, so a
+GUI should forward it through a queued signal.
+
+No Qt here.
+
+Usage:
+    from events import EventServer
+
+    ev = EventServer(on_change=lambda n: print(n, "subscribers")); ev.start()
+    ev.publish("state", state="connected", profile="Work", iface="tun0")
+    ...
+    ev.stop()
+
+    # subscriber side
+    socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/openvpn-manager/events.sock
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+
+PROTOCOL = 1
+MAX_QUEUE = 256          # events buffered per subscriber before it is dropped
+
+
+def default_path() -> str:
+    run = os.environ.get("XDG_RUNTIME_DIR")
+    base = os.path.join(run, "openvpn-manager") if run else os.path.expanduser("~/.openvpn_gui")
+    return os.path.join(base, "events.sock")
+
+
+class _Subscriber:
+    __slots__ = ("sock", "queue", "dropped")
+
+    def __init__(self, sock, max_queue):
+        self.sock = sock
+        self.queue: queue.Queue = queue.Queue(max_queue)
+        self.dropped = False
+
+
+class EventServer:
+    """Fan-out of JSON-lines events to any number of socket subscribers."""
+
+    def __init__(self, path: str | None = None, max_queue: int = MAX_QUEUE, on_change=None):
+        self.path = path or default_path()
+        self.max_queue = max_queue
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._subs: list[_Subscriber] = []
+        self._state: bytes | None = None      # last "state" line, replayed to newcomers
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subs)
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        old = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(old)
+        sock.listen(8)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._accept_loop, name="events", daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return      # listener closed by stop()
+            sub = _Subscriber(conn, self.max_queue)
+            sub.queue.put_nowait(self._encode("hello", version=PROTOCOL))
+            with self._lock:
+                if self._state is not None:
+                    sub.queue.put_nowait(self._state)
+                self._subs.append(sub); n = len(self._subs)
+            self._changed(n)
+            threading.Thread(target=self._write_loop, args=(sub,), name="events-sub",
+                             daemon=True).start()
+
+    def _write_loop(self, sub: _Subscriber):
+        try:
+            while True:
+                line = sub.queue.get()
+                if line is None or sub.dropped:
+                    break
+                sub.sock.sendall(line, socket.MSG_NOSIGNAL)
+        except OSError:
+            pass
+        finally:
+            self._remove(sub)
+            sub.sock.close()
+
+    def _remove(self, sub: _Subscriber):
+        with self._lock:
+            if sub not in self._subs:
+                return
+            self._subs.remove(sub); n = len(self._subs)
+        self._changed(n)
+
+    def _changed(self, n: int):
+        if self.on_change is not None:
+            try:
+                self.on_change(n)
+            except Exception as ex:
+                print(f"[events] Subscriber callback failed: {ex}")
+
+    def _drop(self, sub: _Subscriber):
+        """Cut off a subscriber without ever blocking the caller."""
+        sub.dropped = True
+        self._remove(sub)
+        try:
+            sub.sock.shutdown(socket.SHUT_RDWR)    # unblocks a stuck sendall()
+        except OSError:
+            pass
+        try:
+            sub.queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            sub.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    @staticmethod
+    def _encode(kind: str, **fields) -> bytes:
+        return json.dumps({"type": kind, "ts": round(time.time(), 3), **fields},
+                          separators=(",", ":")).encode() + b"\n"
+
+    def publish(self, kind: str, **fields) -> None:
+        line = self._encode(kind, **fields)
+        with self._lock:
+            if kind == "state":
+                self._state = line
+            subs = list(self._subs)
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(line)
+            except queue.Full:
+                self._drop(sub)
+
+    def stop(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close(); self._sock = None
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            self._drop(sub)
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
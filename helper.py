@@ -0,0 +1,511 @@
+"""
+helper.py — privileged helper that starts and stops openvpn for the GUI.
+
+Without it every connect is a `pkexec openvpn` and every escalated
+disconnect a `pkexec kill`, each a separate polkit round-trip.  The helper
+runs as root, socket-activated by systemd (openvpn-manager-helper.socket),
+and speaks a narrow JSON-lines protocol on /run/openvpn-manager/helper.sock.
+A GUI keeps one connection open for its whole session: polkit is asked
+once when the connection authenticates, after which start/stop are plain
+socket round-trips.
+
+Requests are one JSON object per line; every reply is one JSON line:
+
+    {"op": "hello"}                         -> {"ok": true, "version": 2, "authorized": false}
+    {"op": "auth"}                          -> {"ok": true}      (polkit check, may prompt)
+    {"op": "start", "config": "/abs/x.ovpn", "auth": true,
+     "management": "/tmp/../mgmt.sock"}  + config fd [, auth file fd]
+                                            -> {"ok": true, "pid": 1234}  + openvpn's stdout fd
+    {"op": "stop", "pid": 1234, "signal": "TERM"}  -> {"ok": true}
+    {"op": "status", "pid": 1234}           -> {"ok": true, "processes": [{"pid", "config", "rc"}]}
+    {"op": "legacy"}                        -> {"ok": true, "exists": true}   (no auth needed)
+    {"op": "legacy_list"}                   -> {"ok": true, "files": ["configs.json", ...]}
+    {"op": "legacy_open", "name": "logs/x.000.log"} -> {"ok": true}  + the file's fd
+
+The legacy ops hand over what the GUI stored in /root/.openvpn_gui while
+it ran as root, so an unprivileged GUI can copy it into the user's home
+(HelperClient.import_legacy) without root ever writing there.
+
+Failures come back as {"ok": false, "error": "..."}.  The helper composes
+the openvpn command line itself.  The caller opens the config and auth
+file and sends the descriptors over SCM_RIGHTS, which proves it may read
+them (a root-owned /etc/openvpn/client profile the user can read is
+fine, /etc/shadow is not); each must be a regular file, and openvpn reads
+it as /dev/fd/N, so no path is ever resolved as root.  The config path
+itself only sets openvpn's working directory.  Only processes the helper
+started for the same user can be signalled.  openvpn's stdout travels
+back over SCM_RIGHTS, so the GUI reads the log exactly as it would from
+its own child.
+
+The daemon exits after a minute with no clients and no tunnels; systemd
+starts it again on the next connection.
+
+No Qt here.
+
+Usage:
+    from helper import HelperClient
+
+    if HelperClient.available():
+        h = HelperClient()
+        h.authorize()
+        pid, fd = h.start("/home/me/work.ovpn")
+        ...
+        h.stop(pid)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from tunnel import openvpn_command
+
+
+SOCKET_PATH = "/run/openvpn-manager/helper.sock"
+ACTION_ID = "org.example.openvpn-manager.helper"
+PROTOCOL = 2
+IDLE_EXIT = 60.0
+
+DNS_SCRIPTS = ("/etc/openvpn/update-resolv-conf", "/etc/openvpn/update-systemd-resolved")
+SIGNALS = ("TERM", "INT", "HUP", "USR1", "KILL")
+
+LEGACY_DIR = "/root/.openvpn_gui"       # the GUI's data while it ran as root via pkexec
+LEGACY_SKIP = ("cli-session.json", "history.db-shm")
+
+
+class HelperError(Exception):
+    """The helper refused or failed a request."""
+
+
+def dns_script(preferred: str | None = None) -> str | None:
+    """The executable DNS update script openvpn should call, if any."""
+    for s in ((preferred,) if preferred else ()) + DNS_SCRIPTS:
+        if os.path.exists(s) and os.access(s, os.X_OK):
+            return s
+    return None
+
+
+# ── Daemon ────────────────────────────────────────────────────────────────────
+
+def _peer(sock) -> tuple[int, int, int]:
+    """(pid, uid, gid) of the process at the other end of a Unix socket."""
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)
+
+
+def _start_time(pid: int) -> str:
+    # Field 22 of /proc/<pid>/stat; the command name before it may contain spaces.
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()[19]
+
+
+def _authorize(pid: int, uid: int) -> bool:
+    if uid == 0:
+        return True
+    try:
+        subject = f"{pid},{_start_time(pid)},{uid}"
+        r = subprocess.run(["pkcheck", "--action-id", ACTION_ID, "--process", subject,
+                            "--allow-user-interaction"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, IndexError):
+        return False
+    return r.returncode == 0
+
+
+def _check_fd(fd: int, what: str) -> int:
+    """A descriptor the caller opened for openvpn must be a regular file."""
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        raise HelperError(f"{what} is not a regular file")
+    return fd
+
+
+def _check_socket(path, uid: int) -> str:
+    """The management socket must sit in a directory the caller owns."""
+    if not isinstance(path, str) or not os.path.isabs(path):
+        raise HelperError("management socket must be an absolute path")
+    try:
+        st, dst = os.stat(path), os.stat(os.path.dirname(path))
+    except OSError as ex:
+        raise HelperError(f"management socket: {ex.strerror}")
+    if not stat.S_ISSOCK(st.st_mode) or dst.st_uid != uid:
+        raise HelperError("management socket is not the caller's")
+    return path
+
+
+class _Child:
+    __slots__ = ("proc", "uid", "config")
+
+    def __init__(self, proc, uid, config):
+        self.proc, self.uid, self.config = proc, uid, config
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.pid, self.uid, _ = _peer(self.request)
+        self.authorized = False
+        self.server.client_joined()
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            self.server.client_left()
+
+    def _requests(self):
+        """Yield (line, descriptors sent with it); clients wait for each reply."""
+        buf, fds = b"", []
+        while True:
+            data, got, _, _ = socket.recv_fds(self.request, 65536, 4)
+            fds += got
+            if not data:
+                for fd in fds: os.close(fd)
+                return
+            buf += data
+            while b"\n" in buf:
+                raw, buf = buf.split(b"\n", 1)
+                yield raw, fds; fds = []
+
+    def handle(self):
+        for raw, passed in self._requests():
+            fds = []
+            try:
+                req = json.loads(raw)
+                reply, fds = self._dispatch(req.get("op"), req, passed)
+            except HelperError as ex:
+                reply = {"ok": False, "error": str(ex)}
+            except (ValueError, TypeError, AttributeError) as ex:
+                reply = {"ok": False, "error": f"bad request: {ex}"}
+            finally:
+                for fd in passed: os.close(fd)
+            try:
+                socket.send_fds(self.request, [json.dumps(reply).encode() + b"\n"], fds)
+            finally:
+                for fd in fds: os.close(fd)
+
+    def _dispatch(self, op, req, passed=()):
+        srv = self.server
+        if op == "hello":
+            return {"ok": True, "version": PROTOCOL, "authorized": self.authorized}, []
+        if op == "legacy":
+            return {"ok": True, "exists": os.path.isdir(srv.legacy_dir)}, []
+        if op == "auth":
+            if not self.authorized:
+                self.authorized = _authorize(self.pid, self.uid)
+                print(f"[helper] uid {self.uid} pid {self.pid} "
+                      f"{'authorized' if self.authorized else 'denied'}")
+            if not self.authorized:
+                raise HelperError("not authorized")
+            return {"ok": True}, []
+        if not self.authorized:
+            raise HelperError("not authorized")
+        if op == "start":
+            want = 2 if req.get("auth") else 1
+            if len(passed) != want:
+                raise HelperError(f"expected {want} file descriptor(s), got {len(passed)}")
+            pid, fd = srv.launch(self.uid, req.get("config"), passed[0],
+                                 passed[1] if want == 2 else None, req.get("management"))
+            return {"ok": True, "pid": pid}, [fd]
+        if op == "stop":
+            srv.kill(self.uid, req.get("pid"), req.get("signal", "TERM"))
+            return {"ok": True}, []
+        if op == "status":
+            return {"ok": True, "processes": srv.status(self.uid, req.get("pid"))}, []
+        if op == "legacy_list":
+            return {"ok": True, "files": srv.legacy_files()}, []
+        if op == "legacy_open":
+            return {"ok": True}, [srv.legacy_open(req.get("name"))]
+        raise HelperError(f"unknown op {op!r}")
+
+
+class HelperServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """One thread per client connection; openvpn children are tracked by pid."""
+    daemon_threads = True
+    timeout = 5.0
+
+    def __init__(self, path: str = SOCKET_PATH, listen_fd: int | None = None,
+                 idle_exit: float = IDLE_EXIT, legacy_dir: str = LEGACY_DIR):
+        super().__init__(path, _Handler, bind_and_activate=listen_fd is None)
+        if listen_fd is not None:
+            self.socket.close()
+            self.socket = socket.socket(fileno=listen_fd)
+        self.idle_exit = idle_exit
+        self.legacy_dir = legacy_dir
+        self._lock = threading.Lock()
+        self._children: dict[int, _Child] = {}
+        self._clients = 0
+        self._last = time.monotonic()
+
+    def server_bind(self):
+        os.makedirs(os.path.dirname(self.server_address), mode=0o755, exist_ok=True)
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+        super().server_bind()
+        # Anyone may connect; nothing happens until polkit says yes.
+        os.chmod(self.server_address, 0o666)
+
+    def client_joined(self):
+        with self._lock:
+            self._clients += 1
+
+    def client_left(self):
+        with self._lock:
+            self._clients -= 1; self._last = time.monotonic()
+
+    def launch(self, uid, config, config_fd, auth_fd=None, management=None) -> tuple[int, int]:
+        """Start openvpn on descriptors the caller opened; the caller keeps ownership of them."""
+        try:
+            from config import OPENVPN_DNS_SCRIPT
+        except ImportError:
+            OPENVPN_DNS_SCRIPT = None
+        extra = ["--management", _check_socket(management, uid), "unix", "--management-client"] \
+            if management else []
+        if not isinstance(config, str) or not os.path.isabs(config):
+            raise HelperError("config must be an absolute path")
+        fds = [_check_fd(config_fd, "config")]
+        if auth_fd is not None:
+            fds.append(_check_fd(auth_fd, "auth file"))
+        cmd = openvpn_command(f"/dev/fd/{fds[0]}", dns_script(OPENVPN_DNS_SCRIPT),
+                              f"/dev/fd/{fds[1]}" if auth_fd is not None else None, extra)
+        # Relative ca/cert/key paths in the profile still resolve next to it.
+        cwd = os.path.dirname(config)
+        try:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT, cwd=cwd, start_new_session=True,
+                                    pass_fds=fds)
+        except FileNotFoundError:
+            raise HelperError("openvpn not found — install the openvpn package")
+        except OSError as ex:
+            raise HelperError(f"could not start openvpn: {ex.strerror}")
+        fd = os.dup(proc.stdout.fileno()); proc.stdout.close()
+        with self._lock:
+            self._children[proc.pid] = _Child(proc, uid, config)
+        threading.Thread(target=self._reap, args=(proc,), daemon=True).start()
+        print(f"[helper] started openvpn pid {proc.pid} for uid {uid}: {config}")
+        return proc.pid, fd
+
+    def _reap(self, proc):
+        rc = proc.wait()
+        print(f"[helper] openvpn pid {proc.pid} exited ({rc})")
+        with self._lock:
+            self._last = time.monotonic()
+
+    def kill(self, uid, pid, name) -> None:
+        if name not in SIGNALS:
+            raise HelperError(f"signal {name!r} not allowed")
+        with self._lock:
+            child = self._children.get(pid)
+        if child is None or (uid != 0 and child.uid != uid):
+            raise HelperError(f"no such process: {pid}")
+        if child.proc.poll() is None:
+            child.proc.send_signal(getattr(signal, "SIG" + name))
+
+    def status(self, uid, pid=None) -> list[dict]:
+        with self._lock:
+            children = [(p, c) for p, c in self._children.items()
+                        if (uid == 0 or c.uid == uid) and (pid is None or p == pid)]
+            out = [{"pid": p, "config": c.config, "rc": c.proc.poll()} for p, c in children]
+            # Forget exited tunnels once their owner has seen them.
+            for p, c in children:
+                if c.proc.returncode is not None and c.uid == uid:
+                    del self._children[p]
+        return out
+
+    def legacy_files(self) -> list[str]:
+        """Regular files under legacy_dir, relative to it; symlinks are left out."""
+        out = []
+        for base, _, files in os.walk(self.legacy_dir):
+            for n in files:
+                path = os.path.join(base, n)
+                rel = os.path.relpath(path, self.legacy_dir)
+                if rel not in LEGACY_SKIP and stat.S_ISREG(os.lstat(path).st_mode):
+                    out.append(rel)
+        return sorted(out)
+
+    def legacy_open(self, name) -> int:
+        if name not in self.legacy_files():
+            raise HelperError(f"no such file: {name!r}")
+        try:
+            fd = os.open(os.path.join(self.legacy_dir, name),
+                         os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK | os.O_CLOEXEC)
+        except OSError as ex:
+            raise HelperError(f"{name}: {ex.strerror}")
+        try:
+            return _check_fd(fd, name)
+        except HelperError:
+            os.close(fd); raise
+
+    def idle(self) -> bool:
+        with self._lock:
+            busy = self._clients or any(c.proc.poll() is None for c in self._children.values())
+            if busy:
+                self._last = time.monotonic()
+            return not busy and time.monotonic() - self._last > self.idle_exit
+
+    def serve(self) -> None:
+        while not self.idle():
+            self.handle_request()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="OpenVPN Manager privileged helper")
+    ap.add_argument("--socket", default=SOCKET_PATH, help="listen here when not socket-activated")
+    ap.add_argument("--idle-exit", type=float, default=IDLE_EXIT,
+                    help="seconds without clients or tunnels before exiting")
+    args = ap.parse_args(argv)
+    if os.geteuid() != 0:
+        print("[helper] must run as root", file=sys.stderr); return 1
+
+    listen_fd = None
+    if os.environ.get("LISTEN_PID") == str(os.getpid()) and int(os.environ.get("LISTEN_FDS", "0")) >= 1:
+        listen_fd = 3   # SD_LISTEN_FDS_START
+    srv = HelperServer(args.socket, listen_fd, args.idle_exit)
+    print(f"[helper] listening on {args.socket}{' (socket-activated)' if listen_fd else ''}")
+    try:
+        srv.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        if listen_fd is None:
+            try: os.unlink(args.socket)
+            except OSError: pass
+    print("[helper] idle, exiting")
+    return 0
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+class HelperClient:
+    """
+    Connection to the helper.  Calls are serialised, so one client may be
+    shared by the GUI thread and the connection worker; only authorize()
+    can block for long (it waits on the polkit dialog).
+    """
+
+    def __init__(self, path: str = SOCKET_PATH):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        try:
+            self._sock.connect(path)
+        except OSError:
+            self._sock.close(); raise
+        self._lock = threading.Lock()
+        self.authorized = self._call("hello")[0].get("authorized", False)
+
+    @staticmethod
+    def available(path: str = SOCKET_PATH) -> bool:
+        try:
+            return stat.S_ISSOCK(os.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def _call(self, op: str, passed=(), **args) -> tuple[dict, list[int]]:
+        with self._lock:
+            socket.send_fds(self._sock, [json.dumps({"op": op, **args}).encode() + b"\n"], passed)
+            buf, fds = b"", []
+            while not buf.endswith(b"\n"):
+                data, got, _, _ = socket.recv_fds(self._sock, 65536, 4)
+                fds += got
+                if not data:
+                    for fd in fds: os.close(fd)
+                    raise ConnectionResetError("helper closed the connection")
+                buf += data
+        reply = json.loads(buf)
+        if not reply.get("ok"):
+            for fd in fds: os.close(fd)
+            raise HelperError(reply.get("error", "request failed"))
+        return reply, fds
+
+    def authorize(self) -> None:
+        if not self.authorized:
+            self._call("auth"); self.authorized = True
+
+    def start(self, config: str, auth_file: str | None = None,
+              management: str | None = None) -> tuple[int, int]:
+        """
+        Start openvpn; returns (pid, fd of its combined stdout/stderr).
+        The files are opened here, with the caller's own permissions.
+        """
+        config = os.path.abspath(config)
+        passed = []
+        try:
+            for path, what in ((config, "config"), (auth_file, "auth file")):
+                if not path: continue
+                try:
+                    passed.append(os.open(path, os.O_RDONLY | os.O_CLOEXEC))
+                except OSError as ex:
+                    raise HelperError(f"{what}: {ex.strerror}")
+            reply, fds = self._call("start", passed, config=config, auth=bool(auth_file),
+                                    management=management)
+        finally:
+            for fd in passed: os.close(fd)
+        if not fds:
+            raise HelperError("helper sent no output pipe")
+        for fd in fds[1:]: os.close(fd)
+        return reply["pid"], fds[0]
+
+    def stop(self, pid: int, sig: int = signal.SIGTERM) -> None:
+        self._call("stop", pid=pid, signal=signal.Signals(sig).name[3:])
+
+    def status(self, pid: int | None = None) -> list[dict]:
+        return self._call("status", pid=pid)[0]["processes"]
+
+    def legacy_data(self) -> bool:
+        """True when the root-run GUI left data behind in /root/.openvpn_gui."""
+        return self._call("legacy")[0].get("exists", False)
+
+    def import_legacy(self, dest) -> int:
+        """
+        Copy the root-run GUI's data into <dest>; returns the number of files.
+        Files already in <dest> are kept, except that profiles missing from
+        its configs.json are merged in.
+        """
+        self.authorize()
+        os.makedirs(dest, mode=0o700, exist_ok=True)
+        files = self._call("legacy_list")[0]["files"]
+        existing = {n for n in files if os.path.lexists(os.path.join(dest, n))}
+        copied = 0
+        for name in files:
+            # A WAL belongs to its database; never pair it with a different one.
+            if name.endswith("-wal") and name[:-4] in existing:
+                continue
+            if name in existing and name != "configs.json":
+                continue
+            target = os.path.join(dest, name)
+            os.makedirs(os.path.dirname(target), mode=0o700, exist_ok=True)
+            _, fds = self._call("legacy_open", name=name)
+            for fd in fds[1:]: os.close(fd)
+            tmp = target + ".import"
+            out = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600)
+            with os.fdopen(fds[0], "rb") as src, os.fdopen(out, "wb") as dst:
+                if name in existing:
+                    with open(target) as f:
+                        mine = json.load(f)
+                    dst.write(json.dumps({**json.load(src), **mine}, indent=2).encode())
+                else:
+                    shutil.copyfileobj(src, dst)
+            os.replace(tmp, target); copied += 1
+        return copied
+
+    @property
+    def closed(self) -> bool:
+        return self._sock.fileno() < 0
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
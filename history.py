@@ -0,0 +1,231 @@
+"""
+history.py — persistent session history for the Statistics page.
+
+One SQLite database (WAL mode) under ~/.openvpn_gui/history.db:
+
+    sessions   one row per finished session
+    daily      per (day, profile) rollup
+    monthly    per (month, profile) rollup
+    sketches   merged DDSketch of per-second rates, all-time and per profile
+
+The rollups are upserted in the same transaction as the session row, so
+all-time and per-profile figures come from a few hundred monthly rows even
+after years of history — the sessions table is only read a page at a
+time for the session list.  A session counts towards the day and month it started in.
+
+No Qt here.
+
+Usage:
+    from history import SessionHistory
+
+    h = SessionHistory(path)
+    h.add({"profile": "Work", "started": time.time(), "duration": 3600,
+           "upload": 1_000_000, "download": 9_000_000,
+           "pk_up": 120.0, "pk_dn": 900.0, "reason": "Manual disconnect"})
+    print(h.totals(), h.by_profile(), h.page(0, 50, sort="upload"))
+"""
+
+import sqlite3
+import time
+
+from sketch import DDSketch
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    profile   TEXT    NOT NULL,
+    started   INTEGER NOT NULL,
+    duration  INTEGER NOT NULL,
+    upload    INTEGER NOT NULL,
+    download  INTEGER NOT NULL,
+    pk_up     REAL    NOT NULL,
+    pk_dn     REAL    NOT NULL,
+    reason    TEXT    NOT NULL,
+    p50_up    REAL    NOT NULL DEFAULT 0,
+    p95_up    REAL    NOT NULL DEFAULT 0,
+    p99_up    REAL    NOT NULL DEFAULT 0,
+    p50_dn    REAL    NOT NULL DEFAULT 0,
+    p95_dn    REAL    NOT NULL DEFAULT 0,
+    p99_dn    REAL    NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions(started);
+CREATE INDEX IF NOT EXISTS sessions_profile ON sessions(profile, started);
+CREATE TABLE IF NOT EXISTS sketches (
+    scope     TEXT    PRIMARY KEY,      -- "*" all-time, "p:<profile>" per profile
+    up        BLOB    NOT NULL,
+    dn        BLOB    NOT NULL
+);
+"""
+
+_ROLLUP = """
+CREATE TABLE IF NOT EXISTS {name} (
+    period    TEXT    NOT NULL,
+    profile   TEXT    NOT NULL,
+    sessions  INTEGER NOT NULL,
+    seconds   INTEGER NOT NULL,
+    upload    INTEGER NOT NULL,
+    download  INTEGER NOT NULL,
+    pk_up     REAL    NOT NULL,
+    pk_dn     REAL    NOT NULL,
+    PRIMARY KEY (period, profile)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO {name} (period, profile, sessions, seconds, upload, download, pk_up, pk_dn)
+VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (period, profile) DO UPDATE SET
+    sessions = sessions + 1,
+    seconds  = seconds  + excluded.seconds,
+    upload   = upload   + excluded.upload,
+    download = download + excluded.download,
+    pk_up    = MAX(pk_up, excluded.pk_up),
+    pk_dn    = MAX(pk_dn, excluded.pk_dn)
+"""
+
+_ROLLUPS = (("daily", "%Y-%m-%d"), ("monthly", "%Y-%m"))
+
+_QUANTILES = (0.5, 0.95, 0.99)
+_PCT_COLUMNS = ("p50_up", "p95_up", "p99_up", "p50_dn", "p95_dn", "p99_dn")
+
+# Columns the session table may be sorted by.
+SORT_COLUMNS = ("started", "profile", "duration", "upload", "download", "pk_up", "pk_dn", "reason",
+                *_PCT_COLUMNS)
+
+
+class RunningTotals:
+    """Aggregate of finished sessions, updated in O(1) per session."""
+    __slots__ = ("sessions", "seconds", "upload", "download", "pk_up", "pk_dn",
+                 "up_sketch", "dn_sketch")
+
+    def __init__(self, sessions=0, seconds=0, upload=0, download=0, pk_up=0.0, pk_dn=0.0):
+        self.sessions, self.seconds = sessions or 0, seconds or 0
+        self.upload, self.download = upload or 0, download or 0
+        self.pk_up, self.pk_dn = pk_up or 0.0, pk_dn or 0.0
+        self.up_sketch, self.dn_sketch = DDSketch(), DDSketch()
+
+    def add(self, s: dict) -> None:
+        self.sessions += 1
+        self.seconds += int(s["duration"])
+        self.upload += int(s["upload"]); self.download += int(s["download"])
+        self.pk_up = max(self.pk_up, float(s["pk_up"]))
+        self.pk_dn = max(self.pk_dn, float(s["pk_dn"]))
+        if s.get("up_sketch") is not None: self.up_sketch.merge(s["up_sketch"])
+        if s.get("dn_sketch") is not None: self.dn_sketch.merge(s["dn_sketch"])
+
+
+class SessionHistory:
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            for name, _ in _ROLLUPS:
+                self._db.executescript(_ROLLUP.format(name=name))
+            # Databases from before the percentile columns existed.
+            have = {r["name"] for r in self._db.execute("PRAGMA table_info(sessions)")}
+            for col in _PCT_COLUMNS:
+                if col not in have:
+                    self._db.execute(f"ALTER TABLE sessions ADD COLUMN {col} REAL NOT NULL DEFAULT 0")
+
+    def add(self, s: dict) -> None:
+        """
+        Record a finished session.  Optional "up_sketch"/"dn_sketch" DDSketch
+        entries set its percentiles and are merged into the profile and
+        all-time sketches.
+        """
+        started = int(s["started"])
+        local = time.localtime(started)
+        profile = s.get("profile", "")
+        vals = (int(s["duration"]), int(s["upload"]), int(s["download"]),
+                float(s["pk_up"]), float(s["pk_dn"]))
+        up, dn = s.get("up_sketch"), s.get("dn_sketch")
+        pcts = [*(up.quantiles(_QUANTILES) if up else (0.0,) * 3),
+                *(dn.quantiles(_QUANTILES) if dn else (0.0,) * 3)]
+        with self._db:
+            self._db.execute(
+                "INSERT INTO sessions (profile, started, duration, upload, download, pk_up, pk_dn, reason,"
+                f" {', '.join(_PCT_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (profile, started, *vals, s.get("reason", ""), *pcts),
+            )
+            for name, fmt in _ROLLUPS:
+                self._db.execute(_UPSERT.format(name=name),
+                                 (time.strftime(fmt, local), profile, *vals))
+            if up is not None and dn is not None:
+                for scope in ("*", "p:" + profile):
+                    m_up, m_dn = self._sketches(scope)
+                    m_up.merge(up); m_dn.merge(dn)
+                    self._db.execute("INSERT OR REPLACE INTO sketches (scope, up, dn) VALUES (?, ?, ?)",
+                                     (scope, m_up.to_bytes(), m_dn.to_bytes()))
+
+    def _sketches(self, scope: str) -> tuple[DDSketch, DDSketch]:
+        r = self._db.execute("SELECT up, dn FROM sketches WHERE scope = ?", (scope,)).fetchone()
+        if r is None:
+            return DDSketch(), DDSketch()
+        return DDSketch.from_bytes(r["up"]), DDSketch.from_bytes(r["dn"])
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        rows = self._db.execute(
+            "SELECT * FROM sessions ORDER BY started DESC, id DESC LIMIT ?", (limit,))
+        return [dict(r) for r in rows]
+
+    def totals(self) -> dict:
+        """All-time totals, computed from the monthly rollup."""
+        r = self._db.execute(
+            "SELECT COALESCE(SUM(sessions), 0) AS sessions, COALESCE(SUM(seconds), 0) AS seconds,"
+            " COALESCE(SUM(upload), 0) AS upload, COALESCE(SUM(download), 0) AS download,"
+            " COALESCE(MAX(pk_up), 0) AS pk_up, COALESCE(MAX(pk_dn), 0) AS pk_dn FROM monthly"
+        ).fetchone()
+        return dict(r)
+
+    def by_profile(self) -> list[dict]:
+        rows = self._db.execute(
+            "SELECT profile, SUM(sessions) AS sessions, SUM(seconds) AS seconds,"
+            " SUM(upload) AS upload, SUM(download) AS download,"
+            " MAX(pk_up) AS pk_up, MAX(pk_dn) AS pk_dn FROM monthly"
+            " GROUP BY profile ORDER BY SUM(upload) + SUM(download) DESC")
+        return [dict(r) for r in rows]
+
+    def running_totals(self) -> dict:
+        """{None: all-time RunningTotals, profile: RunningTotals, ...} from the rollup."""
+        out = {None: RunningTotals(**self.totals())}
+        out[None].up_sketch, out[None].dn_sketch = self._sketches("*")
+        for r in self.by_profile():
+            name = r.pop("profile"); t = out[name] = RunningTotals(**r)
+            t.up_sketch, t.dn_sketch = self._sketches("p:" + name)
+        return out
+
+    def count(self, profile: str | None = None) -> int:
+        if profile is None:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return self._db.execute("SELECT COUNT(*) FROM sessions WHERE profile = ?", (profile,)).fetchone()[0]
+
+    def page(self, offset: int, limit: int, sort: str = "started", desc: bool = True,
+             profile: str | None = None) -> list[dict]:
+        """One page of sessions, sorted by a column from SORT_COLUMNS."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"cannot sort by {sort!r}")
+        order = "DESC" if desc else "ASC"
+        sql = "SELECT * FROM sessions"
+        args: list = []
+        if profile is not None:
+            sql += " WHERE profile = ?"; args.append(profile)
+        sql += f" ORDER BY {sort} {order}, id {order} LIMIT ? OFFSET ?"
+        return [dict(r) for r in self._db.execute(sql, (*args, limit, offset))]
+
+    def rollup(self, table: str = "daily", since: str = "", profile: str | None = None) -> list[dict]:
+        """Rows of the "daily" or "monthly" rollup from period <since> on, oldest first."""
+        if table not in dict(_ROLLUPS):
+            raise ValueError(f"unknown rollup table: {table}")
+        sql = f"SELECT * FROM {table} WHERE period >= ?"
+        args: list = [since]
+        if profile is not None:
+            sql += " AND profile = ?"; args.append(profile)
+        return [dict(r) for r in self._db.execute(sql + " ORDER BY period", args)]
+
+    def close(self) -> None:
+        self._db.close()
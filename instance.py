@@ -0,0 +1,210 @@
+"""
+instance.py — single-instance lock and hand-off to the running window.
+
+The first GUI takes an flock on instance.lock and listens on
+instance.sock next to it.  A later launch connects to the socket, sends
+its arguments as one JSON line, waits for "ok" and exits.  It never
+imports Qt or asks for authentication, so this takes milliseconds.
+
+Both files live in a directory that belongs to the desktop user:
+$XDG_RUNTIME_DIR/openvpn-manager, or /run/user/<uid>/openvpn-manager when
+the GUI runs as root through pkexec or sudo.  Only that user and root may
+hand arguments over; the peer is checked with SO_PEERCRED.
+
+No Qt here — the GUI watches fileno() with a QSocketNotifier.
+
+Usage:
+    from instance import SingleInstance, forward
+
+    if forward(sys.argv[1:]):            # a running instance took over
+        sys.exit(0)
+    inst = SingleInstance()
+    if not inst.acquire(): ...
+    # when inst.fileno() is readable:
+    argv = inst.accept()                 # None if nothing usable arrived
+"""
+
+import fcntl
+import json
+import os
+import socket
+import struct
+import time
+
+
+def desktop_uid() -> int:
+    """The uid of the user at the desktop, even when running under pkexec/sudo."""
+    if os.getuid() == 0:
+        for var in ("PKEXEC_UID", "SUDO_UID"):
+            try:
+                return int(os.environ[var])
+            except (KeyError, ValueError):
+                continue
+    return os.getuid()
+
+
+def runtime_dir() -> str:
+    uid = desktop_uid()
+    run = os.environ.get("XDG_RUNTIME_DIR") if uid == os.getuid() else None
+    run = run or f"/run/user/{uid}"
+    if not os.path.isdir(run):
+        if os.getuid() == 0:
+            # /tmp names are predictable; root must not create or chown anything there.
+            raise FileNotFoundError(f"no runtime directory for uid {uid}")
+        return f"/tmp/openvpn-manager-{uid}"
+    return os.path.join(run, "openvpn-manager")
+
+
+class SingleInstance:
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or runtime_dir()
+        self.lock_path = os.path.join(self.directory, "instance.lock")
+        self.sock_path = os.path.join(self.directory, "instance.sock")
+        self._dir_fd: int | None = None
+        self._lock_fd: int | None = None
+        self._sock: socket.socket | None = None
+        self._uid = desktop_uid()
+
+    def _open_dir(self) -> int:
+        """
+        Open (creating if needed) the directory without following symlinks and
+        check that it belongs to the desktop user.  Everything afterwards is
+        relative to this descriptor, so swapping the path for a symlink later
+        cannot redirect root's chown, open or unlink.
+        """
+        try:
+            os.mkdir(self.directory, 0o700); created = True
+        except FileExistsError:
+            created = False
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC)
+        try:
+            st = os.fstat(fd)
+            if created and os.getuid() == 0 and self._uid != 0 and st.st_uid == 0:
+                os.fchown(fd, self._uid, -1); st = os.fstat(fd)
+            if st.st_uid != self._uid:
+                raise PermissionError(f"{self.directory} belongs to another user")
+            if st.st_mode & 0o077:
+                os.fchmod(fd, 0o700)
+        except OSError:
+            os.close(fd); raise
+        return fd
+
+    def acquire(self) -> bool:
+        """Take the lock and start listening; False if another instance holds it."""
+        dfd = self._open_dir()
+        try:
+            fd = os.open("instance.lock", os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC,
+                         0o600, dir_fd=dfd)
+        except OSError:
+            os.close(dfd); raise
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd); os.close(dfd); return False
+        self._dir_fd, self._lock_fd = dfd, fd
+        if os.getuid() == 0 and self._uid != 0:
+            os.fchown(fd, self._uid, -1)
+        os.ftruncate(fd, 0); os.write(fd, f"{os.getpid()}\n".encode())
+        # Holding the lock means any socket left here is stale.
+        try:
+            os.unlink("instance.sock", dir_fd=dfd)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        old = os.umask(0o177)
+        try:
+            # Bind through the directory descriptor, not the (swappable) path.
+            sock.bind(f"/proc/self/fd/{dfd}/instance.sock")
+        except OSError:
+            sock.close(); self.close(); raise
+        finally:
+            os.umask(old)
+        if os.getuid() == 0 and self._uid != 0:
+            os.chown("instance.sock", self._uid, -1, dir_fd=dfd, follow_symlinks=False)
+        sock.listen(4)
+        sock.setblocking(False)
+        self._sock = sock
+        return True
+
+    def fileno(self) -> int:
+        return self._sock.fileno() if self._sock else -1
+
+    def accept(self) -> list[str] | None:
+        """Take one hand-off; returns the sender's argv, or None."""
+        try:
+            conn, _ = self._sock.accept()
+        except (BlockingIOError, OSError):
+            return None
+        with conn:
+            try:
+                creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+                _, uid, _ = struct.unpack("3i", creds)
+                if uid not in (self._uid, 0, os.getuid()):
+                    return None
+                conn.settimeout(0.5)
+                buf = b""
+                while not buf.endswith(b"\n") and len(buf) < 65536:
+                    data = conn.recv(4096)
+                    if not data: break
+                    buf += data
+                argv = json.loads(buf).get("argv", [])
+                conn.sendall(b"ok\n")
+            except (OSError, ValueError, AttributeError):
+                return None
+        return [str(a) for a in argv] if isinstance(argv, list) else []
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close(); self._sock = None
+            try:
+                os.unlink("instance.sock", dir_fd=self._dir_fd)
+            except OSError:
+                pass
+        if self._lock_fd is not None:
+            os.close(self._lock_fd); self._lock_fd = None
+        if self._dir_fd is not None:
+            os.close(self._dir_fd); self._dir_fd = None
+
+
+def forward(argv, directory: str | None = None, timeout: float = 2.0) -> bool:
+    """
+    Hand <argv> to a running instance.  True once it acknowledged; False
+    when none is running.  An instance that holds the lock but is still
+    starting up gets up to <timeout> seconds to begin listening.
+    """
+    try:
+        directory = directory or runtime_dir()
+    except OSError:
+        return False
+    path = os.path.join(directory, "instance.sock")
+    # Arguments that name files must survive the change of working directory.
+    argv = [os.path.abspath(a) if os.path.exists(a) else a for a in argv]
+    msg = json.dumps({"argv": argv}).encode() + b"\n"
+    deadline = time.monotonic() + timeout
+    while True:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        s.settimeout(timeout)
+        try:
+            s.connect(path)
+            s.sendall(msg)
+            return s.recv(16).startswith(b"ok")
+        except OSError:
+            if not _locked(os.path.join(directory, "instance.lock")) or time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        finally:
+            s.close()
+
+
+def _locked(lock_path: str) -> bool:
+    try:
+        fd = os.open(lock_path, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
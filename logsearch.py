@@ -0,0 +1,167 @@
+"""
+logsearch.py — inverted index over log lines for the Log page search box.
+
+Every line is tokenised once when it is added; a query then only touches
+the posting lists of its own words instead of rescanning the log:
+
+    plain text   words are intersected through the index, the last word is
+                 treated as a prefix (so results update while typing), and
+                 the surviving candidates are checked with a substring test
+    regex        falls back to a scan, but only over the lines left by the
+                 facet filter
+
+Facets are posting lists too: a severity (error / warning / info) and, when
+the line matches one, the connection event kind reported by
+tunnel.classify().
+
+No Qt here — the GUI owns a worker thread that feeds and queries the index.
+
+Usage:
+    from logsearch import LogIndex
+
+    idx = LogIndex()
+    idx.add(lines)
+    total, ids = idx.search("tls handshake", facet="error")
+    print([idx.lines[i] for i in ids])
+"""
+
+import bisect
+import re
+from array import array
+
+from tunnel import EV_FAILURES, classify
+
+
+SEV_ERROR   = "error"
+SEV_WARNING = "warning"
+SEV_INFO    = "info"
+
+_TOKEN_RE    = re.compile(r"[a-z0-9]+")
+_SEVERITY_RE = re.compile(r"(?i)\b(?:(error|fatal|fail(?:ed|ure)?)|(warn(?:ing)?))\b")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def severity(line: str, kind: str | None = None) -> str:
+    if kind in EV_FAILURES:
+        return SEV_ERROR
+    m = _SEVERITY_RE.search(line)
+    if m is None:
+        return SEV_INFO
+    return SEV_ERROR if m.group(1) else SEV_WARNING
+
+
+class LogIndex:
+    """
+    Append-only index of log lines.
+
+    Line ids are positions in <lines>; posting lists are array('I') of ids in
+    ascending order, which keeps them compact and cheap to intersect.
+
+    With <max_lines> only the newest max_lines lines are searchable.  Older
+    ones stay in the index until it holds twice that many, then it is rebuilt
+    from the newest max_lines, so memory is bounded and every line is indexed
+    at most twice.
+    """
+
+    def __init__(self, max_lines: int | None = None):
+        self.max_lines = max_lines
+        self._reset()
+
+    def _reset(self):
+        self.lines: list[str] = []
+        self._postings: dict[str, array] = {}
+        self._facets: dict[str, array] = {}
+        self._vocab: list[str] = []      # sorted tokens, rebuilt lazily
+        self._vocab_dirty = False
+
+    def __len__(self):
+        return len(self.lines) - self._first()
+
+    def _first(self) -> int:
+        """Id of the oldest searchable line."""
+        cap = self.max_lines
+        return max(0, len(self.lines) - cap) if cap else 0
+
+    def add(self, lines) -> None:
+        lines = [l for l in lines if l]
+        if not lines:
+            return
+        cap = self.max_lines
+        if cap and len(self.lines) + len(lines) > 2 * cap:
+            lines = (self.lines + lines)[-cap:]
+            self._reset()
+        kinds = {ev.line: ev.kind for ev in classify("\n".join(lines))}
+        postings, facets = self._postings, self._facets
+        base = len(self.lines)
+        self.lines.extend(lines)
+        for i, line in enumerate(lines, base):
+            for tok in set(_TOKEN_RE.findall(line.lower())):
+                plist = postings.get(tok)
+                if plist is None:
+                    plist = postings[tok] = array("I")
+                    self._vocab_dirty = True
+                plist.append(i)
+            kind = kinds.get(line.strip())
+            facets.setdefault(severity(line, kind), array("I")).append(i)
+            if kind:
+                facets.setdefault(kind, array("I")).append(i)
+
+    def facet_counts(self) -> dict[str, int]:
+        lo = self._first()
+        return {name: len(ids) - bisect.bisect_left(ids, lo) for name, ids in self._facets.items()}
+
+    def _prefixed(self, prefix: str) -> set[int]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings); self._vocab_dirty = False
+        vocab = self._vocab
+        out: set[int] = set()
+        i = bisect.bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            out.update(self._postings[vocab[i]]); i += 1
+        return out
+
+    def search(self, text: str = "", regex: bool = False, facet: str | None = None,
+               limit: int | None = None) -> tuple[int, list[int]]:
+        """
+        Return (total matches, ids of the last <limit> matches).
+
+        Raises re.error for an invalid regex.
+        """
+        lo = self._first()
+        every = range(lo, len(self.lines))
+        candidates: set[int] | None = None
+        if facet:
+            candidates = set(self._facets.get(facet, ()))
+
+        if text and regex:
+            rx = re.compile(text, re.IGNORECASE)
+            ids = every if candidates is None else sorted(candidates)
+            hits = [i for i in ids if rx.search(self.lines[i])]
+        elif text:
+            needle = text.lower()
+            words = tokenize(needle)
+            # A trailing word may still be half typed, so match it as a prefix.
+            partial = words.pop() if words and needle[-1].isalnum() else None
+            sets = [self._postings.get(w, ()) for w in words]
+            sets.sort(key=len)
+            for plist in sets:
+                candidates = set(plist) if candidates is None else candidates.intersection(plist)
+                if not candidates: break
+            if partial is not None and (candidates is None or candidates):
+                pre = self._prefixed(partial)
+                candidates = pre if candidates is None else candidates & pre
+            ids = every if candidates is None else sorted(candidates)
+            lines = self.lines
+            hits = [i for i in ids if needle in lines[i].lower()]
+        else:
+            hits = list(every) if candidates is None else sorted(candidates)
+
+        if lo:
+            hits = hits[bisect.bisect_left(hits, lo):]
+        total = len(hits)
+        if limit is not None and total > limit:
+            hits = hits[-limit:]
+        return total, hits
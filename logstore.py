@@ -0,0 +1,284 @@
+"""
+logstore.py — persistent, rotating per-session OpenVPN logs.
+
+Layout under ~/.openvpn_gui/logs/:
+    <session>.<seq>.log        plain-text segment, one line per entry
+    <session>.<seq>.log.gz     closed segment, when gzip is enabled
+    <session>.<seq>.idx        sidecar index: (unix_ts, byte_offset) records
+
+<session> is "YYYYmmdd-HHMMSS[-profile]".  A new index record is written
+whenever the wall-clock second changes, so locating any time range is a
+binary search in the index followed by a single slice of the mmapped
+segment — the log itself is never scanned.
+
+Usage:
+    from logstore import SessionLog, SessionReader, list_sessions
+
+    log = SessionLog(directory, "Work VPN")
+    log.write("Initialization Sequence Completed")
+    log.close()
+
+    for sid in list_sessions(directory):
+        with SessionReader(directory, sid) as r:
+            print(r.tail(100))
+"""
+
+import bisect
+import datetime
+import gzip
+import mmap
+import os
+import re
+import shutil
+import struct
+import time
+
+
+_IDX = struct.Struct("<dQ")          # unix timestamp, byte offset into segment
+_SEGMENT_RE = re.compile(r"^(?P<sid>.+)\.(?P<seq>\d{3})\.log(?P<gz>\.gz)?$")
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")[:40]
+
+
+def _fmt_line(ts: float, line: str) -> bytes:
+    stamp = datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    return f"{stamp} {line}\n".encode(errors="replace")
+
+
+# ── Writer ────────────────────────────────────────────────────────────────────
+
+class SessionLog:
+    """
+    Append-only writer for one session.
+
+    Segments roll over once they exceed <segment_bytes> or are older than
+    <segment_age> seconds.  Closed segments are optionally gzipped.  Sessions
+    older than <retention_days> are pruned when a new log is opened.
+    """
+
+    def __init__(self, directory, profile: str = "",
+                 segment_bytes: int = 32 * 1024 * 1024,
+                 segment_age: float = 24 * 3600,
+                 gzip_closed: bool = False,
+                 retention_days: int = 30):
+        self.directory = str(directory)
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        prune_sessions(self.directory, retention_days)
+        sid = time.strftime("%Y%m%d-%H%M%S")
+        if profile:
+            sid += "-" + _slug(profile)
+        self.session_id = sid
+        self.segment_bytes = segment_bytes
+        self.segment_age = segment_age
+        self.gzip_closed = gzip_closed
+        self._seq = -1
+        self._log = self._idx = None
+        self._opened = 0.0
+        self._size = 0
+        self._last_sec = None
+        self._roll()
+
+    def _path(self, seq: int, ext: str) -> str:
+        return os.path.join(self.directory, f"{self.session_id}.{seq:03d}.{ext}")
+
+    def _roll(self):
+        self._close_segment()
+        self._seq += 1
+        self._log = open(self._path(self._seq, "log"), "ab")
+        self._idx = open(self._path(self._seq, "idx"), "ab")
+        for path in (self._log.name, self._idx.name):
+            try: os.chmod(path, 0o600)
+            except OSError: pass
+        self._opened = time.time()
+        self._size = self._log.tell()
+        self._last_sec = None
+
+    def _close_segment(self):
+        if self._log is None:
+            return
+        self._log.close(); self._idx.close()
+        path = self._log.name
+        self._log = self._idx = None
+        if self.gzip_closed and os.path.getsize(path):
+            try:
+                with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.chmod(path + ".gz", 0o600)
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def write(self, line: str, ts: float | None = None) -> None:
+        if self._log is None:
+            return
+        ts = time.time() if ts is None else ts
+        if self._size >= self.segment_bytes or ts - self._opened >= self.segment_age:
+            self._roll()
+        sec = int(ts)
+        if sec != self._last_sec:
+            self._idx.write(_IDX.pack(ts, self._size))
+            self._last_sec = sec
+        data = _fmt_line(ts, line)
+        self._log.write(data)
+        self._size += len(data)
+
+    def flush(self) -> None:
+        if self._log is not None:
+            self._log.flush(); self._idx.flush()
+
+    def close(self) -> None:
+        self._close_segment()
+
+
+# ── Reader ────────────────────────────────────────────────────────────────────
+
+class _Segment:
+    def __init__(self, log_path: str, idx_path: str):
+        self.log_path = log_path
+        self.gz = log_path.endswith(".gz")
+        self.times: list[float] = []
+        self.offsets: list[int] = []
+        try:
+            with open(idx_path, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % _IDX.size
+            for ts, off in _IDX.iter_unpack(data[:usable]):
+                self.times.append(ts); self.offsets.append(off)
+        except OSError:
+            pass
+        self._file = None
+        self._map = None
+
+    def data(self):
+        """Return the segment contents — an mmap for plain segments."""
+        if self._map is None:
+            if self.gz:
+                with gzip.open(self.log_path, "rb") as f:
+                    self._map = f.read()
+            else:
+                self._file = open(self.log_path, "rb")
+                size = os.fstat(self._file.fileno()).st_size
+                self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        return self._map
+
+    def offset_for(self, ts: float) -> int:
+        """Byte offset of the first line logged at or after <ts>."""
+        i = bisect.bisect_left(self.times, ts)
+        if i >= len(self.offsets):
+            return len(self.data())
+        return self.offsets[i]
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = None
+
+
+class SessionReader:
+    """Random access to a stored session through the sidecar indexes."""
+
+    def __init__(self, directory, session_id: str):
+        self.directory = str(directory)
+        self.session_id = session_id
+        segs = []
+        for name in os.listdir(self.directory):
+            m = _SEGMENT_RE.match(name)
+            if m and m.group("sid") == session_id:
+                idx = os.path.join(self.directory, f"{session_id}.{m.group('seq')}.idx")
+                segs.append((int(m.group("seq")), os.path.join(self.directory, name), idx))
+        self.segments = [_Segment(log, idx) for _, log, idx in sorted(segs)]
+
+    def span(self) -> tuple[float, float] | None:
+        times = [s.times for s in self.segments if s.times]
+        return (times[0][0], times[-1][-1]) if times else None
+
+    def range(self, t0: float, t1: float) -> bytes:
+        """Return the raw lines logged in [t0, t1)."""
+        out = []
+        for seg in self.segments:
+            if not seg.times or seg.times[-1] < t0 or seg.times[0] >= t1:
+                continue
+            data = seg.data()
+            out.append(data[seg.offset_for(t0):seg.offset_for(t1)])
+        return b"".join(out)
+
+    def lines_from(self, ts: float, lines: int) -> bytes:
+        """Return up to <lines> lines starting at the first one logged at <ts>."""
+        chunks = []
+        for seg in self.segments:
+            if lines <= 0:
+                break
+            if not seg.times or seg.times[-1] < ts:
+                continue
+            data = seg.data()
+            start = pos = seg.offset_for(ts)
+            while lines > 0 and pos < len(data):
+                nl = data.find(b"\n", pos)
+                pos = nl + 1 if nl >= 0 else len(data)
+                lines -= 1
+            chunks.append(data[start:pos])
+        return b"".join(chunks)
+
+    def tail(self, lines: int) -> bytes:
+        """Return the last <lines> lines, touching only the end of the file."""
+        chunks = []
+        for seg in reversed(self.segments):
+            data = seg.data()
+            end = len(data)
+            pos = end
+            while lines > 0 and pos > 0:
+                nl = data.rfind(b"\n", 0, pos - 1)
+                pos = nl + 1 if nl >= 0 else 0
+                lines -= 1
+            chunks.append(data[pos:end])
+            if lines <= 0:
+                break
+        return b"".join(reversed(chunks))
+
+    def close(self):
+        for seg in self.segments:
+            seg.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ── Housekeeping ──────────────────────────────────────────────────────────────
+
+def list_sessions(directory) -> list[str]:
+    """Return stored session ids, newest first."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    sids = {m.group("sid") for m in map(_SEGMENT_RE.match, names) if m}
+    return sorted(sids, reverse=True)
+
+
+def prune_sessions(directory, retention_days: int) -> None:
+    """Delete segments (and their indexes) older than <retention_days>."""
+    if retention_days <= 0:
+        return
+    cutoff = time.time() - retention_days * 86400
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        m = _SEGMENT_RE.match(name)
+        if not m:
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+                os.unlink(os.path.join(directory, f"{m.group('sid')}.{m.group('seq')}.idx"))
+        except OSError:
+            pass
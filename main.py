@@ -1,25 +1,32 @@
 import sys
 import os
 import subprocess
-import json
 import shutil
+import collections
+import selectors
+import signal
 import pwd
+import queue
+import sqlite3
 from pathlib import Path
 from typing import Dict, Optional
 
 try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-        QPushButton, QLabel, QListWidget, QTextEdit, QFileDialog,
+        QPushButton, QLabel, QListWidget, QPlainTextEdit, QFileDialog,
         QMessageBox, QGroupBox, QLineEdit, QTabWidget, QListWidgetItem,
-        QComboBox, QFormLayout, QDialog, QDialogButtonBox, QFrame,
+        QComboBox, QFormLayout, QDialog, QDialogButtonBox, QFrame, QCheckBox,
             QScrollArea, QStackedWidget, QSizePolicy, QSpacerItem, QStyledItemDelegate, QStyle,
-            QToolButton
+            QToolButton, QDateTimeEdit, QTableView, QHeaderView, QAbstractItemView
+    )
+    from PyQt6.QtCore import (
+        QTimer, QThread, pyqtSignal, Qt, QSize, QPoint, QRect, QEvent, QUrl, QSocketNotifier,
+        QDateTime, QPointF, QObject, QAbstractTableModel, QModelIndex
     )
-    from PyQt6.QtCore import QTimer, QThread, pyqtSignal, Qt, QSize, QPoint, QRect, QEvent, QUrl
     from PyQt6.QtGui import (
         QFont, QIcon, QPainter, QColor, QPen, QPixmap, QPainterPath,
-        QLinearGradient, QBrush, QPalette, QConicalGradient, QRadialGradient
+        QLinearGradient, QBrush, QPalette, QConicalGradient, QRadialGradient, QPolygonF
     )
 except ImportError as e:
     print(f"ERROR: PyQt6 not installed: {e}")
@@ -27,7 +34,10 @@ except ImportError as e:
 
 import datetime
 import re
+import bisect
 import math
+import time
+from array import array
 
 
 # ── Custom ComboBox Delegate with Accent Hover Effect ──────────────────────────
@@ -110,19 +120,43 @@ class HoverAwareButton(QPushButton):
 try:
     from config import (
         APP_NAME, APP_VERSION, ORGANIZATION_NAME,
-        get_developer_string, get_version_string, OPENVPN_DNS_SCRIPT
+        get_developer_string, get_version_string, OPENVPN_DNS_SCRIPT,
+        LOG_MAX_LINES, LOG_SEGMENT_MB, LOG_SEGMENT_HOURS, LOG_GZIP_CLOSED, LOG_RETENTION_DAYS,
+        METRICS_LISTEN, EVENTS_SOCKET
     )
 except ImportError:
     APP_NAME = "OpenVPN Connect"
     APP_VERSION = "3.5.0"
     ORGANIZATION_NAME = "OpenVPN Inc."
     OPENVPN_DNS_SCRIPT = None
+    LOG_MAX_LINES = 5000
+    LOG_SEGMENT_MB, LOG_SEGMENT_HOURS, LOG_GZIP_CLOSED, LOG_RETENTION_DAYS = 32, 24, False, 30
+    METRICS_LISTEN = None
+    EVENTS_SOCKET = None
     def get_developer_string(): return "OpenVPN Connect"
     def get_version_string(): return f"v{APP_VERSION}"
 
 # ── Theme — ALL colors live here, reads from GNOME/Ubuntu gsettings ───────────
 from theme import ThemeManager, Colors
 
+# ── Tunnel telemetry (Qt-free) ────────────────────────────────────────────────
+from tunnel import (
+    IfaceCounters, RateMeter, LineReader, LinkWatcher, ManagementClient, ProcessHandle,
+    classify, find_process, fmt_bytes, fmt_dur, openvpn_command, process_tree, tun_owner,
+    EV_AUTH_FAIL, EV_CONNECTED, EV_FAILURES, EV_FATAL, EV_PUSHED, EV_RESTART, EV_TLS_FAIL,
+    EV_TUN_OPENED,
+)
+from logstore import SessionLog, SessionReader, list_sessions
+from logsearch import LogIndex, SEV_ERROR, SEV_WARNING
+from history import RunningTotals, SessionHistory
+from sketch import DDSketch
+from metrics import Metrics, MetricsServer
+from events import EventServer
+from instance import SingleInstance, forward
+from timeseries import RateSeries, lttb
+from helper import HelperClient, HelperError, dns_script
+from profiles import ConfigManager, VPNConfig
+
 
 # ── CSS builders — rebuilt on every theme change ─────────────────────────────
 
@@ -265,7 +299,27 @@ QListWidget::item:selected {{
     color: {c.ORANGE};
 }}
 
-QTextEdit {{
+QTableView {{
+    background: {c.BG_CARD};
+    color: {c.TXT_PRI};
+    border: 1px solid {c.BORDER};
+    border-radius: 6px;
+    gridline-color: {c.BORDER_LT};
+    font-size: 11px;
+    outline: none;
+}}
+QTableView::item:selected {{ background: rgba({ar},{ag},{ab},64); color: {c.ORANGE}; }}
+QHeaderView::section {{
+    background: {c.BG_ELEV};
+    color: {c.TXT_SEC};
+    border: none;
+    border-bottom: 1px solid {c.BORDER};
+    padding: 4px 6px;
+    font-size: 10px;
+    font-weight: 600;
+}}
+
+QTextEdit, QPlainTextEdit {{
     background: {c.BG_BASE};
     color: {c.LOG_TEXT};
     border: 1px solid {c.BORDER};
@@ -618,18 +672,35 @@ def get_desktop_user_home() -> Path:
     return Path.home()
 
 
-def fmt_bytes(b):
-    if b is None: return "—"
-    if b < 1024:    return f"{b} B"
-    if b < 1024**2: return f"{b/1024:.1f} KB"
-    if b < 1024**3: return f"{b/1024**2:.2f} MB"
-    return f"{b/1024**3:.2f} GB"
-
-
-def fmt_dur(secs):
-    h, r = divmod(max(int(secs), 0), 3600)
-    m, s = divmod(r, 60)
-    return f"{h:02d}:{m:02d}:{s:02d}"
+def import_legacy_data():
+    """
+    Until the privileged helper existed the GUI ran as root, so its profiles,
+    history and logs live in /root/.openvpn_gui.  Offer them once to the
+    unprivileged GUI; the helper reads them, the copy is written as the user.
+    """
+    data = Path.home() / '.openvpn_gui'; marker = data / '.legacy-checked'
+    if os.getuid() == 0 or marker.exists() or not HelperClient.available(): return
+    try:
+        h = HelperClient()
+    except (OSError, HelperError) as ex:
+        print(f"[helper] Could not check for data from the root-run GUI: {ex}"); return
+    try:
+        if h.legacy_data():
+            if not themed_confirm(None, "Import Previous Data",
+                                  "OpenVPN Manager now runs without root privileges.\n\n"
+                                  "Import the profiles, session history and logs saved while it ran "
+                                  "as root (/root/.openvpn_gui)?"):
+                themed_warning(None, "Import Previous Data",
+                               "Not imported. The old data stays in /root/.openvpn_gui.")
+            else:
+                n = h.import_legacy(data)
+                print(f"[helper] Imported {n} file(s) from /root/.openvpn_gui")
+        data.mkdir(mode=0o700, exist_ok=True); marker.touch()
+    except (OSError, HelperError) as ex:
+        # No marker: ask again next time.
+        themed_warning(None, "Import Previous Data", f"Could not import the previous data: {ex}")
+    finally:
+        h.close()
 
 
 def h_rule():
@@ -638,9 +709,72 @@ def h_rule():
     return f
 
 
+# ── Animation clock ───────────────────────────────────────────────────────────
+
+class AnimationClock(QObject):
+    """
+    One frame timer shared by every animated widget.
+
+    The timer runs only while at least one widget is subscribed and the
+    window is not hidden or minimized, so a static UI costs no wakeups.
+    Set OPENVPN_GUI_DEBUG_ANIM=1 to print frames and wakeups per second.
+    """
+    FRAME_MS = 25
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._subs = []
+        self._paused = False
+        self._timer = QTimer(self); self._timer.setInterval(self.FRAME_MS)
+        self._timer.timeout.connect(self._on_frame)
+        self.frames = self.wakeups = 0
+        self._debug = None
+        if os.environ.get("OPENVPN_GUI_DEBUG_ANIM"):
+            self._debug = QTimer(self); self._debug.timeout.connect(self._report)
+            self._debug.start(1000)
+
+    def subscribe(self, callback):
+        if callback not in self._subs:
+            self._subs.append(callback); self._update_timer()
+
+    def unsubscribe(self, callback):
+        if callback in self._subs:
+            self._subs.remove(callback); self._update_timer()
+
+    def set_paused(self, paused):
+        if paused != self._paused:
+            self._paused = paused; self._update_timer()
+
+    def count_frame(self):
+        self.frames += 1
+
+    def _update_timer(self):
+        run = bool(self._subs) and not self._paused
+        if run and not self._timer.isActive(): self._timer.start()
+        elif not run and self._timer.isActive(): self._timer.stop()
+
+    def _on_frame(self):
+        self.wakeups += 1
+        for cb in list(self._subs): cb()
+
+    def _report(self):
+        print(f"[anim] {self.frames} frames/s, {self.wakeups} wakeups/s, "
+              f"{len(self._subs)} subscriber(s){', paused' if self._paused else ''}")
+        self.frames = self.wakeups = 0
+
+
 # ── Animated Status Dot ───────────────────────────────────────────────────────
 
 class StatusDot(QWidget):
+    ANIMATED = ("on", "spinning")
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._state = "off"
@@ -648,10 +782,22 @@ class StatusDot(QWidget):
         self._pulse = 0.0
         self._pd = 1
         self.setFixedSize(56, 56)
-        t = QTimer(self); t.timeout.connect(self._tick); t.start(25)
+        self._clock = AnimationClock.instance()
 
     def set_state(self, s):
-        self._state = s; self.update()
+        self._state = s; self._sync_clock(); self.update()
+
+    def _sync_clock(self):
+        if self._state in self.ANIMATED and self.isVisible():
+            self._clock.subscribe(self._tick)
+        else:
+            self._clock.unsubscribe(self._tick)
+
+    def showEvent(self, e):
+        super().showEvent(e); self._sync_clock()
+
+    def hideEvent(self, e):
+        super().hideEvent(e); self._sync_clock()
 
     def _tick(self):
         if self._state == "spinning":
@@ -662,6 +808,7 @@ class StatusDot(QWidget):
         self.update()
 
     def paintEvent(self, e):
+        self._clock.count_frame()
         p = QPainter(self)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
         cx, cy, r = 28, 28, 20
@@ -728,54 +875,74 @@ class StatusDot(QWidget):
 # ── Mini Traffic Chart ────────────────────────────────────────────────────────
 
 class TinyChart(QWidget):
+    """
+    Rolling up/down rate chart.
+
+    Samples live in fixed-size array('d') rings, so push() is O(1).  The
+    grid, scale labels and plot geometry are drawn once into a pixmap and
+    reused until the nice-rounded peak, the widget size or the theme
+    changes; a repaint only blits that pixmap and draws two polylines.
+    """
+    CAPACITY = 80
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.ups, self.dns = [], []
+        self._ups = array('d', bytes(8 * self.CAPACITY))
+        self._dns = array('d', bytes(8 * self.CAPACITY))
+        self._head = 0; self._n = 0; self._peak = 0.0
+        self._grid: Optional[QPixmap] = None; self._grid_key = None
+        self._plot = (0, 0, 10, 10)     # x0, y0, width, height
         self.setMinimumHeight(40)
 
     def push(self, up, dn):
-        self.ups.append(max(up, 0)); self.dns.append(max(dn, 0))
-        if len(self.ups) > 80: self.ups.pop(0)
-        if len(self.dns) > 80: self.dns.pop(0)
+        up, dn = max(up, 0.0), max(dn, 0.0)
+        i = self._head
+        evicted = max(self._ups[i], self._dns[i])
+        self._ups[i] = up; self._dns[i] = dn
+        self._head = (i + 1) % self.CAPACITY
+        self._n = min(self._n + 1, self.CAPACITY)
+        if max(up, dn) >= self._peak:
+            self._peak = max(up, dn)
+        elif evicted >= self._peak:
+            # The old peak just scrolled out; unused slots are zero.
+            self._peak = max(max(self._ups), max(self._dns))
         self.update()
 
     def clear(self):
-        self.ups, self.dns = [], []; self.update()
-
-    def paintEvent(self, e):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.RenderHint.Antialiasing)
-        w, h = self.width(), self.height()
-        p.fillRect(0, 0, w, h, QColor(Colors.BG_BASE))
-
+        for buf in (self._ups, self._dns):
+            buf[:] = array('d', bytes(8 * self.CAPACITY))
+        self._head = self._n = 0; self._peak = 0.0; self.update()
+
+    def _ordered(self, buf):
+        if self._n < self.CAPACITY: return buf[:self._n]
+        return buf[self._head:] + buf[:self._head]
+
+    @staticmethod
+    def _scale_max(peak):
+        if peak <= 0: return 1.0
+        exp = math.floor(math.log10(peak))
+        base = peak / (10 ** exp)
+        nice = 1 if base <= 1 else 2 if base <= 2 else 5 if base <= 5 else 10
+        return float(nice * (10 ** exp))
+
+    @staticmethod
+    def _fmt_rate(v):
+        txt = f"{v:.1f}" if v < 10 else f"{v:.0f}"
+        if "." in txt:
+            txt = txt.rstrip("0").rstrip(".")
+        return f"{txt} KB/s"
+
+    def _build_grid(self, w, h, scale_max, dpr):
         right_pad, top_pad, bottom_pad = 6, 8, 12
-
-        raw_peak = max(max(self.ups, default=0.0), max(self.dns, default=0.0))
-        if raw_peak <= 0:
-            scale_max = 1.0
-        else:
-            exp = math.floor(math.log10(raw_peak))
-            base = raw_peak / (10 ** exp)
-            if base <= 1:
-                nice = 1
-            elif base <= 2:
-                nice = 2
-            elif base <= 5:
-                nice = 5
-            else:
-                nice = 10
-            scale_max = float(nice * (10 ** exp))
-
-        def fmt_rate(v):
-            txt = f"{v:.1f}" if v < 10 else f"{v:.0f}"
-            if "." in txt:
-                txt = txt.rstrip("0").rstrip(".")
-            return f"{txt} KB/s"
+        pm = QPixmap(int(w * dpr), int(h * dpr)); pm.setDevicePixelRatio(dpr)
+        pm.fill(QColor(Colors.BG_BASE))
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         scale_vals = (scale_max, scale_max * 0.5, 0.0)
         fm = p.fontMetrics()
         txt_h = max(12, fm.height())
-        max_lbl_w = max(fm.horizontalAdvance(fmt_rate(v)) for v in scale_vals)
+        max_lbl_w = max(fm.horizontalAdvance(self._fmt_rate(v)) for v in scale_vals)
         left_pad = max(50, max_lbl_w + 12)
 
         plot_w = max(10, w - left_pad - right_pad)
@@ -785,41 +952,204 @@ class TinyChart(QWidget):
 
         # Draw 3-value scale (top/mid/bottom) so users can read traffic magnitude quickly.
         lbl_pen = QPen(QColor(Colors.TXT_MUT))
-        p.setPen(lbl_pen)
-
+        guide_pen = QPen(QColor(Colors.BORDER)); guide_pen.setStyle(Qt.PenStyle.DotLine)
         for ratio, value in zip((1.0, 0.5, 0.0), scale_vals):
             y = int(plot_y1 - plot_h * ratio)
-            guide_pen = QPen(QColor(Colors.BORDER))
-            guide_pen.setStyle(Qt.PenStyle.DotLine)
             p.setPen(guide_pen)
             p.drawLine(plot_x0, y, plot_x1, y)
-
             p.setPen(lbl_pen)
             txt_top = max(0, min(h - txt_h, y - (txt_h // 2)))
             p.drawText(QRect(2, txt_top, left_pad - 8, txt_h),
                        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                       fmt_rate(value))
+                       self._fmt_rate(value))
+        p.end()
+        self._grid = pm; self._plot = (plot_x0, plot_y0, plot_w, plot_h)
 
-        n = max(len(self.ups), len(self.dns))
-        if n < 2: return
+    def paintEvent(self, e):
+        w, h = self.width(), self.height()
+        scale_max = self._scale_max(self._peak)
+        dpr = self.devicePixelRatioF()
+        key = (w, h, scale_max, dpr, Colors.BG_BASE, Colors.BORDER, Colors.TXT_MUT)
+        if key != self._grid_key:
+            self._build_grid(w, h, scale_max, dpr); self._grid_key = key
 
-        def series(pts, hex_col, alpha):
-            if len(pts) < 2: return
-            fill = QPainterPath(); line = QPainterPath()
-            for i, v in enumerate(pts):
-                x = int(plot_x0 + plot_w * i / (n - 1))
-                y = int(plot_y1 - plot_h * v / scale_max)
-                if i == 0:
-                    fill.moveTo(x, plot_y1); fill.lineTo(x, y); line.moveTo(x, y)
-                else:
-                    fill.lineTo(x, y); line.lineTo(x, y)
-            fill.lineTo(plot_x1, plot_y1); fill.closeSubpath()
-            fc = QColor(hex_col); fc.setAlpha(alpha); p.fillPath(fill, fc)
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._grid)
+        n = self._n
+        if n < 2: return
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        x0, y0, pw, ph = self._plot
+        y1 = y0 + ph; k = ph / scale_max; step = pw / (n - 1)
+
+        def series(buf, hex_col, alpha):
+            pts = [QPointF(x0 + step * i, y1 - k * v) for i, v in enumerate(self._ordered(buf))]
+            line = QPolygonF(pts)
+            pts.append(QPointF(x0 + pw, y1)); pts.append(QPointF(x0, y1))
+            fc = QColor(hex_col); fc.setAlpha(alpha)
+            p.setPen(Qt.PenStyle.NoPen); p.setBrush(fc); p.drawPolygon(QPolygonF(pts))
             pen = QPen(QColor(hex_col)); pen.setWidth(1)
-            p.setPen(pen); p.setBrush(Qt.BrushStyle.NoBrush); p.drawPath(line)
+            p.setPen(pen); p.setBrush(Qt.BrushStyle.NoBrush); p.drawPolyline(line)
+
+        series(self._dns, Colors.ORANGE, 45)
+        series(self._ups, Colors.BLUE_UP, 35)
+
 
-        series(self.dns, Colors.ORANGE, 45)
-        series(self.ups, Colors.BLUE_UP, 35)
+# ── Traffic History Chart ─────────────────────────────────────────────────────
+
+class HistoryChart(QWidget):
+    """
+    Long-window throughput chart over the on-disk RateSeries.
+
+    The visible slice is LTTB-downsampled to about one point per pixel and
+    the resulting polygons are cached, so hovering only redraws a cursor.
+    Wheel zooms around the pointer, drag pans, double-click resets.  Zooming
+    in far enough switches to a finer storage tier.
+    """
+    MIN_SPAN = 120
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(140); self.setMouseTracking(True)
+        self._store: Optional[RateSeries] = None
+        self._span = 3600
+        self._full = self._view = (0.0, 1.0)
+        self._tiers = {}            # tier -> (ts, up, dn) arrays for the full window
+        self._tier = 0
+        self._cache_key = None; self._cache = None
+        self._hover = None; self._drag = None
+        self._plot = (0, 0, 10, 10)
+
+    def set_store(self, store):
+        self._store = store; self.reload()
+
+    def set_span(self, seconds):
+        self._span = seconds; self.reload()
+
+    def reload(self):
+        now = time.time()
+        self._full = self._view = (now - self._span, now)
+        self._tiers.clear(); self._load(); self.update()
+
+    def _load(self):
+        self._cache_key = None
+        if self._store is None: return
+        self._tier = self._store.tier_for(self._view[0])
+        if self._tier in self._tiers: return
+        ts, up, dn = array('d'), array('d'), array('d')
+        for pt in self._store.fetch(self._full[0], self._full[1], self._tier):
+            ts.append(pt.t); up.append(pt.up_avg); dn.append(pt.dn_avg)
+        self._tiers[self._tier] = (ts, up, dn)
+
+    def _geometry(self):
+        w, h = self.width(), self.height()
+        left, right, top, bottom = 56, 8, 8, 18
+        return left, top, max(10, w - left - right), max(10, h - top - bottom)
+
+    def _build_cache(self):
+        x0, y0, pw, ph = self._plot = self._geometry()
+        v0, v1 = self._view
+        ts, up, dn = self._tiers.get(self._tier, ((), (), ()))
+        lo = bisect.bisect_left(ts, v0); hi = bisect.bisect_right(ts, v1)
+        # Keep one sample either side so lines run to the plot edges.
+        lo = max(0, lo - 1); hi = min(len(ts), hi + 1)
+        xs = ts[lo:hi]
+        peak = max(max(up[lo:hi], default=0.0), max(dn[lo:hi], default=0.0))
+        scale = TinyChart._scale_max(peak)
+        kx = pw / max(v1 - v0, 1e-9); ky = ph / scale; y1 = y0 + ph
+        polys = []
+        for ys in (dn[lo:hi], up[lo:hi]):
+            idx = lttb(xs, ys, pw)
+            polys.append(QPolygonF([QPointF(x0 + (xs[i] - v0) * kx, y1 - ys[i] * ky) for i in idx]))
+        self._cache = (scale, polys, lo, hi)
+
+    def paintEvent(self, e):
+        key = (self._view, self._tier, self.width(), self.height())
+        if key != self._cache_key:
+            self._build_cache(); self._cache_key = key
+        scale, polys, lo, hi = self._cache
+        x0, y0, pw, ph = self._plot
+        p = QPainter(self)
+        p.fillRect(self.rect(), QColor(Colors.BG_BASE))
+        lbl_pen = QPen(QColor(Colors.TXT_MUT))
+        guide_pen = QPen(QColor(Colors.BORDER)); guide_pen.setStyle(Qt.PenStyle.DotLine)
+        fm = p.fontMetrics(); th = fm.height()
+        for ratio in (1.0, 0.5, 0.0):
+            y = int(y0 + ph - ph * ratio)
+            p.setPen(guide_pen); p.drawLine(x0, y, x0 + pw, y)
+            p.setPen(lbl_pen)
+            p.drawText(QRect(0, y - th // 2, x0 - 6, th),
+                       Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                       TinyChart._fmt_rate(scale * ratio))
+        v0, v1 = self._view
+        fmt = "%H:%M" if v1 - v0 <= 86400 else "%m-%d %H:%M"
+        p.drawText(QRect(x0, y0 + ph + 2, pw, th), Qt.AlignmentFlag.AlignLeft,
+                   time.strftime(fmt, time.localtime(v0)))
+        p.drawText(QRect(x0, y0 + ph + 2, pw, th), Qt.AlignmentFlag.AlignRight,
+                   time.strftime(fmt, time.localtime(v1)))
+
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setClipRect(x0, y0, pw + 1, ph + 1)
+        for poly, col in zip(polys, (Colors.ORANGE, Colors.BLUE_UP)):
+            pen = QPen(QColor(col)); pen.setWidth(1)
+            p.setPen(pen); p.drawPolyline(poly)
+        if hi - lo == 0:
+            p.setPen(lbl_pen)
+            p.drawText(QRect(x0, y0, pw, ph), Qt.AlignmentFlag.AlignCenter, "No traffic recorded")
+            return
+
+        if self._hover is not None and x0 <= self._hover <= x0 + pw:
+            ts, up, dn = self._tiers[self._tier]
+            t = v0 + (self._hover - x0) / pw * (v1 - v0)
+            i = min(max(bisect.bisect_left(ts, t, lo, hi), lo), hi - 1)
+            if i > lo and t - ts[i - 1] < ts[i] - t: i -= 1
+            x = x0 + (ts[i] - v0) / (v1 - v0) * pw
+            p.setPen(QPen(QColor(Colors.TXT_SEC))); p.drawLine(int(x), y0, int(x), y0 + ph)
+            txt = (f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts[i]))}"
+                   f"   ↑ {up[i]:.1f}  ↓ {dn[i]:.1f} KB/s")
+            tw = fm.horizontalAdvance(txt) + 12
+            bx = int(min(max(x + 8, x0), x0 + pw - tw))
+            p.setPen(Qt.PenStyle.NoPen); p.setBrush(QColor(Colors.BG_ELEV))
+            p.drawRoundedRect(bx, y0 + 2, tw, th + 6, 4, 4)
+            p.setPen(QPen(QColor(Colors.TXT_PRI)))
+            p.drawText(QRect(bx, y0 + 2, tw, th + 6), Qt.AlignmentFlag.AlignCenter, txt)
+
+    def _set_view(self, v0, v1):
+        f0, f1 = self._full
+        span = min(max(v1 - v0, self.MIN_SPAN), f1 - f0)
+        v0 = min(max(v0, f0), f1 - span)
+        self._view = (v0, v0 + span)
+        tier = self._store.tier_for(v0) if self._store is not None else 0
+        if tier != self._tier: self._load()
+        self.update()
+
+    def wheelEvent(self, e):
+        x0, _, pw, _ = self._plot
+        v0, v1 = self._view
+        frac = min(max((e.position().x() - x0) / pw, 0.0), 1.0)
+        anchor = v0 + frac * (v1 - v0)
+        span = (v1 - v0) * 0.8 ** (e.angleDelta().y() / 120)
+        self._set_view(anchor - frac * span, anchor + (1 - frac) * span)
+
+    def mousePressEvent(self, e):
+        if e.button() == Qt.MouseButton.LeftButton:
+            self._drag = (e.position().x(), self._view)
+
+    def mouseMoveEvent(self, e):
+        x = e.position().x()
+        if self._drag is not None:
+            sx, (v0, v1) = self._drag
+            dt = (sx - x) / self._plot[2] * (v1 - v0)
+            self._set_view(v0 + dt, v1 + dt)
+        self._hover = x; self.update()
+
+    def mouseReleaseEvent(self, e):
+        self._drag = None
+
+    def mouseDoubleClickEvent(self, e):
+        self._set_view(*self._full)
+
+    def leaveEvent(self, e):
+        self._hover = None; self.update()
 
 
 # ── VPN Thread ────────────────────────────────────────────────────────────────
@@ -827,15 +1157,29 @@ class TinyChart(QWidget):
 class OpenVPNThread(QThread):
     status_changed         = pyqtSignal(str)
     output_received        = pyqtSignal(str)
+    output_batch           = pyqtSignal(list)  # lines from one bulk read
     connection_established = pyqtSignal(str)
     connection_failed      = pyqtSignal(str)
     finished_cleanup       = pyqtSignal()
+    process_started        = pyqtSignal(int)   # launched pid; re-sent once openvpn is found behind sudo
+    log_event              = pyqtSignal(str, str, str)   # kind, detail, line
+
+    FAILURE_MESSAGES = {
+        EV_AUTH_FAIL: "Authentication failed",
+        EV_TLS_FAIL:  "TLS/Certificate error",
+    }
 
-    def __init__(self, config_path, username=None, password=None):
+    def __init__(self, config_path, username=None, password=None, mgmt_args=None, helper=None):
         super().__init__()
         self.config_path = config_path
         self.username = username
         self.password = password
+        self.mgmt_args = mgmt_args or []
+        # Privileged helper connection; None launches openvpn through pkexec.
+        self.helper = helper
+        self.helper_pid = None
+        # Cleared by the GUI once the management interface delivers logs.
+        self.mirror_output = True
         self.process = None
         self.should_stop = False
         self.auth_file = None
@@ -877,62 +1221,123 @@ class OpenVPNThread(QThread):
             except: pass
             return config_path
 
-    def run(self):
+    def _launch_direct(self, cfg):
+        """Start openvpn through pkexec/sudo; returns the fd of its output."""
+        if os.getuid() == 0:          cmd = []
+        elif shutil.which('pkexec'):   cmd = ['pkexec']
+        else:                          cmd = ['sudo']
+        cmd += openvpn_command(cfg, dns_script(OPENVPN_DNS_SCRIPT), self.auth_file, self.mgmt_args)
+        self.process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            bufsize=0, preexec_fn=os.setsid
+        )
+        return self.process.stdout.fileno()
+
+    def _launch_helper(self, cfg):
+        """Start openvpn through the privileged helper; None if it went away."""
         try:
-            if os.getuid() == 0:          cmd = ['openvpn']
-            elif shutil.which('pkexec'):   cmd = ['pkexec', 'openvpn']
-            else:                          cmd = ['sudo', 'openvpn']
+            self.helper.authorize()
+            if self.should_stop: return None
+            mgmt = self.mgmt_args[1] if len(self.mgmt_args) > 1 else None
+            try:
+                self.helper_pid, fd = self.helper.start(cfg, self.auth_file, mgmt)
+                return fd
+            except HelperError as ex:
+                # e.g. a root-only profile the desktop user cannot open
+                self.output_received.emit(f"⚠ Privileged helper refused the profile, using pkexec: {ex}")
+                return None
+        except OSError as ex:
+            self.output_received.emit(f"⚠ Privileged helper unavailable, using pkexec: {ex}")
+            self._drop_helper(); return None
+
+    def _drop_helper(self):
+        # Closing tells the window to reconnect instead of reusing a dead socket.
+        self.helper.close(); self.helper = None
+
+    def _wait_exit(self):
+        if self.process is not None:
+            return self.process.wait()
+        # The helper reaps openvpn; give it a moment to notice the exit.
+        for _ in range(50):
+            try:
+                st = self.helper.status(self.helper_pid)
+            except HelperError:
+                return None
+            except OSError:
+                self._drop_helper(); return None
+            if not st or st[0]['rc'] is not None:
+                return st[0]['rc'] if st else None
+            time.sleep(0.1)
+        return None
 
+    def run(self):
+        fd = None
+        try:
             cfg = self._prepare_config(self.config_path)
-            cmd += ['--config', cfg, '--verb', '3', '--script-security', '2']
-
-            dns = None
-            if OPENVPN_DNS_SCRIPT and os.path.exists(OPENVPN_DNS_SCRIPT) and os.access(OPENVPN_DNS_SCRIPT, os.X_OK):
-                dns = OPENVPN_DNS_SCRIPT
-            if not dns:
-                for s in ['/etc/openvpn/update-resolv-conf', '/etc/openvpn/update-systemd-resolved']:
-                    if os.path.exists(s) and os.access(s, os.X_OK): dns = s; break
-            if dns:
-                cmd += ['--up', dns, '--down', dns]
 
             if self.username and self.password:
                 import tempfile
-                fd, self.auth_file = tempfile.mkstemp(suffix='_ovpn_auth', text=True)
+                afd, self.auth_file = tempfile.mkstemp(suffix='_ovpn_auth', text=True)
                 try:
-                    with os.fdopen(fd, 'w') as f: f.write(f"{self.username}\n{self.password}\n")
-                    cmd += ['--auth-user-pass', self.auth_file]
+                    with os.fdopen(afd, 'w') as f: f.write(f"{self.username}\n{self.password}\n")
                     os.chmod(self.auth_file, 0o600)
                 except Exception as ex:
-                    os.close(fd)
+                    os.close(afd)
                     if self.auth_file and os.path.exists(self.auth_file):
                         try: os.unlink(self.auth_file)
                         except: pass
                     self.auth_file = None; raise ex
 
             self.status_changed.emit("Connecting…")
-            self.process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                universal_newlines=True, bufsize=1, preexec_fn=os.setsid
-            )
+            if self.helper is not None:
+                fd = self._launch_helper(cfg)
+                if fd is None and self.should_stop: return
+            if fd is None:
+                fd = self._launch_direct(cfg)
+            # Announce the pid now so a cancel during pkexec's prompt or a
+            # silent start can still be signalled.
+            pid = self.helper_pid or self.process.pid
+            self.process_started.emit(pid)
+            resolved = self.process is None
+            os.set_blocking(fd, False)
+            reader = LineReader(fd)
+            sel = selectors.DefaultSelector(); sel.register(fd, selectors.EVENT_READ)
             ok = fail = False
-            for line in iter(self.process.stdout.readline, ''):
-                if self.should_stop: break
-                line = line.strip()
-                if line: self.output_received.emit(line)
-                if not ok and not fail:
-                    m = re.search(r'TUN/TAP device (\w+) opened', line)
-                    if m: self.vpn_iface = m.group(1)
-                    if any(x in line for x in ["Initialization Sequence Completed", "VPN tunnel is ready"]):
-                        self.status_changed.emit("Connected")
-                        self.connection_established.emit(self.vpn_iface or ""); ok = True
-                    elif "AUTH_FAILED" in line or "Authentication failed" in line:
-                        self.connection_failed.emit("Authentication failed"); fail = True
-                    elif "TLS Error" in line or "TLS handshake failed" in line:
-                        self.connection_failed.emit("TLS/Certificate error"); fail = True
-                    elif "FATAL" in line:
-                        self.connection_failed.emit(f"Fatal: {line}"); fail = True
-
-            rc = self.process.wait()
+            try:
+                while not reader.eof and not self.should_stop:
+                    if not sel.select(0.5): continue
+                    block = reader.read()
+                    if not block: continue
+                    if not resolved:
+                        # sudo forks openvpn as a child; pkexec exec()s it in place.
+                        resolved = True
+                        child = find_process(self.process.pid, 'openvpn')
+                        if child and child != pid:
+                            pid = child; self.process_started.emit(pid)
+                    # Decode lazily: with the management socket carrying the
+                    # log, only lines that match an event get decoded.
+                    if self.mirror_output:
+                        text = str(block, 'utf-8', 'replace')
+                        batch = [l for l in map(str.strip, text.splitlines()) if l]
+                        if batch: self.output_batch.emit(batch)
+                        events = classify(text)
+                    else:
+                        events = classify(bytes(block))
+                    for ev in events:
+                        if ev.kind == EV_TUN_OPENED: self.vpn_iface = ev.detail
+                        self.log_event.emit(ev.kind, ev.detail, ev.line)
+                        if ok or fail: continue
+                        if ev.kind == EV_CONNECTED:
+                            ok = True; self.status_changed.emit("Connected")
+                            self.connection_established.emit(self.vpn_iface or "")
+                        elif ev.kind in EV_FAILURES:
+                            fail = True
+                            self.connection_failed.emit(
+                                self.FAILURE_MESSAGES.get(ev.kind, f"Fatal: {ev.line}"))
+            finally:
+                sel.close()
+
+            rc = self._wait_exit()
             if not ok and not fail and not self.should_stop:
                 self.connection_failed.emit(f"Connection failed (exit {rc})")
         except PermissionError:
@@ -942,6 +1347,10 @@ class OpenVPNThread(QThread):
         except Exception as ex:
             self.connection_failed.emit(str(ex))
         finally:
+            # The helper's pipe is ours to close; a Popen pipe belongs to Popen.
+            if self.process is None and fd is not None:
+                try: os.close(fd)
+                except OSError: pass
             self._cleanup(); self.finished_cleanup.emit()
 
     def _cleanup(self):
@@ -952,45 +1361,194 @@ class OpenVPNThread(QThread):
                 except: pass
             setattr(self, attr, None)
 
-    def stop(self):
+    def stop(self) -> bool:
+        """Ask openvpn to exit; False if it could not be signalled from here."""
         self.should_stop = True
+        if self.helper is not None and self.helper_pid:
+            try: self.helper.stop(self.helper_pid); return True
+            except HelperError: return False
+            except OSError: self._drop_helper(); return False
         if self.process and self.process.poll() is None:
             try:
-                import signal as _sig
-                os.killpg(os.getpgid(self.process.pid), _sig.SIGTERM)
-            except: pass
+                os.killpg(self.process.pid, signal.SIGTERM)   # setsid: pgid == pid
+            except ProcessLookupError: return True
+            except PermissionError:
+                # pkexec/sudo run openvpn as root; the caller escalates.
+                print(f"[vpn] No permission to signal openvpn group {self.process.pid}")
+                return False
+        return True
+
+
+# ── Log search thread ─────────────────────────────────────────────────────────
+
+class LogSearchThread(QThread):
+    """
+    Owns the search indexes: one for the live session, fed as lines are
+    logged, and one for whichever stored session is open.  Indexing and
+    queries both run here; when queries pile up only the newest is answered.
+    The live index keeps the same last <limit> lines as the log view; older
+    lines of the session are searched through its stored log.
+    """
+    results = pyqtSignal(int, int, list)   # query seq, total matches, lines
+    indexed = pyqtSignal(str, int)          # session id ("" = live), line count
+    failed  = pyqtSignal(int, str)          # query seq, error
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self._jobs = queue.SimpleQueue()
+        self._live = LogIndex(limit)
+        self._stored = None; self._stored_sid = None
+
+    def add(self, lines):       self._jobs.put(("add", list(lines)))
+    def reset(self):            self._jobs.put(("reset",))
+    def load(self, sid, directory): self._jobs.put(("load", sid, directory))
+    def query(self, seq, sid, text, regex, facet):
+        self._jobs.put(("query", seq, sid, text, regex, facet))
+    def stop(self):             self._jobs.put(None)
+
+    def run(self):
+        while True:
+            jobs = [self._jobs.get()]
+            while True:
+                try: jobs.append(self._jobs.get_nowait())
+                except queue.Empty: break
+            last_query = None
+            for job in jobs:
+                if job is None: return
+                if job[0] == "query": last_query = job
+                elif job[0] == "add": self._live.add(job[1])
+                elif job[0] == "reset": self._live = LogIndex(self.limit)
+                elif job[0] == "load": self._load(job[1], job[2])
+            if last_query is not None:
+                self._query(*last_query[1:])
+
+    def _load(self, sid, directory):
+        if sid == self._stored_sid: return
+        idx = LogIndex()
+        try:
+            with SessionReader(directory, sid) as r:
+                span = r.span()
+                if span:
+                    data = r.range(span[0], span[1] + 1)
+                    text = data.decode(errors="replace").splitlines()
+                    for i in range(0, len(text), 10000):
+                        idx.add(text[i:i + 10000])
+        except OSError as ex:
+            print(f"[search] Could not index {sid}: {ex}")
+        self._stored, self._stored_sid = idx, sid
+        self.indexed.emit(sid, len(idx))
+
+    def _query(self, seq, sid, text, regex, facet):
+        idx = self._live if sid is None else self._stored
+        if idx is None or (sid is not None and sid != self._stored_sid):
+            return
+        try:
+            total, ids = idx.search(text, regex=regex, facet=facet, limit=self.limit)
+        except re.error as ex:
+            self.failed.emit(seq, str(ex)); return
+        lines = idx.lines
+        self.results.emit(seq, total, [lines[i] for i in ids])
 
 
 # ── Data models ───────────────────────────────────────────────────────────────
 
-class VPNConfig:
-    def __init__(self, name, config_path, username="", password=""):
-        self.name = name; self.config_path = config_path
-        self.username = username; self.password = password
+class SessionTableModel(QAbstractTableModel):
+    """
+    Session history as a lazily fetched table.
+
+    Rows come from SessionHistory a page at a time as the view scrolls
+    (canFetchMore/fetchMore); sorting and the profile filter are pushed down
+    to SQL, so only the rows on screen are ever in memory.
+    """
+    COLUMNS = (
+        ("Started", "started"), ("Profile", "profile"), ("Duration", "duration"),
+        ("Upload", "upload"), ("Download", "download"),
+        ("Peak ↑", "pk_up"), ("Peak ↓", "pk_dn"),
+        ("↑ p50 / p95 / p99", "p95_up"), ("↓ p50 / p95 / p99", "p95_dn"), ("Reason", "reason"),
+    )
+    PAGE = 200
 
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self._history = history
+        self._rows = []; self._total = 0
+        self._sort = "started"; self._desc = True; self._profile = None
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._rows = []
+        try: self._total = self._history.count(self._profile)
+        except sqlite3.Error as ex:
+            print(f"[history] {ex}"); self._total = 0
+        self.endResetModel()
+
+    def set_profile(self, profile):
+        if profile != self._profile:
+            self._profile = profile; self.reload()
+
+    def session_added(self, rec):
+        if self._profile is not None and rec["profile"] != self._profile: return
+        if self._sort == "started" and self._desc:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self._rows.insert(0, rec); self._total += 1
+            self.endInsertRows()
+        else:
+            self.reload()
 
-class ConfigManager:
-    def __init__(self):
-        d = Path.home() / '.openvpn_gui'; d.mkdir(exist_ok=True)
-        self._f = d / 'configs.json'
-        self.configs: Dict[str, VPNConfig] = self._load()
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
 
-    def _load(self):
-        if self._f.exists():
-            try:
-                with open(self._f) as f:
-                    return {k: VPNConfig(**v) for k, v in json.load(f).items()}
-            except: pass
-        return {}
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
 
-    def save(self):
-        with open(self._f, 'w') as f:
-            json.dump({k: v.__dict__ for k, v in self.configs.items()}, f, indent=2)
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
 
-    def add(self, c): self.configs[c.name] = c; self.save()
-    def remove(self, n):
-        if n in self.configs: del self.configs[n]; self.save()
-    def get(self, n): return self.configs.get(n)
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid(): return
+        try:
+            page = self._history.page(len(self._rows), self.PAGE, self._sort, self._desc, self._profile)
+        except sqlite3.Error as ex:
+            print(f"[history] {ex}"); self._total = len(self._rows); return
+        if not page:
+            self._total = len(self._rows); return
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort = self.COLUMNS[column][1]
+        self._desc = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        key = self.COLUMNS[index.column()][1]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if key in ("duration", "upload", "download", "pk_up", "pk_dn", "p95_up", "p95_dn"):
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            return None
+        if role != Qt.ItemDataRole.DisplayRole: return None
+        v = self._rows[index.row()][key]
+        if key == "started":
+            return datetime.datetime.fromtimestamp(v).strftime("%Y-%m-%d %H:%M")
+        if key == "duration":
+            h, r = divmod(v, 3600); m, sec = divmod(r, 60)
+            return f"{h:02d}:{m:02d}:{sec:02d}"
+        if key in ("upload", "download"): return fmt_bytes(v)
+        if key in ("pk_up", "pk_dn"): return f"{v:.1f} KB/s"
+        if key in ("p95_up", "p95_dn"):
+            row, d = self._rows[index.row()], key[-2:]
+            return f"{row['p50_' + d]:.1f} / {v:.1f} / {row['p99_' + d]:.1f}"
+        return v or "—"
 
 
 # ── Add / Edit Profile Dialog ─────────────────────────────────────────────────
@@ -1125,6 +1683,7 @@ class AddProfileDialog(QDialog):
 # ── Main Window ───────────────────────────────────────────────────────────────
 
 class OpenVPNConnectGUI(QMainWindow):
+    ev_subscribers = pyqtSignal(int)   # EventServer.on_change, from its threads
 
     def __init__(self):
         super().__init__()
@@ -1135,12 +1694,89 @@ class OpenVPNConnectGUI(QMainWindow):
         self.cancel_requested = False
         self.cur_cfg: Optional[VPNConfig] = None
         self.start_time = None; self.vpn_iface = None
-        self.sent_pts, self.recv_pts = [], []
-        self.last_sent = self.last_recv = None
-        self.ss_sent = self.ss_recv = None
-        self.sessions = []; self.total_secs = 0; self.sess_final = True
-
-        # Theme — reads gsettings on startup, watches for live changes
+        self._counters: Optional[IfaceCounters] = None
+        self.sent_pts = collections.deque(maxlen=120); self.recv_pts = collections.deque(maxlen=120)
+        self._meter = RateMeter()   # session totals and rates from monotonic samples
+        self._sk_up, self._sk_dn = DDSketch(), DDSketch()   # per-second KB/s this session
+        self._start_ns = None       # monotonic start; start_time is only for display
+        self.sess_final = True
+        self._sess_profile = ""
+        # Session history on disk (in memory if the file can't be opened).
+        # Aggregates are loaded once from the rollups and then kept up to date
+        # per finished session.
+        try:
+            self._history = SessionHistory(Path.home() / '.openvpn_gui' / 'history.db')
+        except sqlite3.Error as ex:
+            print(f"[history] Session history unavailable, keeping it in memory: {ex}")
+            self._history = SessionHistory(":memory:")
+        self._totals: Dict[Optional[str], RunningTotals] = self._history.running_totals()
+        # Telemetry for the optional OpenMetrics endpoint; served off the GUI thread.
+        self._metrics = Metrics()
+        self._bytes_done = [0, 0]   # bytes of finished sessions since launch
+        self._metrics_srv: Optional[MetricsServer] = None
+        if METRICS_LISTEN:
+            try:
+                self._metrics_srv = MetricsServer(self._metrics, METRICS_LISTEN)
+                self._metrics_srv.start()
+                print(f"[metrics] Serving OpenMetrics on {METRICS_LISTEN}")
+            except (OSError, ValueError) as ex:
+                print(f"[metrics] Could not listen on {METRICS_LISTEN}: {ex}")
+                self._metrics_srv = None
+        # Event stream for status bars and scripts; I/O runs off the GUI thread.
+        self._events: Optional[EventServer] = None; self._ev_subs = 0; self._ev_mark = 0
+        self._ev_state = None
+        if EVENTS_SOCKET != "":
+            try:
+                # Queued even when a drop happens inside publish() on this
+                # thread, so the retune never runs in the middle of a sample.
+                self.ev_subscribers.connect(self._on_ev_subscribers, Qt.ConnectionType.QueuedConnection)
+                self._events = EventServer(EVENTS_SOCKET, on_change=self.ev_subscribers.emit)
+                self._events.start()
+                self._emit_state("disconnected")
+            except OSError as ex:
+                print(f"[events] Event stream unavailable: {ex}")
+                self._events = None
+        # Per-second throughput, downsampled to minutes and hours on disk.
+        self._rates: Optional[RateSeries] = None
+        try:
+            self._rates = RateSeries(Path.home() / '.openvpn_gui' / 'rates.bin')
+        except (OSError, ValueError) as ex:
+            print(f"[history] Throughput store unavailable: {ex}")
+        self.link_up = True
+        # Log ring buffer; the view is fed in one batch per frame.
+        self._log_buf = collections.deque(maxlen=LOG_MAX_LINES)
+        self._log_pending = []
+        self._log_flush = QTimer(self); self._log_flush.setSingleShot(True); self._log_flush.setInterval(16)
+        self._log_flush.timeout.connect(self._flush_log)
+        self._log_dir = Path.home() / '.openvpn_gui' / 'logs'
+        self._sess_log: Optional[SessionLog] = None
+        self._log_live = True   # False while a stored session or a filter is displayed
+        self._search = LogSearchThread(LOG_MAX_LINES)
+        self._search.results.connect(self._on_search_results)
+        self._search.failed.connect(self._on_search_failed)
+        self._search.indexed.connect(self._on_search_indexed)
+        self._search.start()
+        self._search_seq = 0
+        self._search_debounce = QTimer(self); self._search_debounce.setSingleShot(True)
+        self._search_debounce.setInterval(150)
+        self._search_debounce.timeout.connect(self._run_search)
+        self._proc: Optional[ProcessHandle] = None; self._proc_sn = None
+        self._helper: Optional[HelperClient] = None   # kept open so polkit asks once
+        self._instance: Optional[SingleInstance] = None; self._instance_sn = None
+        self._mgmt: Optional[ManagementClient] = None; self._mgmt_sn = None
+        self._mgmt_bytes = None
+
+        # Tunnel link events over rtnetlink — no `ip link` polling
+        self._links: Optional[LinkWatcher] = None
+        try:
+            self._links = LinkWatcher()
+            self._links_sn = QSocketNotifier(self._links.fileno(), QSocketNotifier.Type.Read, self)
+            self._links_sn.activated.connect(self._on_link_events)
+        except OSError as ex:
+            print(f"[net] rtnetlink unavailable, falling back to `ip link`: {ex}")
+            self._links = None
+
+        # Theme — paints from the cache now, resolves gsettings in the background
         self._theme = ThemeManager(self)
         self._theme.theme_changed.connect(self._apply_theme)
         self._theme.start()
@@ -1148,8 +1784,10 @@ class OpenVPNConnectGUI(QMainWindow):
         app = QApplication.instance()
         if app:
             app.setStyleSheet(build_app_css())
+        # One scheduler for liveness, counters, duration and chart; see _retune_tick.
+        self._timer = QTimer(self); self._timer.timeout.connect(self._tick)
+        self._chart_mark = None   # RateMeter.mark() at the last chart point
         self._build()
-        self._timer = QTimer(self); self._timer.timeout.connect(self._tick); self._timer.start(1000)
 
     # ── Theme helpers ─────────────────────────────────────────────────────────
 
@@ -1288,6 +1926,8 @@ class OpenVPNConnectGUI(QMainWindow):
     def _nav(self, idx):
         self.stack.setCurrentIndex(idx)
         for i, b in enumerate(self._navbtns): b.setChecked(i == idx)
+        if idx == 2: self._hist_chart.reload()
+        self._retune_tick()
 
     # ── Status page ───────────────────────────────────────────────────────────
 
@@ -1432,19 +2072,66 @@ class OpenVPNConnectGUI(QMainWindow):
         self._st_time  = self._stat_box(grid, "Total Time",  c.BLUE_UP)
         self._st_pk_up = self._stat_box(grid, "Peak Upload", c.BLUE_UP)
         self._st_pk_dn = self._stat_box(grid, "Peak Down",   c.ORANGE)
+        self._st_p95_up = self._stat_box(grid, "p95 Upload", c.BLUE_UP)
+        self._st_p95_dn = self._stat_box(grid, "p95 Down",   c.ORANGE)
         lay.addLayout(grid)
         hist_card = QFrame(); hist_card.setObjectName("Card")
         hcl = QVBoxLayout(hist_card); hcl.setContentsMargins(14, 12, 14, 12); hcl.setSpacing(8)
+        hrow = QHBoxLayout()
         ht = QLabel("Session History")
         ht.setStyleSheet(f"color: {c.TXT_MUT}; font-size: 9px; font-weight: 600; letter-spacing: 1px;")
-        hcl.addWidget(ht)
-        self._hist_box = QTextEdit(); self._hist_box.setReadOnly(True)
-        self._hist_box.setMinimumHeight(160); hcl.addWidget(self._hist_box)
-        lay.addWidget(hist_card, 1); self._refresh_stats()
+        hrow.addWidget(ht); hrow.addStretch()
+        self._st_profile = QComboBox(); self._st_profile.setFixedWidth(180)
+        self._st_profile.setItemDelegate(AccentHoverDelegate(self._st_profile))
+        self._st_profile.currentIndexChanged.connect(self._on_stats_profile)
+        hrow.addWidget(self._st_profile); hcl.addLayout(hrow)
+        self._hist_model = SessionTableModel(self._history, self)
+        self._hist_view = QTableView(); self._hist_view.setModel(self._hist_model)
+        self._hist_view.setMinimumHeight(160)
+        self._hist_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._hist_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._hist_view.verticalHeader().setVisible(False)
+        self._hist_view.verticalHeader().setDefaultSectionSize(24)
+        self._hist_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self._hist_view.horizontalHeader().setStretchLastSection(True)
+        self._hist_view.setSortingEnabled(True)
+        self._hist_view.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+        hcl.addWidget(self._hist_view)
+        lay.addWidget(hist_card, 1)
+        self._refresh_stats_profiles(); self._refresh_stats()
+
+        traffic_card = QFrame(); traffic_card.setObjectName("Card")
+        tcl = QVBoxLayout(traffic_card); tcl.setContentsMargins(14, 12, 14, 12); tcl.setSpacing(8)
+        trow = QHBoxLayout()
+        tt = QLabel("Traffic History")
+        tt.setStyleSheet(f"color: {c.TXT_MUT}; font-size: 9px; font-weight: 600; letter-spacing: 1px;")
+        trow.addWidget(tt); trow.addStretch()
+        self._hist_chart = HistoryChart()
+        for label, secs in (("1h", 3600), ("24h", 86400), ("7d", 7 * 86400)):
+            b = QPushButton(label); b.setObjectName("SmBtn"); b.setFixedWidth(44)
+            b.setCheckable(True); b.setAutoExclusive(True); b.setChecked(secs == 3600)
+            b.clicked.connect(lambda _=False, s=secs: self._hist_chart.set_span(s))
+            trow.addWidget(b)
+        tcl.addLayout(trow)
+        self._hist_chart.set_store(self._rates); tcl.addWidget(self._hist_chart, 1)
+        lay.addWidget(traffic_card, 1)
         return pg
 
     # ── Log page ──────────────────────────────────────────────────────────────
 
+    _LOG_FACETS = (
+        ("All lines",       None),
+        ("Errors",          SEV_ERROR),
+        ("Warnings",        SEV_WARNING),
+        ("TLS failures",    EV_TLS_FAIL),
+        ("Auth failures",   EV_AUTH_FAIL),
+        ("Fatal",           EV_FATAL),
+        ("Restarts",        EV_RESTART),
+        ("Connected",       EV_CONNECTED),
+        ("Pushed options",  EV_PUSHED),
+        ("Tunnel device",   EV_TUN_OPENED),
+    )
+
     def _pg_log(self):
         c = Colors
         pg = QWidget(); pg.setStyleSheet(f"background: {c.BG_BASE};")
@@ -1452,11 +2139,41 @@ class OpenVPNConnectGUI(QMainWindow):
         hdr = QHBoxLayout()
         t = QLabel("Log"); t.setStyleSheet(f"color: {c.TXT_PRI}; font-size: 14px; font-weight: 700;")
         hdr.addWidget(t); hdr.addStretch()
+        self._log_sess = QComboBox(); self._log_sess.setFixedWidth(210)
+        self._log_sess.setItemDelegate(AccentHoverDelegate(self._log_sess))
+        self._log_sess.activated.connect(self._on_log_session)
+        hdr.addWidget(self._log_sess)
+        self._log_from = QDateTimeEdit(); self._log_from.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self._log_from.setCalendarPopup(True); self._log_from.setEnabled(False)
+        hdr.addWidget(self._log_from)
+        go = QPushButton("Go"); go.setObjectName("SmBtn"); go.setFixedWidth(44)
+        go.clicked.connect(self._seek_log); hdr.addWidget(go)
         clr = QPushButton("Clear"); clr.setObjectName("SmBtn"); clr.setFixedWidth(60)
-        clr.clicked.connect(lambda: self._log_box.clear())
+        clr.clicked.connect(self._clear_log)
         hdr.addWidget(clr); lay.addLayout(hdr)
-        self._log_box = QTextEdit(); self._log_box.setReadOnly(True)
+        bar = QHBoxLayout(); bar.setSpacing(8)
+        self._log_query = QLineEdit(); self._log_query.setPlaceholderText("Search log…")
+        self._log_query.setClearButtonEnabled(True)
+        self._log_query.textChanged.connect(lambda _: self._search_debounce.start())
+        bar.addWidget(self._log_query, 1)
+        self._log_regex = QCheckBox("Regex")
+        self._log_regex.setStyleSheet(f"color: {c.TXT_SEC}; font-size: 12px;")
+        self._log_regex.toggled.connect(lambda _: self._search_debounce.start())
+        bar.addWidget(self._log_regex)
+        self._log_facet = QComboBox(); self._log_facet.setFixedWidth(150)
+        self._log_facet.setItemDelegate(AccentHoverDelegate(self._log_facet))
+        for label, facet in self._LOG_FACETS: self._log_facet.addItem(label, facet)
+        self._log_facet.currentIndexChanged.connect(lambda _: self._run_search())
+        bar.addWidget(self._log_facet)
+        self._log_hits = QLabel(""); self._log_hits.setMinimumWidth(110)
+        self._log_hits.setStyleSheet(f"color: {c.TXT_SEC}; font-size: 11px;")
+        bar.addWidget(self._log_hits)
+        lay.addLayout(bar)
+        self._log_box = QPlainTextEdit(); self._log_box.setReadOnly(True)
+        self._log_box.setUndoRedoEnabled(False)
+        self._log_box.setMaximumBlockCount(LOG_MAX_LINES)
         lay.addWidget(self._log_box, 1)
+        self._refresh_log_sessions()
         return pg
 
     # ── Interactions ──────────────────────────────────────────────────────────
@@ -1523,13 +2240,24 @@ class OpenVPNConnectGUI(QMainWindow):
         if not os.path.exists(self.cur_cfg.config_path):
             themed_error(self, "Error", "File not found:", self.cur_cfg.config_path); return
         self.cancel_requested = False
+        self._mgmt_close()
+        try:
+            self._mgmt = ManagementClient.listen()
+            self._mgmt_watch()
+        except OSError as ex:
+            self._log(f"⚠ Management interface unavailable: {ex}"); self._mgmt = None
         self.vpn_thread = OpenVPNThread(
             self.cur_cfg.config_path, self.cur_cfg.username or None, self.cur_cfg.password or None,
+            mgmt_args=self._mgmt.openvpn_args() if self._mgmt else None,
+            helper=self._helper_client(),
         )
         self.vpn_thread.output_received.connect(self._log)
+        self.vpn_thread.output_batch.connect(self._log_lines)
         self.vpn_thread.connection_established.connect(self._on_connected)
         self.vpn_thread.connection_failed.connect(self._on_failed)
         self.vpn_thread.finished_cleanup.connect(self._on_thread_done)
+        self.vpn_thread.process_started.connect(self._on_process_started)
+        self.vpn_thread.log_event.connect(self._on_log_event)
         self.vpn_thread.start()
         self.connecting = True
         self._conn_btn.setStyleSheet(self._conn_btn_style_disconnect)
@@ -1541,6 +2269,10 @@ class OpenVPNConnectGUI(QMainWindow):
             f"color: {Colors.ORANGE}; font-size: 14px; font-weight: 700; background: transparent;"
         )
         self._reset_live(); self.start_time = None; self.sess_final = True
+        self._sess_profile = self.cur_cfg.name
+        self._metrics.inc("openvpn_gui_connect_attempts", profile=self._sess_profile)
+        self._emit_state("connecting", profile=self._sess_profile)
+        self._open_session_log(self.cur_cfg.name)
         self._log(f"=== Connecting to '{self.cur_cfg.name}' ===")
 
     def _disconnect(self):
@@ -1551,7 +2283,8 @@ class OpenVPNConnectGUI(QMainWindow):
         if was_connecting:
             self.cancel_requested = True
             if self.vpn_thread and self.vpn_thread.isRunning():
-                self.vpn_thread.stop()
+                if not self.vpn_thread.stop() and not self._mgmt_signal():
+                    self._signal_vpn(signal.SIGTERM, wait=False)
             self._log("Connection attempt cancelled.")
             self.connected = False
             self._apply_disconnected(); self._reset_live()
@@ -1559,14 +2292,10 @@ class OpenVPNConnectGUI(QMainWindow):
             return
 
         if self.vpn_thread and self.vpn_thread.isRunning():
-            self.vpn_thread.stop(); self.vpn_thread.wait(15000)
-        try:
-            r = subprocess.run(['pgrep', 'openvpn'], capture_output=True)
-            if r.returncode == 0:
-                kill = ['pkill', '-KILL', 'openvpn']
-                if os.getuid() == 0: subprocess.run(kill, capture_output=True, timeout=10)
-                else: run_privileged(kill, capture_output=True, timeout=10)
-        except: pass
+            if not self.vpn_thread.stop() and not self._mgmt_signal():
+                self._signal_vpn(signal.SIGTERM)
+            self.vpn_thread.wait(15000)
+        self._signal_vpn(signal.SIGKILL)
         self._finalize("Manual disconnect")
         self.connected = False
         self._apply_disconnected(); self._reset_live()
@@ -1574,6 +2303,8 @@ class OpenVPNConnectGUI(QMainWindow):
 
     def _apply_disconnected(self):
         self.connecting = False
+        self._publish_idle()
+        self._emit_state("disconnected")
         self._dot.set_state("off")
         self._big_status.setText("Disconnected")
         self._big_status.setStyleSheet(
@@ -1584,13 +2315,21 @@ class OpenVPNConnectGUI(QMainWindow):
         self._combo.setEnabled(True)
 
     def _on_connected(self, iface):
+        if self.connected:
+            self.vpn_iface = self.vpn_iface or iface or None; return
         self.connecting = False
         self.cancel_requested = False
         self.connected = True; self.start_time = datetime.datetime.now()
-        self.vpn_iface = iface or self._detect_iface(); self.sess_final = False
-        self.last_sent = self.last_recv = None; self.ss_sent = self.ss_recv = None
-        self.sent_pts = []; self.recv_pts = []; self._chart.clear()
-        self._dot.set_state("on")
+        self._start_ns = time.monotonic_ns()
+        self.vpn_iface = iface or self.vpn_iface or self._detect_iface(); self.sess_final = False
+        self.link_up = True
+        self._meter.reset(); self._chart_mark = None
+        self._sk_up, self._sk_dn = DDSketch(), DDSketch()
+        self.sent_pts.clear(); self.recv_pts.clear(); self._chart.clear()
+        self._dot.set_state("on"); self._retune_tick()
+        self._metrics.clear("openvpn_gui_tunnel_up")
+        self._metrics.set("openvpn_gui_tunnel_up", 1, profile=self._sess_profile)
+        self._emit_state("connected", profile=self._sess_profile, iface=self.vpn_iface)
         self._big_status.setText("Connected")
         self._big_status.setStyleSheet(
             f"color: {Colors.ORANGE}; font-size: 14px; font-weight: 700; background: transparent;"
@@ -1610,11 +2349,15 @@ class OpenVPNConnectGUI(QMainWindow):
             self._log(f"Connection cancelled: {err}")
             return
         self._finalize("Failed"); self.connected = False
+        self._metrics.inc("openvpn_gui_connect_failures",
+                          profile=self._sess_profile, reason=self._failure_category(err))
+        self._emit_state("failed", profile=self._sess_profile, error=err)
         self._apply_disconnected(); self._reset_live()
         self.start_time = self.vpn_iface = None
         self._log(f"✗ FAILED: {err}"); themed_error(self, "Connection Failed", err)
 
     def _on_thread_done(self):
+        self._mgmt_close(); self._close_session_log()
         if self.cancel_requested:
             self.cancel_requested = False
         if not self.connected:
@@ -1622,7 +2365,14 @@ class OpenVPNConnectGUI(QMainWindow):
             self.start_time = self.vpn_iface = None
 
     def _add_profile(self):
+        self._exec_add_dialog(AddProfileDialog(self))
+
+    def _import_profile(self, path):
         d = AddProfileDialog(self)
+        d.path_e.setText(path); d.name_e.setText(Path(path).stem)
+        self._exec_add_dialog(d)
+
+    def _exec_add_dialog(self, d):
         if d.exec() == QDialog.DialogCode.Accepted:
             data = d.data()
             if not data['name'] or not data['config_path']:
@@ -1659,80 +2409,346 @@ class OpenVPNConnectGUI(QMainWindow):
 
     # ── Timer ─────────────────────────────────────────────────────────────────
 
-    def _tick(self):
-        if not self.connected: return
-        try:
-            r = subprocess.run(['pgrep', 'openvpn'], capture_output=True)
-            if r.returncode != 0:
-                self._log("⚠ Process lost."); self._finalize("Process lost")
-                self.connected = False; self._apply_disconnected(); self._reset_live()
-                self.start_time = self.vpn_iface = None; self._refresh_list(); return
-        except: pass
+    TICK_FAST_MS   = 250     # Status page on screen
+    TICK_SLOW_MS   = 5000    # other page, hidden or minimized
+    TICK_EVENTS_MS = 1000    # event stream has subscribers
+    CHART_STEP_S   = 1.0     # one chart point per second of wall time
 
-        if self.start_time:
-            secs = int((datetime.datetime.now() - self.start_time).total_seconds())
-            self._dur_lbl.setText(fmt_dur(secs))
+    def _retune_tick(self):
+        if not self.connected:
+            self._timer.stop(); return
+        watching = self.isVisible() and not self.isMinimized() and self.stack.currentIndex() == 0
+        ms = self.TICK_FAST_MS if watching else self.TICK_SLOW_MS
+        if self._ev_subs: ms = min(ms, self.TICK_EVENTS_MS)   # subscribers get per-second counters
+        if self._timer.isActive() and self._timer.interval() == ms: return
+        self._timer.start(ms)
+        if watching: self._tick()   # bring the page up to date right away
 
-        if self.vpn_iface:
+    def _tick(self):
+        if not self.connected:
+            self._timer.stop(); return
+        # With a pidfd, exit is reported by _on_process_exit; only poll without one.
+        if self._proc is not None and self._proc_sn is None and not self._proc.alive():
+            self._on_process_lost(); return
+
+        if self._start_ns is not None:
+            self._dur_lbl.setText(fmt_dur(self._session_secs()))
+
+        # Management counters change only once per >BYTECOUNT and are sampled
+        # as they arrive (_on_mgmt_bytes); re-sampling them here would credit a
+        # whole second of traffic to one tick.
+        if self._mgmt_bytes is None and self.vpn_iface:
             sent, recv = self._iface_bytes(self.vpn_iface)
             if sent is not None:
-                self._up_lbl.setText(fmt_bytes(sent)); self._dn_lbl.setText(fmt_bytes(recv))
-                if self.ss_sent is None: self.ss_sent = sent; self.ss_recv = recv
-                up_k = dn_k = 0.0
-                if self.last_sent is not None:
-                    up_k = max(0.0, (sent - self.last_sent) / 1024.0)
-                    dn_k = max(0.0, (recv - self.last_recv) / 1024.0)
-                self.last_sent = sent; self.last_recv = recv
-                self._up_rate.setText(f"↑ {up_k:.1f} KB/s"); self._dn_rate.setText(f"↓ {dn_k:.1f} KB/s")
-                self._chart.push(up_k, dn_k)
-                self.sent_pts.append(up_k); self.recv_pts.append(dn_k)
-                if len(self.sent_pts) > 120: self.sent_pts.pop(0)
-                if len(self.recv_pts) > 120: self.recv_pts.pop(0)
+                self._meter.sample(sent, recv); self._on_sample()
+
+    def _on_mgmt_bytes(self, sent, recv, t_ns):
+        self._mgmt_bytes = (sent, recv)
+        if self.connected:
+            self._meter.sample(sent, recv, t_ns); self._on_sample()
+
+    def _on_sample(self):
+        m = self._meter
+        self._publish_live(); self._emit_counters()
+        self._up_lbl.setText(fmt_bytes(m.total_sent)); self._dn_lbl.setText(fmt_bytes(m.total_recv))
+        self._up_rate.setText(f"↑ {m.ewma[0] / 1024.0:.1f} KB/s")
+        self._dn_rate.setText(f"↓ {m.ewma[1] / 1024.0:.1f} KB/s")
+        if self._chart_mark is None:
+            self._chart_mark = m.mark(); return
+        up, dn, dt = m.rate_since(self._chart_mark)
+        if dt < self.CHART_STEP_S * 0.95: return
+        # Chart points and peaks are averages over the real elapsed
+        # interval, so timer jitter cannot fake a spike.
+        self._chart_mark = m.mark()
+        up_k, dn_k = up / 1024.0, dn / 1024.0
+        # After a slow tick, fill one point per elapsed step so the chart's time axis holds.
+        steps = max(1, round(dt / self.CHART_STEP_S))
+        for _ in range(min(steps, TinyChart.CAPACITY)):
+            self._chart.push(up_k, dn_k)
+            self.sent_pts.append(up_k); self.recv_pts.append(dn_k)
+        self._sk_up.add(up_k, steps); self._sk_dn.add(dn_k, steps)
+        if self._rates is not None:
+            now = time.time()
+            for k in range(steps - 1, -1, -1):
+                self._rates.add(now - k * self.CHART_STEP_S, up_k, dn_k)
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    _FAILURE_KINDS = {msg: kind for kind, msg in OpenVPNThread.FAILURE_MESSAGES.items()}
+
+    def _failure_category(self, err):
+        if err in self._FAILURE_KINDS: return self._FAILURE_KINDS[err]
+        if err.startswith("Fatal"): return "fatal"
+        if err.startswith("Permission denied"): return "permission"
+        if err.startswith("openvpn not found"): return "not_installed"
+        if err.startswith("Connection failed (exit"): return "exited"
+        return "other"
+
+    def _publish_live(self):
+        m, mt, prof = self._metrics, self._meter, self._sess_profile
+        m.set("openvpn_gui_session_duration_seconds", self._session_secs(), profile=prof)
+        for d, rate, total, done in (("up", mt.ewma[0], mt.total_sent, self._bytes_done[0]),
+                                     ("down", mt.ewma[1], mt.total_recv, self._bytes_done[1])):
+            m.set("openvpn_gui_rate_bytes_per_second", rate, direction=d)
+            m.set("openvpn_gui_session_bytes", total, direction=d)
+            m.set("openvpn_gui_bytes", done + total, direction=d)
+
+    def _emit(self, kind, **fields):
+        if self._events is not None: self._events.publish(kind, **fields)
+
+    def _emit_state(self, state, **fields):
+        # Several code paths tear down a session; publish each transition once.
+        key = (state, tuple(sorted(fields.items())))
+        if key == self._ev_state: return
+        self._ev_state = key; self._emit("state", state=state, **fields)
+
+    def _on_ev_subscribers(self, n):
+        self._ev_subs = n; self._retune_tick()
+
+    def _emit_counters(self):
+        ev = self._events
+        if ev is None or not ev.subscribers: return
+        now = time.monotonic_ns()
+        if now - self._ev_mark < 950_000_000: return
+        self._ev_mark = now; m = self._meter
+        ev.publish("counters", sent=m.total_sent, recv=m.total_recv, up_rate=round(m.ewma[0], 1),
+                   down_rate=round(m.ewma[1], 1), duration=self._session_secs())
+
+    def _publish_idle(self):
+        m = self._metrics
+        m.clear("openvpn_gui_tunnel_up"); m.set("openvpn_gui_tunnel_up", 0)
+        for name in ("openvpn_gui_session_duration_seconds", "openvpn_gui_rate_bytes_per_second",
+                     "openvpn_gui_session_bytes"):
+            m.clear(name)
+
+    # ── Process tracking ──────────────────────────────────────────────────────
+
+    def _on_process_started(self, pid):
+        self._drop_process()
+        self._proc = ProcessHandle(pid)
+        if self._proc.fileno() >= 0:
+            self._proc_sn = QSocketNotifier(self._proc.fileno(), QSocketNotifier.Type.Read, self)
+            self._proc_sn.activated.connect(self._on_process_exit)
+
+    def _on_process_exit(self, *_):
+        if self._proc_sn is not None: self._proc_sn.setEnabled(False)
+        if self.connected: self._on_process_lost()
+
+    def _on_process_lost(self):
+        self._log("⚠ Process lost."); self._finalize("Process lost")
+        self.connected = False; self._apply_disconnected(); self._reset_live()
+        self.start_time = self.vpn_iface = None; self._refresh_list()
+
+    def _drop_process(self):
+        if self._proc_sn is not None:
+            self._proc_sn.setEnabled(False); self._proc_sn.deleteLater(); self._proc_sn = None
+        if self._proc is not None:
+            self._proc.close(); self._proc = None
+
+    def _helper_client(self) -> Optional[HelperClient]:
+        """The privileged helper connection, (re)opened on demand; None without a helper."""
+        if os.getuid() == 0 or not HelperClient.available():
+            return None
+        if self._helper is not None and self._helper.closed:
+            self._helper = None   # the connection worker saw it fail
+        if self._helper is None:
+            try:
+                self._helper = HelperClient()
+            except (OSError, HelperError) as ex:
+                print(f"[helper] Not using the privileged helper: {ex}")
+        return self._helper
+
+    def _signal_vpn(self, sig, wait=True):
+        """Signal only the openvpn process we launched."""
+        t = self.vpn_thread
+        if self._proc is None and t is not None and (t.helper_pid or t.process):
+            # process_started is still queued behind this call
+            self._on_process_started(t.helper_pid or t.process.pid)
+        h = self._proc
+        if h is None or not h.alive(): return
+        try:
+            h.send_signal(sig)
+        except PermissionError:
+            if t is not None and t.helper is not None and t.helper_pid == h.pid:
+                try:
+                    t.helper.stop(h.pid, sig); return
+                except HelperError: return
+                except OSError:
+                    t.helper.close(); self._helper = None   # helper restarted; fall back to pkexec
+            args = ['kill', f'-{signal.Signals(sig).name[3:]}', str(h.pid)]
+            try:
+                if wait:
+                    run_privileged(args, capture_output=True, timeout=10)
+                else:
+                    tool = ['pkexec'] if shutil.which('pkexec') else ['sudo']
+                    subprocess.Popen(tool + args, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL, start_new_session=True)
+            except: pass
+        except OSError: pass
+
+    # ── Management interface ──────────────────────────────────────────────────
+
+    _MGMT_STATES = {
+        "CONNECTING": "Connecting…", "RESOLVE": "Resolving…", "TCP_CONNECT": "Connecting…",
+        "WAIT": "Waiting for server…", "AUTH": "Authenticating…", "AUTH_PENDING": "Authenticating…",
+        "GET_CONFIG": "Getting config…", "ASSIGN_IP": "Assigning IP…", "ADD_ROUTES": "Adding routes…",
+        "RECONNECTING": "Reconnecting…", "EXITING": "Exiting…",
+    }
+
+    def _mgmt_watch(self):
+        if self._mgmt_sn is not None:
+            self._mgmt_sn.setEnabled(False); self._mgmt_sn.deleteLater(); self._mgmt_sn = None
+        if self._mgmt is not None and self._mgmt.fileno() >= 0:
+            self._mgmt_sn = QSocketNotifier(self._mgmt.fileno(), QSocketNotifier.Type.Read, self)
+            self._mgmt_sn.activated.connect(self._on_mgmt_ready)
+
+    def _on_mgmt_ready(self, *_):
+        m = self._mgmt
+        if m is None: return
+        if not m.attached:
+            if m.accept():
+                # The socket now carries logs; stop mirroring stdout to avoid duplicates.
+                if self.vpn_thread: self.vpn_thread.mirror_output = False
+                self._mgmt_watch()
+            return
+        t_ns = time.monotonic_ns()   # receipt time of this batch, not of the next tick
+        for ev in m.read_events():
+            if ev.kind == "log" and len(ev.fields) == 3:
+                self._log(ev.fields[2])
+            elif ev.kind == "state" and len(ev.fields) > 1:
+                self._on_mgmt_state(ev.fields[1])
+            elif ev.kind == "bytecount" and len(ev.fields) == 2:
+                try: sent, recv = int(ev.fields[1]), int(ev.fields[0])
+                except ValueError: continue
+                self._on_mgmt_bytes(sent, recv, t_ns)
+            elif ev.kind == "fatal":
+                self._log(f"FATAL: {ev.fields[0]}")
+        if not m.attached:
+            if self.vpn_thread: self.vpn_thread.mirror_output = True
+            self._mgmt_sn.setEnabled(False)
+
+    def _on_mgmt_state(self, state):
+        if state == "CONNECTED":
+            if not self.connected:
+                self._on_connected(self.vpn_thread.vpn_iface if self.vpn_thread else "")
+            elif self.link_up:
+                self._dot.set_state("on"); self._big_status.setText("Connected")
+                self._emit_state("connected", profile=self._sess_profile, iface=self.vpn_iface)
+            return
+        label = self._MGMT_STATES.get(state)
+        if label and (self.connected or self.connecting):
+            if self.connected:
+                self._dot.set_state("spinning")
+                self._emit_state("reconnecting", profile=self._sess_profile, detail=state)
+            self._big_status.setText(label)
+
+    def _on_log_event(self, kind, detail, line):
+        self._emit("log", kind=kind, detail=detail, line=line)
+        # Without the management socket these are the only restart signals.
+        if not self.connected: return
+        if kind == EV_RESTART:
+            self._dot.set_state("spinning"); self._big_status.setText("Reconnecting…")
+            self._emit_state("reconnecting", profile=self._sess_profile)
+        elif kind == EV_CONNECTED and self.link_up:
+            self._dot.set_state("on"); self._big_status.setText("Connected")
+            self._emit_state("connected", profile=self._sess_profile, iface=self.vpn_iface)
+
+    def _mgmt_signal(self, name="SIGTERM"):
+        return self._mgmt is not None and self._mgmt.signal(name)
+
+    def _mgmt_close(self):
+        if self._mgmt_sn is not None:
+            self._mgmt_sn.setEnabled(False); self._mgmt_sn.deleteLater(); self._mgmt_sn = None
+        if self._mgmt is not None:
+            self._mgmt.close(); self._mgmt = None
 
     def _reset_live(self):
         self._dur_lbl.setText("—"); self._up_lbl.setText("—"); self._dn_lbl.setText("—")
         self._up_rate.setText("↑ 0.0 KB/s"); self._dn_rate.setText("↓ 0.0 KB/s")
-        self._chart.clear(); self.last_sent = self.last_recv = None
-        self.ss_sent = self.ss_recv = None; self.sent_pts = []; self.recv_pts = []
+        self._chart.clear(); self._meter.reset(); self._chart_mark = None; self._start_ns = None
+        self.sent_pts.clear(); self.recv_pts.clear()
+        self._mgmt_bytes = None
+        if self._counters is not None:
+            self._counters.close(); self._counters = None
+        self._drop_process()
+
+    def _session_secs(self):
+        return (time.monotonic_ns() - self._start_ns) // 1_000_000_000 if self._start_ns else 0
 
     def _finalize(self, reason="Disconnected"):
         if self.sess_final or not self.start_time: return
-        dur = int((datetime.datetime.now() - self.start_time).total_seconds())
-        self.total_secs += max(dur, 0)
+        dur = self._session_secs()
         pk_up = max(self.sent_pts) if self.sent_pts else 0.0
         pk_dn = max(self.recv_pts) if self.recv_pts else 0.0
-        self.sessions.insert(0, {
-            "started": self.start_time.strftime("%Y-%m-%d %H:%M"), "duration": dur,
-            "upload":   max(0, (self.last_sent or 0) - (self.ss_sent or 0)),
-            "download": max(0, (self.last_recv or 0) - (self.ss_recv or 0)),
+        rec = {
+            "profile": self._sess_profile, "started": int(self.start_time.timestamp()),
+            "duration": dur, "upload": self._meter.total_sent, "download": self._meter.total_recv,
             "pk_up": pk_up, "pk_dn": pk_dn, "reason": reason,
-        })
-        self.sessions = self.sessions[:20]; self.sess_final = True; self._refresh_stats()
+            "up_sketch": self._sk_up, "dn_sketch": self._sk_dn,
+        }
+        for d, sk in (("up", self._sk_up), ("dn", self._sk_dn)):
+            for q, v in zip((50, 95, 99), sk.quantiles((0.5, 0.95, 0.99))): rec[f"p{q}_{d}"] = v
+        self.sess_final = True
+        self._bytes_done[0] += rec["upload"]; self._bytes_done[1] += rec["download"]
+        self._metrics.inc("openvpn_gui_sessions", profile=rec["profile"], reason=reason)
+        self._metrics.inc("openvpn_gui_session_seconds", dur, profile=rec["profile"])
+        try: self._history.add(rec)
+        except sqlite3.Error as ex: print(f"[history] Could not record session: {ex}")
+        new_profile = rec["profile"] not in self._totals
+        for key in (None, rec["profile"]):
+            self._totals.setdefault(key, RunningTotals()).add(rec)
+        self._hist_model.session_added(rec)
+        if new_profile: self._refresh_stats_profiles()
+        self._refresh_stats()
+
+    def _refresh_stats_profiles(self):
+        cur = self._st_profile.currentData()
+        self._st_profile.blockSignals(True); self._st_profile.clear()
+        self._st_profile.addItem("All profiles", None)
+        for name in sorted(k for k in self._totals if k is not None):
+            self._st_profile.addItem(name or "—", name)
+        self._st_profile.setCurrentIndex(max(0, self._st_profile.findData(cur)))
+        self._st_profile.blockSignals(False)
+
+    def _on_stats_profile(self, _idx):
+        self._hist_model.set_profile(self._st_profile.currentData())
+        self._refresh_stats()
 
     def _refresh_stats(self):
-        n = len(self.sessions)
-        self._st_sess.setText(str(n))
-        h, r = divmod(self.total_secs, 3600); m, _ = divmod(r, 60)
+        tot = self._totals.get(self._st_profile.currentData()) or RunningTotals()
+        self._st_sess.setText(str(tot.sessions))
+        h, r = divmod(tot.seconds, 3600); m, _ = divmod(r, 60)
         self._st_time.setText(f"{h:02d}h {m:02d}m")
-        if n:
-            self._st_pk_up.setText(f"{max(e['pk_up'] for e in self.sessions):.1f} KB/s")
-            self._st_pk_dn.setText(f"{max(e['pk_dn'] for e in self.sessions):.1f} KB/s")
-            lines = []
-            for i, s in enumerate(self.sessions, 1):
-                h2, r2 = divmod(s['duration'], 3600); m2, s2 = divmod(r2, 60)
-                lines.append(
-                    f"[{i:02d}] {s['started']}  {h2:02d}:{m2:02d}:{s2:02d}"
-                    f"  ↑{fmt_bytes(s['upload'])}  ↓{fmt_bytes(s['download'])}"
-                    f"  peak ↑{s['pk_up']:.1f} ↓{s['pk_dn']:.1f}  {s['reason']}"
-                )
-            self._hist_box.setPlainText("\n".join(lines))
+        if tot.sessions:
+            self._st_pk_up.setText(f"{tot.pk_up:.1f} KB/s")
+            self._st_pk_dn.setText(f"{tot.pk_dn:.1f} KB/s")
         else:
             self._st_pk_up.setText("—"); self._st_pk_dn.setText("—")
-            self._hist_box.setPlainText("No sessions yet.")
+        for lbl, sk in ((self._st_p95_up, tot.up_sketch), (self._st_p95_dn, tot.dn_sketch)):
+            if not sk.count:
+                lbl.setText("—"); lbl.setToolTip(""); continue
+            p50, p95, p99 = sk.quantiles((0.5, 0.95, 0.99))
+            lbl.setText(f"{p95:.1f} KB/s")
+            lbl.setToolTip(f"p50 {p50:.1f} · p95 {p95:.1f} · p99 {p99:.1f} KB/s over {sk.count:,} s")
 
     # ── Network helpers ───────────────────────────────────────────────────────
 
+    def _vpn_pids(self):
+        proc = self.vpn_thread.process if self.vpn_thread else None
+        if proc is None:
+            return {self._proc.pid} if self._proc is not None else set()
+        return process_tree(proc.pid)
+
+    def _is_our_tun(self, iface):
+        if self.vpn_thread and self.vpn_thread.vpn_iface == iface:
+            return True
+        return tun_owner(iface, self._vpn_pids()) is not None
+
     def _detect_iface(self):
+        if self._links is not None:
+            for name in self._links.links():
+                if self._is_our_tun(name): return name
+            return None
         try:
             r = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True, check=True)
             m = re.search(r'(tun\d+|tap\d+):', r.stdout)
@@ -1740,47 +2756,240 @@ class OpenVPNConnectGUI(QMainWindow):
         except: pass
         return None
 
+    def _on_link_events(self, *_):
+        for ev in self._links.read_events():
+            if not (self.connected or self.connecting):
+                continue
+            if ev.kind in ("added", "up"):
+                if ev.iface != self.vpn_iface:
+                    if not self._is_our_tun(ev.iface): continue
+                    self.vpn_iface = ev.iface
+                    self._log(f"Tunnel interface {ev.iface} attached")
+                if ev.kind == "up" and self.connected and not self.link_up:
+                    self._set_link_up(True)
+            elif ev.iface == self.vpn_iface and self.connected and self.link_up:
+                self._set_link_up(False)
+
+    def _set_link_up(self, up):
+        self.link_up = up
+        if up:
+            self._dot.set_state("on"); self._big_status.setText("Connected")
+            self._log(f"✓ Tunnel link {self.vpn_iface} up")
+        else:
+            self._dot.set_state("spinning"); self._big_status.setText("Reconnecting…")
+            self._log(f"⚠ Tunnel link {self.vpn_iface} down")
+
     def _iface_bytes(self, iface):
-        try:
-            r = subprocess.run(['ip', '-s', 'link', 'show', iface],
-                                capture_output=True, text=True, check=True)
-            rx = re.search(r'RX:\s+bytes\s+packets.*\n\s*(\d+)', r.stdout)
-            tx = re.search(r'TX:\s+bytes\s+packets.*\n\s*(\d+)', r.stdout)
-            if rx and tx: return int(tx.group(1)), int(rx.group(1))
-        except: pass
-        try:
-            r = subprocess.run(['ifconfig', iface], capture_output=True, text=True, check=True)
-            rx = re.search(r'RX bytes:(\d+)|RX packets \d+\s+bytes (\d+)', r.stdout)
-            tx = re.search(r'TX bytes:(\d+)|TX packets \d+\s+bytes (\d+)', r.stdout)
-            if rx and tx:
-                return int(tx.group(1) or tx.group(2)), int(rx.group(1) or rx.group(2))
-        except: pass
-        return None, None
+        c = self._counters
+        if c is None or c.iface != iface:
+            if c is not None: c.close()
+            c = self._counters = IfaceCounters(iface)
+        return c.read()
 
     def _log(self, msg):
         ts = datetime.datetime.now().strftime("%H:%M:%S")
-        self._log_box.append(f"[{ts}] {msg}")
-        self._log_box.verticalScrollBar().setValue(self._log_box.verticalScrollBar().maximum())
+        line = f"[{ts}] {msg}"
+        self._log_buf.append(line); self._log_pending.append(line)
+        if self._sess_log is not None: self._sess_log.write(msg)
+        if not self._log_flush.isActive(): self._log_flush.start()
+
+    def _flush_log(self):
+        if self._sess_log is not None: self._sess_log.flush()
+        if self._log_pending: self._search.add(self._log_pending)
+        pending, self._log_pending = self._log_pending[-LOG_MAX_LINES:], []
+        if not pending: return
+        if not self._log_live:
+            # A filter on the live session is shown: refresh it instead.
+            if self._log_sess.currentData() is None and not self._search_debounce.isActive():
+                self._search_debounce.start()
+            return
+        sb = self._log_box.verticalScrollBar()
+        # Follow the tail only if the user has not scrolled up to read.
+        at_bottom = sb.value() >= sb.maximum() - 2
+        self._log_box.appendPlainText("\n".join(pending))
+        if at_bottom: sb.setValue(sb.maximum())
+
+    def _clear_log(self):
+        # Only the in-memory view is cleared; the session file is kept.
+        self._log_buf.clear(); self._log_pending = []; self._log_box.clear()
+        if self._log_sess.currentData() is None: self._search.reset()
+
+    # ── Log search ────────────────────────────────────────────────────────────
+
+    def _filtering(self):
+        return bool(self._log_query.text()) or self._log_facet.currentData() is not None
+
+    def _run_search(self):
+        self._search_debounce.stop()
+        sid = self._log_sess.currentData()
+        if not self._filtering():
+            self._log_hits.setText("")
+            if sid is None:
+                self._log_live = True
+                self._show_log_text("\n".join(self._log_buf), follow=True)
+            else:
+                self._on_log_session(self._log_sess.currentIndex())
+            return
+        self._log_live = False
+        self._search_seq += 1
+        self._search.query(self._search_seq, sid, self._log_query.text(),
+                           self._log_regex.isChecked(), self._log_facet.currentData())
+
+    def _on_search_results(self, seq, total, lines):
+        if seq != self._search_seq or not self._filtering(): return
+        shown = f"last {len(lines):,} of " if total > len(lines) else ""
+        self._log_hits.setText(f"{shown}{total:,} match{'es' if total != 1 else ''}")
+        self._show_log_text("\n".join(lines), follow=True)
+
+    def _on_search_failed(self, seq, err):
+        if seq == self._search_seq: self._log_hits.setText(f"Bad regex: {err}")
+
+    def _on_search_indexed(self, sid, count):
+        if sid == self._log_sess.currentData() and self._filtering():
+            self._run_search()
+
+    # ── Session log files ─────────────────────────────────────────────────────
+
+    def _open_session_log(self, profile):
+        self._close_session_log(); self._search.reset()
+        try:
+            self._sess_log = SessionLog(
+                self._log_dir, profile,
+                segment_bytes=LOG_SEGMENT_MB * 1024 * 1024,
+                segment_age=LOG_SEGMENT_HOURS * 3600,
+                gzip_closed=LOG_GZIP_CLOSED, retention_days=LOG_RETENTION_DAYS,
+            )
+        except OSError as ex:
+            print(f"[log] Could not open session log: {ex}")
+            self._sess_log = None
+        self._refresh_log_sessions()
+
+    def _close_session_log(self):
+        if self._sess_log is not None:
+            self._sess_log.close(); self._sess_log = None
+
+    def _refresh_log_sessions(self):
+        self._log_sess.blockSignals(True); self._log_sess.clear()
+        self._log_sess.addItem("Live", None)
+        for sid in list_sessions(self._log_dir):
+            self._log_sess.addItem(sid, sid)
+        self._log_sess.blockSignals(False)
+        # The combo is back on "Live"; redraw in case a stored session was on screen.
+        self._on_log_session(0)
+
+    def _on_log_session(self, idx):
+        sid = self._log_sess.itemData(idx)
+        if sid is None:
+            self._log_from.setEnabled(False)
+            if self._filtering(): self._run_search(); return
+            self._log_live = True; self._flush_log()
+            self._show_log_text("\n".join(self._log_buf), follow=True)
+            return
+        self._log_live = False
+        self._search.load(sid, self._log_dir)
+        if self._filtering():
+            self._log_from.setEnabled(False); self._log_hits.setText("Indexing…")
+            self._run_search(); return
+        try:
+            with SessionReader(self._log_dir, sid) as r:
+                span = r.span()
+                text = r.tail(LOG_MAX_LINES).decode(errors="replace")
+        except OSError as ex:
+            text, span = f"Could not open session log: {ex}", None
+        self._log_from.setEnabled(span is not None)
+        if span:
+            self._log_from.setDateTimeRange(QDateTime.fromSecsSinceEpoch(int(span[0])),
+                                            QDateTime.fromSecsSinceEpoch(int(span[1])))
+            self._log_from.setDateTime(QDateTime.fromSecsSinceEpoch(int(span[0])))
+        self._show_log_text(text, follow=True)
+
+    def _seek_log(self):
+        sid = self._log_sess.currentData()
+        if sid is None: return
+        ts = self._log_from.dateTime().toSecsSinceEpoch()
+        try:
+            with SessionReader(self._log_dir, sid) as r:
+                text = r.lines_from(ts, LOG_MAX_LINES).decode(errors="replace")
+        except OSError as ex:
+            text = f"Could not open session log: {ex}"
+        self._show_log_text(text, follow=False)
+
+    def _show_log_text(self, text, follow):
+        self._log_box.setPlainText(text.rstrip("\n"))
+        sb = self._log_box.verticalScrollBar()
+        sb.setValue(sb.maximum() if follow else 0)
+
+    def _log_lines(self, lines):
+        for line in lines: self._log(line)
+
+    # Stop animating and back off sampling while nobody can see the window.
+    def changeEvent(self, e):
+        if e.type() == QEvent.Type.WindowStateChange:
+            AnimationClock.instance().set_paused(self.isMinimized())
+            self._retune_tick()
+        super().changeEvent(e)
+
+    def showEvent(self, e):
+        super().showEvent(e); self._retune_tick()
+
+    def hideEvent(self, e):
+        super().hideEvent(e); self._retune_tick()
+
+    # ── Single instance ───────────────────────────────────────────────────────
+
+    def attach_instance(self, inst):
+        """Receive the arguments of later launches and come to the front."""
+        self._instance = inst
+        self._instance_sn = QSocketNotifier(inst.fileno(), QSocketNotifier.Type.Read, self)
+        self._instance_sn.activated.connect(self._on_instance_ready)
+
+    def _on_instance_ready(self, *_):
+        argv = self._instance.accept()
+        if argv is None: return
+        print(f"[instance] Activated by a second launch {argv}")
+        if self.isMinimized(): self.showNormal()
+        else: self.show()
+        self.raise_(); self.activateWindow()
+        self.handle_args(argv)
+
+    def handle_args(self, argv):
+        for a in argv:
+            if a.lower().endswith('.ovpn') and os.path.isfile(a):
+                self._import_profile(a)
 
     def closeEvent(self, e):
         if self.connected:
             confirmed = themed_confirm(self, "Exit", "Disconnect and exit?", destructive=True)
             if not confirmed:
                 e.ignore(); return
-            try:
-                args = ['pkill', '-TERM', 'openvpn']
-                kw = dict(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
-                if os.getuid() == 0:              subprocess.Popen(args, **kw)
-                elif shutil.which('pkexec'):      subprocess.Popen(['pkexec'] + args, **kw)
-                elif shutil.which('sudo'):        subprocess.Popen(['sudo']   + args, **kw)
-            except: pass
+            if not self._mgmt_signal(): self._signal_vpn(signal.SIGTERM, wait=False)
+        self._mgmt_close(); self._close_session_log()
+        self._search.stop(); self._search.wait(2000)
+        self._history.close()
+        if self._metrics_srv is not None: self._metrics_srv.stop()
+        if self._helper is not None: self._helper.close()
+        if self._events is not None: self._events.stop()
+        if self._instance is not None:
+            self._instance_sn.setEnabled(False); self._instance.close()
+        if self._rates is not None: self._rates.close()
         self._theme.stop()
+        if self._links is not None:
+            self._links_sn.setEnabled(False); self._links.close()
         e.accept()
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
 def main():
+    # A second launch hands its arguments to the running window and leaves.
+    try:
+        inst = SingleInstance(); owner = inst.acquire()
+    except OSError as ex:
+        print(f"[instance] Single-instance lock unavailable: {ex}"); inst = None; owner = True
+    if not owner:
+        if forward(sys.argv[1:]): sys.exit(0)
+        print("[instance] Another instance holds the lock but is not answering."); sys.exit(1)
+
     app = QApplication(sys.argv)
     app.setOrganizationName(ORGANIZATION_NAME)
     app.setApplicationName(APP_NAME)
@@ -1793,10 +3002,13 @@ def main():
         themed_error(None, "OpenVPN Not Found", "OpenVPN is not installed.", "Install with: sudo apt install openvpn")
         sys.exit(1)
 
-    if os.getuid() != 0:
+    if os.getuid() != 0 and not HelperClient.available():
         themed_warning(None, "Privileges", "Not running as root. Authentication may be required.")
+    import_legacy_data()
 
     w = OpenVPNConnectGUI(); w.show()
+    if inst is not None: w.attach_instance(inst)
+    w.handle_args(sys.argv[1:])
     sys.exit(app.exec())
 
 
@@ -0,0 +1,151 @@
+"""
+metrics.py — optional OpenMetrics endpoint for tunnel telemetry.
+
+The GUI thread only writes numbers into a lock-protected Metrics registry;
+a daemon thread runs the HTTP server and renders the text format on each
+scrape, so a slow or stuck scraper can never stall the UI.
+
+Listen address (config.METRICS_LISTEN):
+    "127.0.0.1:9469"                  TCP, loopback only by convention
+    "unix:/run/user/1000/ovpn.sock"   Unix socket (file mode 0600)
+
+Usage:
+    from metrics import Metrics, MetricsServer
+
+    m = Metrics()
+    m.set("openvpn_gui_tunnel_up", 1, profile="Work")
+    m.inc("openvpn_gui_connect_attempts", profile="Work")
+    srv = MetricsServer(m, "127.0.0.1:9469"); srv.start()
+    ...
+    srv.stop()
+"""
+
+import os
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name: (type, help).  Counter samples are exported with a _total suffix.
+METRICS = {
+    "openvpn_gui_tunnel_up":              ("gauge",   "1 while a tunnel is connected"),
+    "openvpn_gui_session_duration_seconds": ("gauge", "Age of the current session"),
+    "openvpn_gui_rate_bytes_per_second":  ("gauge",   "Smoothed tunnel throughput"),
+    "openvpn_gui_session_bytes":          ("gauge",   "Bytes moved in the current session"),
+    "openvpn_gui_bytes":                  ("counter", "Bytes moved through the tunnel since start"),
+    "openvpn_gui_connect_attempts":       ("counter", "Connection attempts"),
+    "openvpn_gui_connect_failures":       ("counter", "Failed connection attempts by category"),
+    "openvpn_gui_sessions":               ("counter", "Finished sessions by end reason"),
+    "openvpn_gui_session_seconds":        ("counter", "Connected time of finished sessions"),
+}
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metrics:
+    """Thread-safe registry of labelled samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple, float]] = {name: {} for name in METRICS}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._values[name][self._key(labels)] = value
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + amount
+
+    def clear(self, name: str) -> None:
+        with self._lock:
+            self._values[name].clear()
+
+    def render(self) -> bytes:
+        with self._lock:
+            snapshot = {name: dict(series) for name, series in self._values.items()}
+        out = []
+        for name, (kind, help_) in METRICS.items():
+            out.append(f"# TYPE {name} {kind}\n# HELP {name} {help_}\n")
+            sample = name + "_total" if kind == "counter" else name
+            for key, value in snapshot[name].items():
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+                out.append(f"{sample}{{{labels}}} {value}\n" if labels else f"{sample} {value}\n")
+        out.append("# EOF\n")
+        return "".join(out).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404); return
+        body = self.server.metrics.render()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return "unix" if isinstance(self.client_address, (str, bytes)) else super().address_string()
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+class _TCPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+        old = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old)
+        self.server_name, self.server_port = "localhost", 0
+
+
+class MetricsServer:
+    """Serves a Metrics registry over HTTP from a daemon thread."""
+
+    def __init__(self, metrics: Metrics, listen: str):
+        self.listen = listen
+        if listen.startswith("unix:"):
+            self._path = listen[5:]
+            self._srv = _UnixServer(self._path, _Handler)
+        else:
+            self._path = None
+            host, _, port = listen.rpartition(":")
+            self._srv = _TCPServer((host or "127.0.0.1", int(port)), _Handler)
+        self._srv.metrics = metrics
+        self._thread = threading.Thread(target=self._srv.serve_forever, name="metrics", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._srv.shutdown(); self._srv.server_close()
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
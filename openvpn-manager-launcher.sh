@@ -75,6 +75,12 @@ if [ "$EUID" -eq 0 ]; then
     exit 1
 fi
 
+# Hand off to an already running instance (no re-authentication, no Qt startup)
+if python3 -c 'import sys; sys.path.insert(0, "/usr/lib/python3/dist-packages"); import instance; sys.exit(0 if instance.forward(sys.argv[1:]) else 1)' "$@" 2>/dev/null; then
+    echo "OpenVPN Manager is already running; brought it to the front."
+    exit 0
+fi
+
 # Run dependency check first
 check_dependencies
 
@@ -131,6 +137,14 @@ authenticate_and_run() {
     fi
 }
 
+# With the privileged helper installed the GUI stays unprivileged: the helper
+# starts and stops openvpn after one polkit check per session.
+if [ -S /run/openvpn-manager/helper.sock ]; then
+    echo "Starting OpenVPN Manager (privileged helper available)..."
+    export PYTHONPATH="/usr/lib/python3/dist-packages:$PYTHONPATH"
+    exec python3 -c "import main; main.main()" "$@"
+fi
+
 # Launch application with elevated privileges from the start
 echo "Starting OpenVPN Manager with elevated privileges..."
 authenticate_and_run "$@"
@@ -0,0 +1,100 @@
+"""
+process.py — pidfd process handle and display formatting.
+
+Split out of tunnel.py so `openvpn-manager status` and `disconnect` can
+use them without paying for tunnel.py's socket/tempfile imports and its
+compiled log regexes.  Standard library only (os, select, signal);
+tunnel.py re-exports everything here.
+
+Usage:
+    from process import ProcessHandle, fmt_bytes, fmt_dur
+
+    h = ProcessHandle(pid)            # register h.fileno() for exit
+    if h.alive(): h.send_signal(signal.SIGTERM)
+    h.close()
+    print(fmt_bytes(123456), fmt_dur(3725))    # "120.6 KB 01:02:05"
+"""
+
+import os
+import select
+import signal
+
+
+# ── pidfd process handle ──────────────────────────────────────────────────────
+
+class ProcessHandle:
+    """
+    Handle on one process, backed by a pidfd when the kernel supports it.
+
+    The pidfd becomes readable when the process exits, so ``fileno()`` can be
+    handed to an event loop for zero-polling exit detection.  Signals go
+    through ``pidfd_send_signal`` and can never hit a recycled pid.  Without
+    pidfd support (kernel < 5.3) ``fileno()`` returns -1 and ``alive()``
+    falls back to ``kill(pid, 0)``.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._fd: int | None = None
+        self._exited = False
+        try:
+            self._fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            self._exited = True
+        except (AttributeError, OSError):
+            self._fd = None
+
+    def fileno(self) -> int:
+        return self._fd if self._fd is not None else -1
+
+    def alive(self) -> bool:
+        if self._exited:
+            return False
+        if self._fd is not None:
+            readable, _, _ = select.select([self._fd], [], [], 0)
+            self._exited = bool(readable)
+        else:
+            try:
+                os.kill(self.pid, 0)
+            except ProcessLookupError:
+                self._exited = True
+            except PermissionError:
+                pass
+        return not self._exited
+
+    def send_signal(self, sig: int) -> None:
+        """Signal the process; raises PermissionError if we may not."""
+        if not self.alive():
+            return
+        if self._fd is not None:
+            signal.pidfd_send_signal(self._fd, sig)
+        else:
+            os.kill(self.pid, sig)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+            self._exited = True
+
+    def __del__(self):
+        self.close()
+
+
+# ── Formatting ────────────────────────────────────────────────────────────────
+
+def fmt_bytes(b):
+    if b is None: return "—"
+    if b < 1024:    return f"{b} B"
+    if b < 1024**2: return f"{b/1024:.1f} KB"
+    if b < 1024**3: return f"{b/1024**2:.2f} MB"
+    return f"{b/1024**3:.2f} GB"
+
+
+def fmt_dur(secs):
+    h, r = divmod(max(int(secs), 0), 3600)
+    m, s = divmod(r, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
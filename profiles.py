@@ -0,0 +1,45 @@
+"""
+profiles.py — saved VPN profiles (~/.openvpn_gui/configs.json).
+
+Shared by the GUI and the command-line entry point, so no Qt here.
+
+Usage:
+    from profiles import ConfigManager, VPNConfig
+
+    cm = ConfigManager()
+    cm.add(VPNConfig("Work", "/home/me/work.ovpn"))
+    print(sorted(cm.configs), cm.get("Work").config_path)
+"""
+
+import json
+from pathlib import Path
+
+
+class VPNConfig:
+    def __init__(self, name, config_path, username="", password=""):
+        self.name = name; self.config_path = config_path
+        self.username = username; self.password = password
+
+
+class ConfigManager:
+    def __init__(self, directory=None):
+        d = Path(directory) if directory else Path.home() / '.openvpn_gui'; d.mkdir(exist_ok=True)
+        self._f = d / 'configs.json'
+        self.configs: dict[str, VPNConfig] = self._load()
+
+    def _load(self):
+        if self._f.exists():
+            try:
+                with open(self._f) as f:
+                    return {k: VPNConfig(**v) for k, v in json.load(f).items()}
+            except: pass
+        return {}
+
+    def save(self):
+        with open(self._f, 'w') as f:
+            json.dump({k: v.__dict__ for k, v in self.configs.items()}, f, indent=2)
+
+    def add(self, c): self.configs[c.name] = c; self.save()
+    def remove(self, n):
+        if n in self.configs: del self.configs[n]; self.save()
+    def get(self, n): return self.configs.get(n)
@@ -42,12 +42,13 @@ setup(
     author="Iágson Carlos Lima Silva",
     author_email="iagsoncarlos@gmail.com",
     url="https://github.com/iagsoncarlos/openvpn-manager",
-    py_modules=["main", "config", "theme"],  # Just list them, don't import
+    py_modules=["main", "config", "theme", "tunnel", "process", "logstore", "logsearch", "history", "timeseries", "sketch", "metrics", "helper", "profiles", "cli", "events", "instance"],  # Just list them, don't import
     packages=[],  # No packages, just modules
     install_requires=[],  # No external dependencies for .deb build
     entry_points={
         "console_scripts": [
-            "openvpn-manager=main:main",
+            "openvpn-manager=cli:main",
+            "openvpn-manager-helper=helper:main",
         ],
     },
     data_files=data_files,
@@ -0,0 +1,96 @@
+"""
+sketch.py — DDSketch, a mergeable streaming quantile sketch.
+
+Values are counted in logarithmic buckets whose width is chosen so every
+quantile comes back within <relative_accuracy> of the true value.  Two
+sketches with the same accuracy merge by adding bucket counts, so
+per-session sketches roll up into per-profile and all-time ones exactly.
+Memory is bounded by <max_bins>: when exceeded the lowest buckets are
+collapsed, which only affects the smallest quantiles.
+
+At 1 % accuracy, rates from 1 B/s to 10 GB/s fit in ~1200 buckets.
+
+No Qt here.
+
+Usage:
+    from sketch import DDSketch
+
+    s = DDSketch()
+    for rate in samples: s.add(rate)
+    p50, p95, p99 = s.quantiles((0.5, 0.95, 0.99))
+    blob = s.to_bytes(); s2 = DDSketch.from_bytes(blob); s2.merge(s)
+"""
+
+import math
+import struct
+
+
+_HDR = struct.Struct("<dQQI")    # relative accuracy, count, zero count, bins
+_BIN = struct.Struct("<iQ")      # bucket index, count
+
+
+class DDSketch:
+    MIN_VALUE = 1e-9             # anything smaller counts as zero
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, n: int = 1) -> None:
+        self.count += n
+        if value <= self.MIN_VALUE:
+            self.zero_count += n; return
+        i = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[i] = self.bins.get(i, 0) + n
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for i, n in other.bins.items():
+            self.bins[i] = self.bins.get(i, 0) + n
+        self.zero_count += other.zero_count; self.count += other.count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.bins)
+        extra = len(keys) - self.max_bins
+        into = keys[extra]
+        for k in keys[:extra]:
+            self.bins[into] += self.bins.pop(k)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for i in sorted(self.bins):
+            seen += self.bins[i]
+            if seen > rank:
+                return 2 * self._gamma ** i / (1 + self._gamma)
+        return 2 * self._gamma ** max(self.bins) / (1 + self._gamma)
+
+    def quantiles(self, qs) -> list[float]:
+        return [self.quantile(q) for q in qs]
+
+    def to_bytes(self) -> bytes:
+        out = [_HDR.pack(self.relative_accuracy, self.count, self.zero_count, len(self.bins))]
+        out += [_BIN.pack(i, n) for i, n in sorted(self.bins.items())]
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = 2048) -> "DDSketch":
+        acc, count, zeros, nbins = _HDR.unpack_from(data, 0)
+        s = cls(acc, max_bins)
+        s.count, s.zero_count = count, zeros
+        s.bins = dict(_BIN.iter_unpack(data[_HDR.size:_HDR.size + nbins * _BIN.size]))
+        return s
@@ -0,0 +1,53 @@
+"""
+fake_mgmt.py — stands in for openvpn on the management interface.
+
+With `--management-client` openvpn dials the GUI's socket, so the fake
+does the same: it connects to ManagementClient.path, records every
+command line the client sends and pushes whatever notification lines a
+test hands it, split into arbitrary chunks if asked.
+
+Usage:
+    fake = FakeOpenVPN(client.path)
+    client.accept()
+    fake.push(">STATE:1700000000,CONNECTED,SUCCESS,10.8.0.2,1.2.3.4\r\n")
+    assert fake.commands() == ["state on", "bytecount 1", "log on"]
+    fake.close()
+"""
+
+import socket
+
+
+class FakeOpenVPN:
+    def __init__(self, path: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.sock.settimeout(1.0)
+        self._buf = b""
+        self._seen: list[str] = []
+
+    def push(self, data, chunk: int | None = None) -> None:
+        """Send <data>; with <chunk>, in pieces of that many bytes."""
+        data = data.encode() if isinstance(data, str) else data
+        step = chunk or len(data) or 1
+        for i in range(0, len(data), step):
+            self.sock.sendall(data[i:i + step])
+
+    def commands(self) -> list[str]:
+        """Every complete command line received so far."""
+        self.sock.setblocking(False)
+        try:
+            while True:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                self._buf += data
+        except BlockingIOError:
+            pass
+        finally:
+            self.sock.settimeout(1.0)
+        *lines, self._buf = self._buf.split(b"\n")
+        self._seen += [l.decode() for l in lines]
+        return list(self._seen)
+
+    def close(self) -> None:
+        self.sock.close()
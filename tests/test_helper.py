@@ -0,0 +1,121 @@
+"""Tests for the privileged helper, driving HelperServer with a stub openvpn."""
+
+import os
+import stat
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+import helper  # noqa: E402
+from helper import HelperClient, HelperError, HelperServer  # noqa: E402
+
+STUB = """#!/bin/sh
+echo "stub openvpn $*"
+cat "$2"
+exec sleep 30
+"""
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"; bin_dir.mkdir()
+    stub = bin_dir / "openvpn"
+    stub.write_text(STUB); stub.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    # Tests run as any user; polkit is only consulted through _authorize.
+    monkeypatch.setattr(helper, "_authorize", lambda pid, uid: True)
+    srv = HelperServer(str(tmp_path / "helper.sock"), legacy_dir=str(tmp_path / "legacy"))
+    t = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    t.start()
+    yield srv
+    srv.shutdown(); srv.server_close()
+    for c in list(srv._children.values()):
+        if c.proc.poll() is None:
+            c.proc.kill(); c.proc.wait()
+
+
+@pytest.fixture
+def profile(tmp_path):
+    p = tmp_path / "work.ovpn"
+    p.write_text("remote vpn.example.com 1194\n")
+    return str(p)
+
+
+def _read_until(fd, text, timeout=5.0):
+    out, deadline = b"", time.monotonic() + timeout
+    while text.encode() not in out and time.monotonic() < deadline:
+        out += os.read(fd, 4096)
+    return out.decode()
+
+
+def test_start_and_stop_need_auth(server, profile):
+    client = HelperClient(server.server_address)
+    assert not client.authorized
+    with pytest.raises(HelperError, match="not authorized"):
+        client.start(profile)
+    with pytest.raises(HelperError, match="not authorized"):
+        client.stop(1)
+    assert server._children == {}
+    client.close()
+
+
+def test_stdout_arrives_over_scm_rights(server, profile):
+    client = HelperClient(server.server_address); client.authorize()
+    pid, fd = client.start(profile)
+    try:
+        assert stat.S_ISFIFO(os.fstat(fd).st_mode)
+        out = _read_until(fd, "remote vpn.example.com")
+        assert "stub openvpn --config /dev/fd/" in out
+        assert "remote vpn.example.com 1194" in out     # read through the passed config fd
+        (st,) = client.status(pid)
+        assert st["config"] == profile and st["rc"] is None
+        client.stop(pid)
+        assert server._children[pid].proc.wait(5) == -15
+    finally:
+        os.close(fd); client.close()
+
+
+def test_other_uid_cannot_stop(server, profile, monkeypatch):
+    owner = HelperClient(server.server_address); owner.authorize()
+    pid, fd = owner.start(profile)
+    me = os.getuid()
+    monkeypatch.setattr(helper, "_peer", lambda sock: (os.getpid(), me + 1000, me + 1000))
+    other = HelperClient(server.server_address); other.authorize()
+    try:
+        with pytest.raises(HelperError, match="no such process"):
+            other.stop(pid)
+        assert other.status() == []
+        assert server._children[pid].proc.poll() is None
+    finally:
+        os.close(fd); owner.close(); other.close()
+
+
+def test_non_regular_files_rejected(server, tmp_path):
+    client = HelperClient(server.server_address); client.authorize()
+    for path in ("/dev/null", str(tmp_path)):
+        with pytest.raises(HelperError, match="not a regular file"):
+            client.start(path)
+    assert server._children == {}
+    client.close()
+
+
+def test_unreadable_profile_refused_client_side(server, tmp_path):
+    client = HelperClient(server.server_address); client.authorize()
+    with pytest.raises(HelperError, match="config: No such file"):
+        client.start(str(tmp_path / "missing.ovpn"))
+    client.close()
+
+
+def test_status_forgets_reported_exits(server, profile):
+    client = HelperClient(server.server_address); client.authorize()
+    pid, fd = client.start(profile)
+    os.close(fd)
+    client.stop(pid, helper.signal.SIGKILL)
+    server._children[pid].proc.wait(5)
+    assert [p["rc"] for p in client.status()] == [-9]
+    assert client.status() == []
+    client.close()
@@ -0,0 +1,95 @@
+"""Tests for ManagementClient against a fake openvpn management peer."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest  # noqa: E402
+
+from fake_mgmt import FakeOpenVPN  # noqa: E402
+from tunnel import ManagementClient, MgmtEvent, parse_mgmt_line  # noqa: E402
+
+
+@pytest.fixture
+def attached():
+    client = ManagementClient.listen()
+    fake = FakeOpenVPN(client.path)
+    assert client.accept()
+    yield client, fake
+    fake.close(); client.close()
+
+
+def test_parse_notifications():
+    st = parse_mgmt_line(">STATE:1700000000,CONNECTED,SUCCESS,10.8.0.2,203.0.113.5,1194,,,")
+    assert st.kind == "state" and st.fields[1] == "CONNECTED" and st.fields[3] == "10.8.0.2"
+    assert parse_mgmt_line(">BYTECOUNT:1024,2048") == MgmtEvent("bytecount", ["1024", "2048"])
+    log = parse_mgmt_line(">LOG:1700000000,W,TLS Error: a, b, c")
+    assert log.fields == ["1700000000", "W", "TLS Error: a, b, c"]
+    assert parse_mgmt_line("SUCCESS: real-time state notification set to ON").kind == "success"
+    assert parse_mgmt_line("ERROR: unknown command") == MgmtEvent("error", ["unknown command"])
+    assert parse_mgmt_line("END") is None
+
+
+def test_accept_subscribes(attached):
+    client, fake = attached
+    assert client.attached
+    assert fake.commands() == ["state on", "bytecount 1", "log on"]
+    assert client.signal("SIGTERM")
+    assert fake.commands()[-1] == "signal SIGTERM"
+
+
+def test_partial_lines_are_buffered(attached):
+    client, fake = attached
+    fake.push(">BYTECOUNT:12")
+    assert client.read_events() == []
+    fake.push("34,56\r\n>STATE:1700000000,CONNEC")
+    assert client.read_events() == [MgmtEvent("bytecount", ["1234", "56"])]
+    fake.push("TED,SUCCESS,10.8.0.2,203.0.113.5\r\n")
+    (ev,) = client.read_events()
+    assert ev.kind == "state" and ev.fields[1] == "CONNECTED"
+
+
+def test_byte_at_a_time(attached):
+    client, fake = attached
+    fake.push(">LOG:1700000000,I,Initialization Sequence Completed\r\n>BYTECOUNT:1,2\r\n", chunk=1)
+    kinds = [ev.kind for ev in client.read_events()]
+    assert kinds == ["log", "bytecount"]
+
+
+def test_hold_is_released(attached):
+    client, fake = attached
+    fake.push(">HOLD:Waiting for hold release:0\r\n")
+    assert [ev.kind for ev in client.read_events()] == ["hold"]
+    assert fake.commands()[-1] == "hold release"
+
+
+def test_eof_detaches_then_next_session_attaches(attached):
+    client, fake = attached
+    fake.push(">STATE:1700000000,EXITING,SIGTERM,,\r\n")
+    fake.close()
+    events = client.read_events()
+    assert [ev.fields[1] for ev in events] == ["EXITING"]
+    assert not client.attached and client.fileno() == -1
+    assert not client.send("state on")
+
+    # The GUI reconnects with a fresh client for the next openvpn run.
+    again = ManagementClient.listen()
+    try:
+        fake2 = FakeOpenVPN(again.path)
+        assert again.accept()
+        fake2.push(">BYTECOUNT:5,6\r\n")
+        assert again.read_events() == [MgmtEvent("bytecount", ["5", "6"])]
+        fake2.close()
+    finally:
+        again.close()
+
+
+def test_close_removes_socket_directory():
+    client = ManagementClient.listen()
+    directory = os.path.dirname(client.path)
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+    assert not client.accept()          # nobody dialled yet
+    client.close()
+    assert not os.path.exists(directory)
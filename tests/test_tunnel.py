@@ -0,0 +1,37 @@
+"""Tests for the Qt-free counter sampling in tunnel.py."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tunnel import RateMeter  # noqa: E402
+
+SEC = 1_000_000_000
+
+
+def test_rate_uses_real_interval():
+    m = RateMeter()
+    assert m.sample(0, 0, t_ns=0) is None
+    up, down = m.sample(3000, 6000, t_ns=SEC // 2)
+    assert (up, down) == (6000.0, 12000.0)
+    assert (m.total_sent, m.total_recv) == (3000, 6000)
+
+
+def test_reset_after_more_than_2gib_is_not_a_wrap():
+    m = RateMeter()
+    m.sample(0, 0, t_ns=0)
+    m.sample(3_200_000_000, 3_200_000_000, t_ns=SEC)
+    up, down = m.sample(1000, 2000, t_ns=2 * SEC)
+    assert (up, down) == (1000.0, 2000.0)
+    assert m.total_sent == 3_200_001_000
+    assert m.total_recv == 3_200_002_000
+    assert m.resets == 1
+
+
+def test_reset_below_4gib_counter_range():
+    m = RateMeter()
+    m.sample(4_000_000_000, 10, t_ns=0)
+    up, _ = m.sample(0, 20, t_ns=SEC)
+    assert up == 0.0
+    assert m.total_sent == 0
@@ -26,6 +26,8 @@ import re
 import os
 import json
 import pwd
+import select
+import time
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 
 
@@ -202,55 +204,44 @@ def _build_gsettings_cmd(args: list[str], env: dict) -> list[str]:
     return cmd
 
 
-def _gsettings_get(schema: str, key: str) -> str | None:
-    """Run `gsettings get <schema> <key>` and return the stripped value."""
+INTERFACE_SCHEMA = "org.gnome.desktop.interface"
+
+
+def _unquote(value: str) -> str:
+    """Strip the GVariant quoting gsettings prints around string values."""
+    return value.strip().strip("'\"")
+
+
+def _gsettings_read(schema: str = INTERFACE_SCHEMA) -> dict[str, str] | None:
+    """
+    Read every key of <schema> with one `gsettings list-recursively` call.
+    Unlike `dconf dump`, this includes keys still at their default value.
+    Returns {key: value}, or None when gsettings is unusable.
+    """
     if not shutil.which("gsettings"):
         print(f"[theme] WARNING: gsettings command not found")
         return None
-    
     try:
         env = _get_user_env()
-        cmd = _build_gsettings_cmd(["get", schema, key], env)
-        
-        r = subprocess.run(
-            cmd,
-            capture_output=True, text=True, timeout=3, env=env
-        )
-        if r.returncode == 0:
-            value = r.stdout.strip().strip("'\"")
-            if value:
-                print(f"[theme] ✓ {schema}/{key} = {value}")
-                return value
-            else:
-                print(f"[theme] WARNING: {schema}/{key} returned empty value")
-                return None
-        else:
+        cmd = _build_gsettings_cmd(["list-recursively", schema], env)
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=3, env=env)
+        if r.returncode != 0:
             error_msg = r.stderr.strip() if r.stderr else "unknown error"
-            print(f"[theme] WARNING: gsettings {schema}/{key} failed: {error_msg}")
+            print(f"[theme] WARNING: gsettings {schema} failed: {error_msg}")
+            return None
     except subprocess.TimeoutExpired:
-        print(f"[theme] WARNING: gsettings {schema}/{key} timed out")
+        print(f"[theme] WARNING: gsettings {schema} timed out")
+        return None
     except Exception as e:
-        print(f"[theme] WARNING: gsettings {schema}/{key} exception: {e}")
-    return None
-
-
-def _key_exists(schema: str, key: str) -> bool:
-    """Return True if <key> exists in <schema>."""
-    if not shutil.which("gsettings"):
-        return False
-    try:
-        env = _get_user_env()
-        cmd = _build_gsettings_cmd(["list-keys", schema], env)
-        r = subprocess.run(
-            cmd,
-            capture_output=True, text=True, timeout=3, env=env
-        )
-        exists = key in r.stdout.split()
-        if exists:
-            print(f"[theme] ✓ Key exists: {schema}/{key}")
-        return exists
-    except Exception:
-        return False
+        print(f"[theme] WARNING: gsettings {schema} exception: {e}")
+        return None
+    settings = {}
+    for line in r.stdout.splitlines():
+        # Output format: "<schema> <key> <value>"
+        parts = line.split(None, 2)
+        if len(parts) == 3 and parts[0] == schema:
+            settings[parts[1]] = _unquote(parts[2])
+    return settings
 
 
 # ── Theme readers ─────────────────────────────────────────────────────────────
@@ -287,10 +278,13 @@ def _parse_yaru_theme(gtk_theme: str) -> tuple[str, bool]:
     return hex_color, is_dark
 
 
-def _read_theme() -> tuple[str, bool]:
+def _read_theme(settings: dict[str, str] | None = None) -> tuple[str, bool]:
     """
     Returns (accent_hex, is_dark) by reading the best available source.
 
+    <settings> is the org.gnome.desktop.interface key/value map; when it is
+    None it is read with a single gsettings call.
+
     Both user and sudo use the same unified approach:
     1. Try org.gnome.desktop.interface accent-color  (GNOME 47+)
     2. Try org.gnome.desktop.interface gtk-theme     (Yaru name parsing)
@@ -302,31 +296,30 @@ def _read_theme() -> tuple[str, bool]:
     a reliable fallback when D-Bus is unavailable (common in sudo).
     """
     print("[theme] Reading Ubuntu/GNOME theme settings...")
-    
+    if settings is None:
+        settings = _gsettings_read() or {}
+    scheme = settings.get("color-scheme") or "default"
+
     # ── 1. GNOME 47+ accent-color key ────────────────────────────────────────
-    if _key_exists("org.gnome.desktop.interface", "accent-color"):
-        accent_name = _gsettings_get("org.gnome.desktop.interface", "accent-color") or ""
-        if accent_name in YARU_ACCENT_MAP:
-            hex_color = YARU_ACCENT_MAP[accent_name]
-            # dark/light still comes from color-scheme on GNOME 47+
-            scheme = _gsettings_get("org.gnome.desktop.interface", "color-scheme") or "default"
-            is_dark = "dark" in scheme.lower()
-            print(f"[theme] ✓ Using GNOME 47+ accent-color: {accent_name} ({hex_color}), dark={is_dark}")
-            return hex_color, is_dark
+    accent_name = settings.get("accent-color", "")
+    if accent_name in YARU_ACCENT_MAP:
+        hex_color = YARU_ACCENT_MAP[accent_name]
+        # dark/light still comes from color-scheme on GNOME 47+
+        is_dark = "dark" in scheme.lower()
+        print(f"[theme] ✓ Using GNOME 47+ accent-color: {accent_name} ({hex_color}), dark={is_dark}")
+        return hex_color, is_dark
 
     # ── 2. Yaru theme name (Ubuntu 24.04 / GNOME 46) ─────────────────────────
-    gtk_theme = _gsettings_get("org.gnome.desktop.interface", "gtk-theme") or ""
+    gtk_theme = settings.get("gtk-theme", "")
     if gtk_theme.lower().startswith("yaru"):
         accent_hex, is_dark = _parse_yaru_theme(gtk_theme)
         # Also honour color-scheme = 'prefer-dark' even if theme name lacks -dark
-        scheme = _gsettings_get("org.gnome.desktop.interface", "color-scheme") or "default"
         if "dark" in scheme.lower():
             is_dark = True
         print(f"[theme] ✓ Using Yaru theme: {gtk_theme} ({accent_hex}), dark={is_dark}")
         return accent_hex, is_dark
 
     # ── 3. Non-Yaru theme — at least try to get dark/light from color-scheme ──
-    scheme = _gsettings_get("org.gnome.desktop.interface", "color-scheme") or "default"
     is_dark = "dark" in scheme.lower()
     # Also check if the theme name itself contains "dark"
     if gtk_theme and "dark" in gtk_theme.lower():
@@ -479,10 +472,14 @@ class Colors:
 
 class _GSettingsWatcher(QThread):
     """
-    Runs `gsettings monitor org.gnome.desktop.interface` and emits
-    `changed` whenever a theme-relevant key changes.
+    Reads org.gnome.desktop.interface once, then follows `gsettings monitor`
+    and applies the values it prints to that snapshot, so a change costs no
+    further subprocesses.  A burst of changes (switching the Ubuntu
+    appearance touches several keys) is debounced into one resolve.  All
+    gsettings work happens on this thread; results arrive through
+    `resolved(accent_hex, is_dark)`.
     """
-    changed = pyqtSignal()
+    resolved = pyqtSignal(str, bool)   # accent_hex, is_dark
 
     WATCHED_KEYS = {
         "accent-color",
@@ -490,31 +487,53 @@ class _GSettingsWatcher(QThread):
         "gtk-theme",
         "gtk-color-scheme",
     }
+    DEBOUNCE_S = 0.15      # quiet time after the last change before resolving
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._proc = None
+        self._settings: dict[str, str] | None = None
         self.daemon = True
 
+    def _resolve(self):
+        accent_hex, is_dark = _read_theme(self._settings or {})
+        self.resolved.emit(accent_hex, is_dark)
+
     def run(self):
         if not shutil.which("gsettings"):
-            return
+            self._resolve(); return
         try:
             env = _get_user_env()
-            cmd = _build_gsettings_cmd(["monitor", "org.gnome.desktop.interface"], env)
+            cmd = _build_gsettings_cmd(["monitor", INTERFACE_SCHEMA], env)
+            # Monitor first so a change made during the initial read is not lost.
             self._proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-                text=True, bufsize=1, env=env,
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
             )
-            for line in iter(self._proc.stdout.readline, ""):
-                line = line.strip()
-                if not line:
+            self._settings = _gsettings_read()
+            self._resolve()
+            fd = self._proc.stdout.fileno()
+            buf, pending = b"", None
+            while True:
+                timeout = None if pending is None else max(0.0, pending - time.monotonic())
+                if not select.select([fd], [], [], timeout)[0]:
+                    print("[theme] gsettings changed, reloading theme...")
+                    if self._settings is None:      # first read failed; try again
+                        self._settings = _gsettings_read()
+                    self._resolve(); pending = None
                     continue
-                # Output format: "key: value"
-                key = line.split(":", 1)[0].strip()
-                if key in self.WATCHED_KEYS:
-                    self.changed.emit()
+                data = os.read(fd, 4096)
+                if not data:
+                    break
+                *lines, buf = (buf + data).split(b"\n")
+                for line in lines:
+                    # Output format: "key: value"
+                    key, _, value = line.decode(errors="replace").partition(":")
+                    key = key.strip()
+                    if key not in self.WATCHED_KEYS:
+                        continue
+                    if self._settings is not None:
+                        self._settings[key] = _unquote(value)
+                    pending = time.monotonic() + self.DEBOUNCE_S
         except Exception:
             pass
 
@@ -531,9 +550,10 @@ class _GSettingsWatcher(QThread):
 
 class ThemeManager(QObject):
     """
-    Reads the current Ubuntu/GNOME theme on startup, then watches gsettings
-    for live changes.  Emits `theme_changed(accent_hex, is_dark)` on every
-    update so the UI can rebuild its stylesheets.
+    Paints from the cached theme at once, then reads the live Ubuntu/GNOME
+    theme in the background and keeps watching gsettings.  Emits
+    `theme_changed(accent_hex, is_dark)` only when the resolved theme differs
+    from what is on screen, so the UI rebuilds its stylesheets only then.
     """
     theme_changed = pyqtSignal(str, bool)   # accent_hex, is_dark
 
@@ -541,20 +561,18 @@ class ThemeManager(QObject):
         super().__init__(parent)
         print("[theme] ThemeManager initializing...")
         self._watcher: _GSettingsWatcher | None = None
-        self._reload()
-        print(f"[theme] Loaded: ORANGE={Colors.ORANGE}, IS_DARK={Colors.IS_DARK}")
-
-    def _reload(self):
-        accent_hex, is_dark = _read_theme()
-        Colors.rebuild(accent_hex, is_dark)
-        # Save to cache for fallback when running with sudo
-        _save_theme_cache(accent_hex, is_dark)
+        # No gsettings here: a slow D-Bus must not delay the first paint.
+        self._cached = _load_theme_cache()
+        self._current = self._cached or (UBUNTU_ORANGE, True)
+        Colors.rebuild(*self._current)
+        print(f"[theme] Loaded {'cached' if self._cached else 'default'} theme: "
+              f"ORANGE={Colors.ORANGE}, IS_DARK={Colors.IS_DARK}")
 
     def start(self):
         """Start background watcher.  Call after QApplication is created."""
         print("[theme] Starting gsettings monitor...")
         self._watcher = _GSettingsWatcher(self)
-        self._watcher.changed.connect(self._on_changed)
+        self._watcher.resolved.connect(self._on_resolved)
         self._watcher.start()
 
     def stop(self):
@@ -562,12 +580,16 @@ class ThemeManager(QObject):
             self._watcher.stop()
             self._watcher.wait(3000)
 
-    def _on_changed(self):
-        print("[theme] gsettings changed, reloading theme...")
-        accent_hex, is_dark = _read_theme()
+    def _on_resolved(self, accent_hex: str, is_dark: bool):
+        theme = (accent_hex, is_dark)
+        # The cache is the fallback when running with sudo; rewrite it only on change.
+        if theme != self._cached:
+            _save_theme_cache(accent_hex, is_dark); self._cached = theme
+        if theme == self._current:
+            print("[theme] Live theme matches what is on screen")
+            return
+        self._current = theme
         Colors.rebuild(accent_hex, is_dark)
-        # Save to cache for fallback when running with sudo
-        _save_theme_cache(accent_hex, is_dark)
         print(f"[theme] Updated: ORANGE={Colors.ORANGE}, IS_DARK={Colors.IS_DARK}")
         self.theme_changed.emit(Colors.ORANGE, is_dark)
 
@@ -0,0 +1,141 @@
+"""
+timeseries.py — fixed-size, memory-mapped store of up/down throughput.
+
+RRD-style tiers, each a ring of consolidated rows:
+
+    1 s  × 3600    last hour
+    1 min × 10080  last week
+    1 h  × 8760    last year
+
+Every sample updates one row per tier in place (min, max, sum, count for
+both directions), so recording is O(1) and the file never grows past the
+~1.3 MB allocated when it is created.  A row remembers which time slot it
+holds; a stale row is simply overwritten when its slot comes round again.
+
+No Qt here.
+
+Usage:
+    from timeseries import RateSeries
+
+    rs = RateSeries(path)
+    rs.add(time.time(), up_kbps, down_kbps)
+    for p in rs.fetch(time.time() - 86400, time.time()):
+        print(p.t, p.up_avg, p.dn_max)
+    rs.close()
+"""
+
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+
+TIERS = ((1, 3600), (60, 7 * 24 * 60), (3600, 365 * 24))   # (step seconds, rows)
+
+_MAGIC = b"OVRS"
+_HDR = struct.Struct("<4sHH")           # magic, version, tier count
+_TIER_HDR = struct.Struct("<II")        # step, rows
+# slot, samples, up min/max/sum, down min/max/sum
+_ROW = struct.Struct("<qI6d")
+
+Point = namedtuple("Point", "t step up_min up_avg up_max dn_min dn_avg dn_max")
+
+
+class RateSeries:
+    VERSION = 1
+
+    def __init__(self, path, tiers=TIERS):
+        self.path = str(path)
+        self.tiers = tuple(tiers)
+        header = _HDR.pack(_MAGIC, self.VERSION, len(self.tiers)) + b"".join(
+            _TIER_HDR.pack(step, rows) for step, rows in self.tiers)
+        self._bases = []
+        off = len(header)
+        for _, rows in self.tiers:
+            self._bases.append(off); off += rows * _ROW.size
+        size = off
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            cur = os.pread(fd, len(header), 0)
+            if cur != header or os.fstat(fd).st_size != size:
+                # New file or a different layout: start over at the fixed size.
+                os.ftruncate(fd, 0); os.ftruncate(fd, size)
+                os.pwrite(fd, header, 0)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def add(self, ts: float, up: float, dn: float) -> None:
+        m = self._map
+        for (step, rows), base in zip(self.tiers, self._bases):
+            slot = int(ts // step)
+            off = base + (slot % rows) * _ROW.size
+            r = _ROW.unpack_from(m, off)
+            if r[0] != slot or r[1] == 0:
+                _ROW.pack_into(m, off, slot, 1, up, up, up, dn, dn, dn)
+            else:
+                _ROW.pack_into(m, off, slot, r[1] + 1,
+                               min(r[2], up), max(r[3], up), r[4] + up,
+                               min(r[5], dn), max(r[6], dn), r[7] + dn)
+
+    def tier_for(self, t0: float, now: float | None = None) -> int:
+        """Index of the finest tier that still holds data from <t0>."""
+        now = time.time() if now is None else now
+        for i, (step, rows) in enumerate(self.tiers):
+            if now - t0 <= step * rows:
+                return i
+        return len(self.tiers) - 1
+
+    def fetch(self, t0: float, t1: float, tier: int | None = None) -> list[Point]:
+        """Consolidated points in [t0, t1], oldest first; empty slots are skipped."""
+        if tier is None:
+            tier = self.tier_for(t0)
+        (step, rows), base = self.tiers[tier], self._bases[tier]
+        first, last = int(t0 // step), int(t1 // step)
+        first = max(first, last - rows + 1)
+        m, out = self._map, []
+        for slot in range(first, last + 1):
+            r = _ROW.unpack_from(m, base + (slot % rows) * _ROW.size)
+            if r[0] != slot or r[1] == 0:
+                continue
+            n = r[1]
+            out.append(Point(slot * step, step, r[2], r[4] / n, r[3], r[5], r[7] / n, r[6]))
+        return out
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.flush(); self._map.close()
+
+
+def lttb(xs, ys, n_out: int) -> list[int]:
+    """
+    Largest-Triangle-Three-Buckets: indices of <n_out> points of (xs, ys)
+    that keep the visual shape of the series.  Always keeps both ends.
+    """
+    n = len(xs)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    every = (n - 2) / (n_out - 2)
+    out = [0]; a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        if nlo >= nhi: nlo, nhi = n - 1, n
+        cnt = nhi - nlo
+        avg_x = sum(xs[nlo:nhi]) / cnt
+        avg_y = sum(ys[nlo:nhi]) / cnt
+        ax, ay = xs[a], ys[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(best); a = best
+    out.append(n - 1)
+    return out
@@ -0,0 +1,720 @@
+"""
+tunnel.py — Qt-free helpers for watching a running OpenVPN tunnel.
+
+Everything here is plain Python (no PyQt6 imports) so it can be reused by
+the GUI and by lightweight tooling alike.
+
+Counter sampling:
+  • Primary:  /sys/class/net/<iface>/statistics/{tx,rx}_bytes, kept open
+              and re-read with os.pread() — no process spawn per sample.
+  • Fallback: a single parse of /proc/net/dev when sysfs is unavailable.
+  • RateMeter turns (sent, recv) samples stamped with time.monotonic_ns()
+    into exact per-interval rates plus an EWMA, and survives counter resets
+    when the interface is re-created.
+
+Interface discovery:
+  • rtnetlink (RTMGRP_LINK) socket that reports tun/tap devices appearing,
+    going up/down and disappearing, without polling `ip link`.
+  • /proc/<pid>/fdinfo lookup that ties a tun/tap device to the process
+    holding its /dev/net/tun descriptor.
+
+Process tracking:
+  • pidfd for the exact openvpn process we launched (resolved through the
+    pkexec/sudo wrapper) — readable on exit, signals only that process.
+    ProcessHandle itself lives in process.py and is re-exported here.
+
+Output reading:
+  • LineReader does large non-blocking os.readv() calls into one reusable
+    buffer and hands out each batch of complete lines as one zero-copy
+    memoryview; callers decode or classify the whole block at once.
+
+Log classification:
+  • One compiled alternation regex recognises every connection event in a
+    single pass over a block of output and yields typed LogEvent tuples.
+
+Management interface:
+  • ManagementClient listens on a private Unix socket that openvpn dials
+    with `--management <path> unix --management-client`, then subscribes to
+    `state on`, `bytecount N` and `log on` push notifications.
+
+Usage:
+    from tunnel import IfaceCounters, LinkWatcher
+
+    counters = IfaceCounters("tun0")
+    sent, recv = counters.read()      # (None, None) if the iface is gone
+    counters.close()
+
+    links = LinkWatcher()             # register links.fileno() with a poller
+    for ev in links.read_events():    # when it becomes readable
+        print(ev.kind, ev.iface)
+"""
+
+import math
+import os
+import re
+import socket
+import struct
+import tempfile
+import time
+from collections import namedtuple
+
+# Light enough for the CLI's fast paths; re-exported for existing callers.
+from process import ProcessHandle, fmt_bytes, fmt_dur  # noqa: F401
+
+
+SYSFS_NET = "/sys/class/net"
+PROC_NET_DEV = "/proc/net/dev"
+TUN_DEVICE = "/dev/net/tun"
+
+
+def _read_proc_net_dev(iface: str) -> tuple[int | None, int | None]:
+    """Return (tx_bytes, rx_bytes) for <iface> from /proc/net/dev."""
+    try:
+        with open(PROC_NET_DEV, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None, None
+    needle = iface.encode() + b":"
+    for line in data.splitlines()[2:]:
+        name, sep, rest = line.strip().partition(b":")
+        if not sep or name + b":" != needle:
+            continue
+        fields = rest.split()
+        # Receive: bytes packets errs drop fifo frame compressed multicast
+        # Transmit: bytes ...
+        try:
+            return int(fields[8]), int(fields[0])
+        except (IndexError, ValueError):
+            return None, None
+    return None, None
+
+
+class IfaceCounters:
+    """
+    Byte counters for a single network interface.
+
+    The two sysfs statistics files are opened once and re-read with
+    ``os.pread`` at offset 0 on every sample, which costs two syscalls and
+    no allocations beyond the returned bytes.  If the interface disappears
+    (tun re-created on reconnect) the descriptors are dropped and reopened
+    lazily on the next read.
+    """
+
+    _BUF = 32   # u64 in decimal + newline always fits
+
+    def __init__(self, iface: str):
+        self.iface = iface
+        self._tx_fd: int | None = None
+        self._rx_fd: int | None = None
+
+    def _open(self) -> bool:
+        base = os.path.join(SYSFS_NET, self.iface, "statistics")
+        try:
+            tx_fd = os.open(os.path.join(base, "tx_bytes"), os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return False
+        try:
+            rx_fd = os.open(os.path.join(base, "rx_bytes"), os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            os.close(tx_fd)
+            return False
+        self._tx_fd, self._rx_fd = tx_fd, rx_fd
+        return True
+
+    def read(self) -> tuple[int | None, int | None]:
+        """Return (sent, recv) bytes, or (None, None) when unavailable."""
+        if self._tx_fd is None and not self._open():
+            return _read_proc_net_dev(self.iface)
+        try:
+            sent = int(os.pread(self._tx_fd, self._BUF, 0))
+            recv = int(os.pread(self._rx_fd, self._BUF, 0))
+            return sent, recv
+        except (OSError, ValueError):
+            # Interface was removed underneath us; reopen on the next call.
+            self.close()
+            return _read_proc_net_dev(self.iface)
+
+    def close(self) -> None:
+        for attr in ("_tx_fd", "_rx_fd"):
+            fd = getattr(self, attr)
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            setattr(self, attr, None)
+
+    def __del__(self):
+        self.close()
+
+
+def _counter_delta(new: int, old: int) -> int:
+    # sysfs and >BYTECOUNT are both 64-bit, so a decrease never means a wrap:
+    # the tun device was re-created or openvpn restarted, and counting began
+    # again from zero.
+    return new - old if new >= old else new
+
+
+class RateMeter:
+    """
+    Byte rates from timestamped (sent, recv) counter samples.
+
+    Every sample carries a time.monotonic_ns() stamp, so rates are divided by
+    the real elapsed interval rather than the nominal tick, and wall-clock
+    jumps cannot distort them.  Totals accumulate deltas, which keeps them
+    right across interface re-creation and openvpn restarts.
+
+    rate   instantaneous (up, down) bytes/s over the last interval
+    ewma   the same, exponentially smoothed with a <half_life> in seconds
+    """
+
+    def __init__(self, half_life: float = 3.0):
+        self._tau_ns = half_life / math.log(2) * 1e9
+        self.reset()
+
+    def reset(self) -> None:
+        self._last = None               # (t_ns, sent, recv)
+        self.total_sent = self.total_recv = 0
+        self.rate = (0.0, 0.0)
+        self.ewma = (0.0, 0.0)
+        self.resets = 0
+
+    def sample(self, sent: int, recv: int, t_ns: int | None = None) -> tuple[float, float] | None:
+        """Add one sample; return the instantaneous rate, or None for the first one."""
+        t_ns = time.monotonic_ns() if t_ns is None else t_ns
+        last = self._last
+        self._last = (t_ns, sent, recv)
+        if last is None:
+            return None
+        dt_ns = t_ns - last[0]
+        if sent < last[1] or recv < last[2]:
+            self.resets += 1
+        d_sent = _counter_delta(sent, last[1]); d_recv = _counter_delta(recv, last[2])
+        self.total_sent += d_sent; self.total_recv += d_recv
+        if dt_ns <= 0:
+            return self.rate
+        self.rate = (d_sent * 1e9 / dt_ns, d_recv * 1e9 / dt_ns)
+        a = 1.0 - math.exp(-dt_ns / self._tau_ns)
+        self.ewma = (self.ewma[0] + a * (self.rate[0] - self.ewma[0]),
+                     self.ewma[1] + a * (self.rate[1] - self.ewma[1]))
+        return self.rate
+
+    def mark(self) -> tuple[int, int, int]:
+        """Snapshot (t_ns, total_sent, total_recv) for a later rate_since()."""
+        t_ns = self._last[0] if self._last else time.monotonic_ns()
+        return t_ns, self.total_sent, self.total_recv
+
+    def rate_since(self, mark: tuple[int, int, int]) -> tuple[float, float, float]:
+        """Return (up, down, seconds) averaged since <mark>."""
+        t_ns, sent, recv = self.mark()
+        dt = (t_ns - mark[0]) / 1e9
+        if dt <= 0:
+            return 0.0, 0.0, 0.0
+        return (self.total_sent - mark[1]) / dt, (self.total_recv - mark[2]) / dt, dt
+
+
+# ── rtnetlink link watcher ────────────────────────────────────────────────────
+
+NETLINK_ROUTE = 0
+RTMGRP_LINK   = 0x1
+NLMSG_ERROR   = 2
+NLMSG_DONE    = 3
+RTM_NEWLINK   = 16
+RTM_DELLINK   = 17
+RTM_GETLINK   = 18
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP    = 0x300
+IFLA_IFNAME   = 3
+IFF_UP        = 0x1
+IFF_LOWER_UP  = 0x10000
+
+_NLMSGHDR  = struct.Struct("=IHHII")     # len, type, flags, seq, pid
+_IFINFOMSG = struct.Struct("=BxHiII")    # family, type, index, flags, change
+_RTATTR    = struct.Struct("=HH")        # len, type
+
+_TUN_NAME_RE = re.compile(r"^(tun|tap)\d+$")
+
+# kind is one of "added", "up", "down", "removed"
+LinkEvent = namedtuple("LinkEvent", "kind iface index")
+
+
+def is_tun_iface(name: str) -> bool:
+    """True for tun/tap devices, including custom `dev` names."""
+    return bool(_TUN_NAME_RE.match(name)) or os.path.exists(
+        os.path.join(SYSFS_NET, name, "tun_flags"))
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+class LinkWatcher:
+    """
+    Non-blocking rtnetlink socket subscribed to RTMGRP_LINK.
+
+    Call ``fileno()`` to register with an event loop and ``read_events()``
+    whenever it becomes readable.  Only tun/tap devices are reported.  The
+    current link table is requested once at construction so devices that
+    already exist show up as "added" events on the first read.
+    """
+
+    def __init__(self):
+        self._sock = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_RAW | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+            NETLINK_ROUTE,
+        )
+        self._sock.bind((0, RTMGRP_LINK))
+        self._links: dict[int, tuple[str, bool]] = {}   # index → (name, up)
+        self._seq = 0
+        self._request_dump()
+
+    def _request_dump(self):
+        self._seq += 1
+        body = _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        hdr = _NLMSGHDR.pack(_NLMSGHDR.size + len(body), RTM_GETLINK,
+                             NLM_F_REQUEST | NLM_F_DUMP, self._seq, 0)
+        self._sock.send(hdr + body)
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def links(self) -> dict[str, bool]:
+        """Return {iface: is_up} for the tun/tap devices currently known."""
+        return {name: up for name, up in self._links.values()}
+
+    def read_events(self) -> list[LinkEvent]:
+        events: list[LinkEvent] = []
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # ENOBUFS: we lost messages; resync from a fresh dump.
+                self._request_dump()
+                break
+            if not data:
+                break
+            self._parse(data, events)
+        return events
+
+    def _parse(self, data: bytes, events: list):
+        off = 0
+        while off + _NLMSGHDR.size <= len(data):
+            length, mtype, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, off)
+            if length < _NLMSGHDR.size:
+                break
+            if mtype in (RTM_NEWLINK, RTM_DELLINK):
+                self._on_link(data, off + _NLMSGHDR.size, off + length, mtype, events)
+            off += _align4(length)
+
+    def _on_link(self, data, start, end, mtype, events):
+        _fam, _type, index, flags, _chg = _IFINFOMSG.unpack_from(data, start)
+        name = None
+        off = start + _IFINFOMSG.size
+        while off + _RTATTR.size <= end:
+            alen, atype = _RTATTR.unpack_from(data, off)
+            if alen < _RTATTR.size:
+                break
+            if atype == IFLA_IFNAME:
+                name = data[off + _RTATTR.size:off + alen].split(b"\0", 1)[0].decode(errors="replace")
+                break
+            off += _align4(alen)
+
+        prev = self._links.get(index)
+        if mtype == RTM_DELLINK:
+            if prev:
+                del self._links[index]
+                events.append(LinkEvent("removed", prev[0], index))
+            return
+        if not name:
+            return
+        if prev is None and not is_tun_iface(name):
+            return
+
+        up = bool(flags & IFF_UP) and bool(flags & IFF_LOWER_UP)
+        self._links[index] = (name, up)
+        if prev is None:
+            events.append(LinkEvent("added", name, index))
+            if up:
+                events.append(LinkEvent("up", name, index))
+        elif prev[1] != up:
+            events.append(LinkEvent("up" if up else "down", name, index))
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+# ── Process ↔ tun ownership ───────────────────────────────────────────────────
+
+def process_tree(root_pid: int) -> set[int]:
+    """Return <root_pid> and all of its descendants."""
+    pids = {root_pid}
+    # Fast path: /proc/<pid>/task/<tid>/children (CONFIG_PROC_CHILDREN)
+    try:
+        todo = [root_pid]
+        while todo:
+            pid = todo.pop()
+            for tid in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{tid}/children") as f:
+                    for child in f.read().split():
+                        if int(child) not in pids:
+                            pids.add(int(child)); todo.append(int(child))
+        return pids
+    except FileNotFoundError:
+        if not os.path.isdir(f"/proc/{root_pid}"):
+            return pids
+    except OSError:
+        return pids
+
+    # Fallback: one pass over /proc/*/stat to build the parent map.
+    parent: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+            ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        parent.setdefault(ppid, []).append(int(entry))
+    todo = [root_pid]
+    while todo:
+        for child in parent.get(todo.pop(), ()):
+            if child not in pids:
+                pids.add(child); todo.append(child)
+    return pids
+
+
+def tun_ifaces_of(pid: int) -> list[str]:
+    """Return the tun/tap devices attached to <pid>'s /dev/net/tun fds."""
+    found = []
+    try:
+        fds = os.listdir(f"/proc/{pid}/fd")
+    except OSError:
+        return found
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/{pid}/fd/{fd}") != TUN_DEVICE:
+                continue
+            with open(f"/proc/{pid}/fdinfo/{fd}") as f:
+                for line in f:
+                    if line.startswith("iff:"):
+                        found.append(line.split(":", 1)[1].strip())
+        except OSError:
+            continue
+    return found
+
+
+def tun_owner(iface: str, pids) -> int | None:
+    """Return the pid in <pids> that owns the tun/tap device <iface>."""
+    for pid in pids:
+        if iface in tun_ifaces_of(pid):
+            return pid
+    return None
+
+
+def find_process(root_pid: int, name: str) -> int | None:
+    """Return the first pid named <name> in <root_pid>'s process tree.
+
+    pkexec exec()s the target in place, sudo forks it as a child; walking the
+    tree handles both.
+    """
+    for pid in sorted(process_tree(root_pid)):
+        try:
+            with open(f"/proc/{pid}/comm") as f:
+                if f.read().strip() == name:
+                    return pid
+        except OSError:
+            continue
+    return None
+
+
+# ── OpenVPN management interface ──────────────────────────────────────────────
+
+# kind is the lower-cased notification name ("state", "bytecount", "log",
+# "fatal", "hold", "info", ...) or "success"/"error" for command replies.
+MgmtEvent = namedtuple("MgmtEvent", "kind fields")
+
+# Number of comma-separated fields kept per notification; the last one
+# absorbs any remaining commas (log messages, state descriptions).
+_MGMT_SPLIT = {"state": 9, "bytecount": 2, "log": 3}
+
+
+def parse_mgmt_line(line: str) -> MgmtEvent | None:
+    """Parse one line received from the management interface."""
+    if line.startswith(">"):
+        kind, _, rest = line[1:].partition(":")
+        kind = kind.lower()
+        n = _MGMT_SPLIT.get(kind)
+        return MgmtEvent(kind, rest.split(",", n - 1) if n else [rest])
+    if line.startswith("SUCCESS:"):
+        return MgmtEvent("success", [line[8:].strip()])
+    if line.startswith("ERROR:"):
+        return MgmtEvent("error", [line[6:].strip()])
+    return None
+
+
+class ManagementClient:
+    """
+    Management-interface client on a private Unix socket.
+
+    ``listen()`` creates the socket in a fresh 0700 directory; pass
+    ``openvpn_args()`` to openvpn so it connects back to us.  Register
+    ``fileno()`` for readability: the first wake-up is the incoming
+    connection (call ``accept()``), later ones carry data for
+    ``read_events()``.  The file descriptor changes after ``accept()``.
+    A ``>HOLD`` (from a profile with ``management-hold``) is released
+    right away, so openvpn never waits on the GUI.
+    """
+
+    SUBSCRIBE = ("state on", "bytecount {interval}", "log on")
+
+    def __init__(self, bytecount_interval: int = 1):
+        self.path: str | None = None
+        self._dir: str | None = None
+        self._listener: socket.socket | None = None
+        self._sock: socket.socket | None = None
+        self._buf = b""
+        self._interval = bytecount_interval
+
+    @classmethod
+    def listen(cls, bytecount_interval: int = 1) -> "ManagementClient":
+        self = cls(bytecount_interval)
+        self._dir = tempfile.mkdtemp(prefix="openvpn-mgmt-")
+        os.chmod(self._dir, 0o700)
+        self.path = os.path.join(self._dir, "mgmt.sock")
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        self._listener.bind(self.path)
+        self._listener.listen(1)
+        self._listener.setblocking(False)
+        return self
+
+    def openvpn_args(self) -> list[str]:
+        return ["--management", self.path, "unix", "--management-client"]
+
+    @property
+    def attached(self) -> bool:
+        return self._sock is not None
+
+    def fileno(self) -> int:
+        sock = self._sock or self._listener
+        return sock.fileno() if sock else -1
+
+    def accept(self) -> bool:
+        """Accept openvpn's connection and subscribe to push notifications."""
+        if self._listener is None:
+            return False
+        try:
+            conn, _ = self._listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return False
+        conn.setblocking(False)
+        self._sock = conn
+        self._listener.close(); self._listener = None
+        for cmd in self.SUBSCRIBE:
+            self.send(cmd.format(interval=self._interval))
+        return True
+
+    def send(self, command: str) -> bool:
+        if self._sock is None:
+            return False
+        try:
+            self._sock.sendall(command.encode() + b"\n")
+            return True
+        except OSError:
+            return False
+
+    def signal(self, name: str = "SIGTERM") -> bool:
+        """Ask openvpn to raise <name> on itself — no privileges needed."""
+        return self.send(f"signal {name}")
+
+    def read_events(self) -> list[MgmtEvent]:
+        """Drain the socket; on EOF the client detaches (``attached`` False)."""
+        events: list[MgmtEvent] = []
+        if self._sock is None:
+            return events
+        while True:
+            try:
+                chunk = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                chunk = b""
+            if not chunk:
+                self._sock.close(); self._sock = None
+                break
+            self._buf += chunk
+        *lines, self._buf = self._buf.split(b"\n")
+        for raw in lines:
+            ev = parse_mgmt_line(raw.rstrip(b"\r").decode(errors="replace"))
+            if ev is not None:
+                if ev.kind == "hold":
+                    self.send("hold release")
+                events.append(ev)
+        return events
+
+    def close(self) -> None:
+        for attr in ("_sock", "_listener"):
+            sock = getattr(self, attr)
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+                setattr(self, attr, None)
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+        if self._dir:
+            try:
+                os.rmdir(self._dir)
+            except OSError:
+                pass
+            self._dir = None
+
+
+# ── Bulk line reader ──────────────────────────────────────────────────────────
+
+class LineReader:
+    """
+    Split a (non-blocking) file descriptor into lines with bulk reads.
+
+    ``read()`` performs one ``os.readv`` into a reusable buffer and returns a
+    memoryview over every complete line received so far (newline-separated,
+    final newline dropped).  Decoding the whole block at once with
+    ``str(block, "utf-8", "replace").splitlines()`` is several times cheaper
+    than decoding line by line, and classify() scans the bytes directly.
+    The view is valid until the next ``read()``.  At EOF any trailing partial line is returned
+    and ``eof`` becomes True.
+    """
+
+    def __init__(self, fd: int, size: int = 1 << 16):
+        self.fd = fd
+        self.eof = False
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._start = 0     # first unconsumed byte
+        self._end = 0       # end of valid data
+
+    def _make_room(self):
+        n = self._end - self._start
+        if self._start:
+            self._buf[:n] = self._view[self._start:self._end]
+            self._start, self._end = 0, n
+        if self._end == len(self._buf):
+            # A single line longer than the buffer: move to a bigger one.
+            # (Views handed out earlier keep the old buffer alive.)
+            grown = bytearray(2 * len(self._buf))
+            grown[:self._end] = self._view[:self._end]
+            self._buf, self._view = grown, memoryview(grown)
+
+    def read(self) -> memoryview:
+        if self.eof:
+            return self._view[:0]
+        self._make_room()
+        try:
+            n = os.readv(self.fd, [self._view[self._end:]])
+        except (BlockingIOError, InterruptedError):
+            return self._view[:0]
+        start = self._start
+        if n == 0:
+            self.eof = True
+            self._start = self._end
+        else:
+            self._end += n
+            nl = self._buf.rfind(b"\n", start, self._end)
+            if nl < 0:
+                return self._view[:0]
+            self._start = nl + 1
+        end = self._start - 1 if not self.eof else self._end
+        return self._view[start:end]
+
+
+# ── Log event classifier ──────────────────────────────────────────────────────
+
+EV_TUN_OPENED = "tun_opened"
+EV_CONNECTED  = "connected"
+EV_PEER_INFO  = "peer_info"
+EV_PUSHED     = "pushed_options"
+EV_RESTART    = "restart"
+EV_AUTH_FAIL  = "auth_fail"
+EV_TLS_FAIL   = "tls_fail"
+EV_FATAL      = "fatal"
+
+EV_FAILURES = (EV_AUTH_FAIL, EV_TLS_FAIL, EV_FATAL)
+
+# detail: iface for tun_opened, peer address for peer_info, option string
+# for pushed_options, otherwise the matched text.  line: the whole line.
+LogEvent = namedtuple("LogEvent", "kind detail line")
+
+# Every alternative starts with a literal so sre can build a first-character
+# charset and skip ahead with a fast scan; named groups around the
+# alternatives would defeat that (2-15x slower), so the event kind is looked
+# up from the first three matched characters instead.
+_LOG_EVENT_PATTERN = r"""
+    TUN/TAP\ device\ ([^\s,]+)\ opened
+  | Initialization\ Sequence\ Completed | VPN\ tunnel\ is\ ready
+  | AUTH_FAILED | Authentication\ failed
+  | TLS\ Error | TLS\ handshake\ failed
+  | FATAL
+  | Peer\ Connection\ Initiated\ with\ (?:\[AF_INET6?\])?(\S+)
+  | PUSH:\ Received\ control\ message:\ 'PUSH_REPLY,?([^'\n]*)
+  | SIG(?:USR1|HUP)\[[^\]\n]*\]\ received | Restart\ pause
+"""
+_LOG_EVENT_RE   = re.compile(_LOG_EVENT_PATTERN, re.X)
+_LOG_EVENT_RE_B = re.compile(_LOG_EVENT_PATTERN.encode(), re.X)
+_EVENT_KIND = {
+    "TUN": EV_TUN_OPENED, "Ini": EV_CONNECTED, "VPN": EV_CONNECTED,
+    "AUT": EV_AUTH_FAIL,  "Aut": EV_AUTH_FAIL, "TLS": EV_TLS_FAIL,
+    "FAT": EV_FATAL,      "Pee": EV_PEER_INFO, "PUS": EV_PUSHED,
+    "SIG": EV_RESTART,    "Res": EV_RESTART,
+}
+_EVENT_KIND.update({k.encode(): v for k, v in _EVENT_KIND.items()})
+
+
+def classify(data: str | bytes) -> list[LogEvent]:
+    """
+    Return the connection events found in <data> (one line or a block),
+    at most one per line.
+
+    Works on decoded text or raw bytes; for bytes only the matching lines
+    are decoded.
+    """
+    is_bytes = not isinstance(data, str)
+    rx, nl = (_LOG_EVENT_RE_B, b"\n") if is_bytes else (_LOG_EVENT_RE, "\n")
+    events = []; last_lo = -1
+    for m in rx.finditer(data):
+        kind = _EVENT_KIND[m.group()[:3]]
+        lo = data.rfind(nl, 0, m.start()) + 1
+        if lo == last_lo:
+            continue    # one event per line: the leftmost match wins
+        last_lo = lo
+        hi = data.find(nl, m.end())
+        line = data[lo:hi if hi >= 0 else len(data)].strip()
+        detail = m.group(m.lastindex or 0)
+        if is_bytes:
+            line = line.decode(errors="replace"); detail = detail.decode(errors="replace")
+        events.append(LogEvent(kind, detail, line))
+    return events
+
+
+# ── Launching and formatting ──────────────────────────────────────────────────
+
+def openvpn_command(config: str, dns: str | None = None, auth_file: str | None = None,
+                    extra=()) -> list[str]:
+    """The openvpn command line every launcher uses (GUI, CLI and helper)."""
+    cmd = ["openvpn", "--config", config, "--verb", "3", "--script-security", "2"]
+    if dns:
+        cmd += ["--up", dns, "--down", dns]
+    cmd += list(extra)
+    if auth_file:
+        cmd += ["--auth-user-pass", auth_file]
+    return cmd